@@ -35,6 +35,9 @@ def generate_sql():
         print("-- Generated SQL INSERT statements for properties")
         print("-- Run this in Supabase SQL Editor")
         print("")
+        # properties is partitioned by county_id: create the county (and its partition) first
+        print("SELECT public.ensure_county('burnet');")
+        print("")
         
         count = 0
         batch_size = 100
@@ -63,7 +66,7 @@ def generate_sql():
                     print("")
                 print(f"-- Batch {count // batch_size + 1}")
                 print("INSERT INTO \"public\".\"properties\" (")
-                print("    \"county\", \"prop_id\", \"owner_name\", \"situs_addr\", ")
+                print("    \"county\", \"county_id\", \"prop_id\", \"owner_name\", \"situs_addr\", ")
                 print("    \"mail_addr\", \"land_value\", \"mkt_value\", \"gis_area\", \"geometry\"")
                 print(") VALUES")
             else:
@@ -78,8 +81,9 @@ def generate_sql():
             mkt_value_sql = str(mkt_value) if mkt_value else 'NULL'
             gis_area_sql = str(gis_area) if gis_area else 'NULL'
             geom_sql = f"'{geom.replace(chr(39), chr(39)+chr(39))}'"
+            county_id_sql = f"(SELECT id FROM counties WHERE slug = '{county}' OR name = '{county}' ORDER BY slug = '{county}' DESC, id LIMIT 1)"
             
-            print(f"    ('{county}', {prop_id_sql}, {owner_name_sql}, {situs_addr_sql}, {mail_addr_sql}, {land_value_sql}, {mkt_value_sql}, {gis_area_sql}, {geom_sql})", end="")
+            print(f"    ('{county}', {county_id_sql}, {prop_id_sql}, {owner_name_sql}, {situs_addr_sql}, {mail_addr_sql}, {land_value_sql}, {mkt_value_sql}, {gis_area_sql}, {geom_sql})", end="")
             
             count += 1
             
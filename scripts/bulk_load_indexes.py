@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Bulk-load index management for the properties table
+
+During a county import every inserted row pays for idx_properties_geom_gist (an
+expression index that re-parses the GeoJSON) and idx_properties_county_id. In bulk-load
+mode those indexes are dropped before the load (their definitions are saved in
+public.suspended_indexes) and afterwards:
+
+  1. the imported county's partition is optionally CLUSTERed on (county, geohash of the
+     parcel), a Z-order space-filling curve, so a bbox scan touches far fewer pages
+  2. the suspended indexes are rebuilt in parallel, one connection per index, with the
+     1GB maintenance_work_mem the statement-timeout migration sets up
+  3. the table is ANALYZEd
+
+CLUSTER rewrites what it orders under an ACCESS EXCLUSIVE lock. Importers only ever
+cluster the county they loaded, and only when properties is partitioned by county_id
+(sql/partition-properties-by-county.sql); on an unpartitioned table that would rewrite
+every county, so they skip it. `rebuild --cluster` without --county clusters the whole
+table and belongs in a maintenance window.
+
+Usage:
+  python bulk_load_indexes.py suspend
+  python bulk_load_indexes.py rebuild [--cluster [--county madison]] [--jobs 2]
+  python bulk_load_indexes.py status
+Example: python bulk_load_indexes.py rebuild --cluster --county madison
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from database import connect
+
+MANAGED_INDEXES = ('idx_properties_geom_gist', 'idx_properties_county_id')
+CLUSTER_INDEX = 'idx_properties_county_geohash'
+MAINTENANCE_WORK_MEM = '1GB'
+
+def suspend_indexes(conn, table_name='properties', index_names=MANAGED_INDEXES):
+    """Save and drop the managed indexes that exist; returns the names dropped"""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            select indexname, indexdef from pg_indexes
+            where schemaname = 'public' and tablename = %s and indexname = any(%s)
+            """,
+            (table_name, list(index_names)),
+        )
+        indexes = cur.fetchall()
+
+        for index_name, index_def in indexes:
+            cur.execute(
+                """
+                insert into public.suspended_indexes (index_name, table_name, index_def)
+                values (%s, %s, %s)
+                on conflict (index_name) do update set index_def = excluded.index_def, suspended_at = now()
+                """,
+                (index_name, table_name, index_def),
+            )
+            cur.execute(f'drop index if exists public."{index_name}"')
+
+    conn.commit()
+    return [index_name for index_name, _ in indexes]
+
+def _build_index(database_url, index_name, index_def):
+    started = time.perf_counter()
+    conn = connect(database_url)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"set maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'")
+            cur.execute("set statement_timeout = 0")
+            cur.execute(index_def.replace('CREATE INDEX ', 'CREATE INDEX IF NOT EXISTS ', 1))
+            cur.execute("delete from public.suspended_indexes where index_name = %s", (index_name,))
+        conn.commit()
+    finally:
+        conn.close()
+    return time.perf_counter() - started
+
+def rebuild_indexes(conn, database_url=None, table_name='properties', jobs=2):
+    """Recreate every suspended index of the table concurrently; returns {index_name: seconds}"""
+    with conn.cursor() as cur:
+        cur.execute(
+            "select index_name, index_def from public.suspended_indexes where table_name = %s order by index_name",
+            (table_name,),
+        )
+        indexes = cur.fetchall()
+    conn.commit()
+
+    if not indexes:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(indexes)))) as executor:
+        futures = {
+            index_name: executor.submit(_build_index, database_url, index_name, index_def)
+            for index_name, index_def in indexes
+        }
+        return {index_name: future.result() for index_name, future in futures.items()}
+
+def county_partition(conn, county_name, table_name='properties'):
+    """Name of the county's partition of the table, or None when the table is not partitioned by county"""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            select child.relname
+            from public.counties k
+            join pg_class child on child.relname = %(table)s || '_c' || k.id
+            join pg_inherits i on i.inhrelid = child.oid
+            where i.inhparent = ('public.' || %(table)s)::regclass
+              and (k.slug = lower(%(county)s) or k.name = lower(%(county)s))
+            order by (k.slug = lower(%(county)s)) desc, k.id
+            limit 1
+            """,
+            {'table': table_name, 'county': county_name},
+        )
+        row = cur.fetchone()
+    conn.commit()
+    return row[0] if row else None
+
+def cluster_spatially(conn, table_name='properties'):
+    """Rewrite the table (or one partition) ordered by (county, geohash of a point on each parcel)"""
+    with conn.cursor() as cur:
+        cur.execute(f"set maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'")
+        cur.execute("set statement_timeout = 0")
+        cur.execute(f"""
+            create index if not exists {CLUSTER_INDEX} on public.{table_name} (
+              county,
+              ST_GeoHash(ST_PointOnSurface(ST_SetSRID(ST_GeomFromGeoJSON(geometry), 4326)), 12)
+            )
+        """)
+        cur.execute(f"cluster public.{table_name} using {CLUSTER_INDEX}")
+        # Only needed to drive the CLUSTER; keeping it would tax every later insert
+        cur.execute(f"drop index if exists public.{CLUSTER_INDEX}")
+    conn.commit()
+
+def analyze_table(conn, table_name='properties'):
+    with conn.cursor() as cur:
+        cur.execute("set statement_timeout = 0")
+        cur.execute(f"analyze public.{table_name}")
+    conn.commit()
+
+def finish_bulk_load(conn, database_url=None, cluster=False, jobs=2, county_name=None):
+    """Post-load half of bulk-load mode: optional spatial CLUSTER, parallel rebuild, ANALYZE
+
+    With county_name only that county's partition is clustered (skipped when properties is
+    not partitioned); without it the whole table is.
+    """
+    if cluster:
+        cluster_table = 'properties'
+        if county_name:
+            cluster_table = county_partition(conn, county_name)
+            if cluster_table is None:
+                print(
+                    "⚠️ properties is not partitioned by county - skipping CLUSTER, which would rewrite every "
+                    "county. Run bulk_load_indexes.py rebuild --cluster in a maintenance window instead."
+                )
+
+        if cluster_table:
+            print(f"🗺️ Clustering {cluster_table} by county and geohash...")
+            started = time.perf_counter()
+            cluster_spatially(conn, cluster_table)
+            print(f"✅ Clustered in {time.perf_counter() - started:.1f}s")
+
+    print("🔧 Rebuilding suspended indexes...")
+    started = time.perf_counter()
+    timings = rebuild_indexes(conn, database_url, jobs=jobs)
+    for index_name, seconds in timings.items():
+        print(f"   {index_name}: {seconds:.1f}s")
+    print(f"✅ Rebuilt {len(timings)} index(es) in {time.perf_counter() - started:.1f}s")
+
+    print("📊 Running ANALYZE on properties...")
+    started = time.perf_counter()
+    analyze_table(conn)
+    print(f"✅ Analyzed in {time.perf_counter() - started:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Suspend and rebuild properties indexes around a bulk load")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('suspend', help="Save and drop the managed indexes")
+
+    rebuild_parser = subparsers.add_parser('rebuild', help="Rebuild suspended indexes and ANALYZE")
+    rebuild_parser.add_argument('--cluster', action='store_true', help="CLUSTER in spatial order first (the whole table unless --county)")
+    rebuild_parser.add_argument('--county', help="With --cluster, only cluster this county's partition")
+    rebuild_parser.add_argument('--jobs', type=int, default=2, help="Indexes built concurrently (default: 2)")
+
+    subparsers.add_parser('status', help="List indexes currently suspended")
+
+    args = parser.parse_args()
+    conn = connect()
+
+    try:
+        if args.command == 'suspend':
+            dropped = suspend_indexes(conn)
+            print(f"✅ Suspended {len(dropped)} index(es): {', '.join(dropped) or 'none'}")
+        elif args.command == 'rebuild':
+            finish_bulk_load(conn, cluster=args.cluster, jobs=args.jobs, county_name=args.county)
+        else:
+            with conn.cursor() as cur:
+                cur.execute("select index_name, suspended_at from public.suspended_indexes order by index_name")
+                rows = cur.fetchall()
+            print(f"📋 {len(rows)} suspended index(es)")
+            for index_name, suspended_at in rows:
+                print(f"   {index_name} (since {suspended_at:%Y-%m-%d %H:%M})")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
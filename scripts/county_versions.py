@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Per-county data version stamps - stamp a county after an import and inspect the stamps
+
+stamp_county_data_version() hashes every parcel of the county (per prop_id, including its
+database ids) and, only if that hash changed, bumps counties.data_version and records a
+changed-ID summary (added/removed/changed prop_ids) in counties.data_change_summary. The
+properties, boundaries and grid routes send the version as their ETag, so clients and
+caches keep serving a county until an import changes its rows or renumbers them.
+
+Usage:
+  python county_versions.py stamp <county_name>
+  python county_versions.py show [county_name]
+Example: python county_versions.py show madison
+"""
+
+import argparse
+import sys
+from supabase_client import get_supabase
+
+def stamp_county_data_version(supabase, county_name):
+    """Hash the county's current rows; returns its data version (bumped only if the rows or their ids changed)"""
+    result = supabase.rpc('stamp_county_data_version', {'p_county': county_name.lower()}).execute()
+    return result.data
+
+def county_data_versions(supabase, county_name=None):
+    """Version stamps for one county or all of them"""
+    query = (
+        supabase.from_('counties')
+        .select('id, name, slug, data_version, data_hash, data_updated_at, data_change_summary')
+        .order('name')
+    )
+    if county_name:
+        query = query.eq('slug', county_name.lower())
+    return query.execute().data
+
+def main():
+    parser = argparse.ArgumentParser(description="Stamp and inspect per-county data versions")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stamp_parser = subparsers.add_parser('stamp', help="Stamp a county after an import")
+    stamp_parser.add_argument('county_name')
+
+    show_parser = subparsers.add_parser('show', help="Show version stamps")
+    show_parser.add_argument('county_name', nargs='?')
+
+    args = parser.parse_args()
+    supabase = get_supabase()
+
+    if args.command == 'stamp':
+        try:
+            version = stamp_county_data_version(supabase, args.county_name)
+        except Exception as e:
+            print(f"❌ Error stamping data version: {e}")
+            sys.exit(1)
+        print(f"✅ {args.county_name.title()} County is at data version {version}")
+        return
+
+    for county in county_data_versions(supabase, args.county_name):
+        summary = county.get('data_change_summary') or {}
+        print(
+            f"   {county['name'].title()} (id {county['id']}): v{county['data_version']} "
+            f"hash {(county.get('data_hash') or '-')[:12]} updated {county.get('data_updated_at') or 'never'}"
+        )
+        if summary:
+            print(
+                f"      {summary.get('total', 0)} parcels: +{summary.get('added', 0)} "
+                f"-{summary.get('removed', 0)} ~{summary.get('changed', 0)}"
+            )
+
+if __name__ == "__main__":
+    main()
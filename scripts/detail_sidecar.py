@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Per-county property detail sidecars for /api/properties/details
+
+Boundary loads carry only id + geometry; the attributes a user inspects on click are
+read from a compact per-county file instead of the properties table. Each sidecar holds
+one record per parcel, sorted by id, behind an offset index:
+
+  'PDS1' | u32 header length | JSON header (padded to 8 bytes) | index | records
+
+  header   countyId, county, dataVersion, count, minId, maxId, fields,
+           indexMode, indexOffset, recordsOffset
+  index    dense  - one (u32 offset, u32 length) slot per id in minId..maxId, length 0
+                    for ids the county does not have; a lookup is direct addressing
+           sorted - (f64 id, u32 offset, u32 length) entries, binary searched; used when
+                    the ids are too sparse for a dense index to pay off
+  records  one compact JSON array per parcel, values in `fields` order
+
+All integers are little-endian and offsets are relative to recordsOffset. Ids change on
+every reload, so a sidecar is stamped with the county's data_version and the API only
+trusts it while counties.data_version still matches; otherwise it falls back to the
+database. manifest.json in the sidecar directory lists every county's file and id range;
+builds update it under an exclusive lock on manifest.json.lock, so county imports running
+in parallel keep each other's entries.
+
+Sidecars are written to $PROPERTY_DETAILS_DIR (default: data/details in the repo root)
+and have to be readable by the Next.js server.
+
+Usage: python detail_sidecar.py build [--county madison ...] [--output-dir data/details]
+       python detail_sidecar.py show [--output-dir data/details]
+Example: python detail_sidecar.py build --county burnet
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from decimal import Decimal
+from database import connect
+from export_properties import county_filter_params, county_filter_sql, resolve_counties, stream_batches
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT_DIR = os.getenv('PROPERTY_DETAILS_DIR') or os.path.join(REPO_DIR, 'data', 'details')
+MANIFEST_FILE = 'manifest.json'
+MAGIC = b'PDS1'
+
+# Record field -> SQL; names match the /api/properties/details response
+SIDECAR_FIELDS = (
+    ('propId', 'prop_id'),
+    ('ownerName', 'owner_name'),
+    ('situsAddr', 'situs_addr'),
+    ('mailAddr', 'mail_addr'),
+    ('landValue', 'land_value'),
+    ('mktValue', 'mkt_value'),
+    ('gisArea', 'gis_area'),
+    ('county', 'county'),
+    ('county_id', 'county_id'),
+)
+
+# A dense index costs 8 bytes per id in the range; past this span per parcel, binary search instead
+DENSE_SPAN_FACTOR = 2
+
+def _json_value(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+def sidecar_file_name(county_id):
+    return f"{int(county_id)}.details"
+
+def _county_data_version(conn, county_id):
+    with conn.cursor() as cur:
+        cur.execute("select data_version from public.counties where id = %s", (county_id,))
+        row = cur.fetchone()
+    return row[0] if row else None
+
+def write_sidecar(path, header, ids, offsets, lengths, records_path):
+    """Assemble header, index and records into `path` (written to a temp file, then renamed)"""
+    count = len(ids)
+    min_id = ids[0] if count else 0
+    max_id = ids[-1] if count else -1
+    span = max_id - min_id + 1 if count else 0
+    dense = span <= DENSE_SPAN_FACTOR * count + 1024
+
+    if dense:
+        index = array('I', bytes(8 * span))
+        for id_, offset, length in zip(ids, offsets, lengths):
+            slot = 2 * (id_ - min_id)
+            index[slot] = offset
+            index[slot + 1] = length
+        if sys.byteorder != 'little':
+            index.byteswap()
+        index_bytes = index.tobytes()
+    else:
+        index_bytes = b''.join(
+            struct.pack('<dII', float(id_), offset, length)
+            for id_, offset, length in zip(ids, offsets, lengths)
+        )
+
+    header = dict(header, count=count, minId=min_id, maxId=max_id,
+                  fields=[name for name, _ in SIDECAR_FIELDS],
+                  indexMode='dense' if dense else 'sorted')
+
+    # The offsets depend on the header's length: size it with widest-possible placeholders, then pad
+    header.update(indexOffset=2 ** 40, recordsOffset=2 ** 40)
+    reserved = len(json.dumps(header, separators=(',', ':')).encode('utf-8'))
+    reserved += -(8 + reserved) % 8
+    header.update(indexOffset=8 + reserved, recordsOffset=8 + reserved + len(index_bytes))
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    header_bytes += b' ' * (reserved - len(header_bytes))
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as out:
+        out.write(MAGIC)
+        out.write(struct.pack('<I', len(header_bytes)))
+        out.write(header_bytes)
+        out.write(index_bytes)
+        with open(records_path, 'rb') as records:
+            shutil.copyfileobj(records, out, 1024 * 1024)
+    os.replace(temp_path, path)
+
+    return header
+
+def build_county_sidecar(conn, county_id, county_name, output_dir=DEFAULT_OUTPUT_DIR, batch_size=10000, county_slug=None):
+    """Write the county's sidecar from the properties table; returns its header"""
+    data_version = _county_data_version(conn, county_id)
+    select_list = ', '.join(f"p.{sql}" for _, sql in SIDECAR_FIELDS)
+    # By county name like the exporter, so rows loaded without a county_id are included
+    query = f"select p.id, {select_list} from public.properties p where {county_filter_sql()} order by p.id"
+
+    ids = array('q')
+    offsets = array('I')
+    lengths = array('I')
+    position = 0
+
+    os.makedirs(output_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=output_dir, suffix='.records', delete=False) as records:
+        records_path = records.name
+        try:
+            for rows in stream_batches(
+                conn, query, county_filter_params(county_id, county_name, county_slug), batch_size,
+                cursor_name='detail_sidecar_cursor',
+            ):
+                for row in rows:
+                    record = json.dumps([_json_value(value) for value in row[1:]], separators=(',', ':')).encode('utf-8')
+                    ids.append(row[0])
+                    offsets.append(position)
+                    lengths.append(len(record))
+                    records.write(record)
+                    position += len(record)
+            records.flush()
+            conn.commit()
+
+            header = write_sidecar(
+                os.path.join(output_dir, sidecar_file_name(county_id)),
+                {'countyId': county_id, 'county': county_name.lower(), 'dataVersion': data_version},
+                ids, offsets, lengths, records_path,
+            )
+        finally:
+            os.unlink(records_path)
+
+    update_manifest(output_dir, header)
+    return header
+
+def read_manifest(output_dir=DEFAULT_OUTPUT_DIR):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {'counties': {}}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def update_manifest(output_dir, header):
+    """Record (or replace) the county's entry in manifest.json"""
+    entry = {
+        'countyId': header['countyId'],
+        'county': header['county'],
+        'dataVersion': header['dataVersion'],
+        'file': sidecar_file_name(header['countyId']),
+        'count': header['count'],
+        'minId': header['minId'],
+        'maxId': header['maxId'],
+        'builtAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+    # Read-modify-write under the lock; readers only ever see a complete file via os.replace
+    with open(os.path.join(output_dir, f"{MANIFEST_FILE}.lock"), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = read_manifest(output_dir)
+        manifest['counties'][str(header['countyId'])] = entry
+
+        temp_path = os.path.join(output_dir, f"{MANIFEST_FILE}.tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, os.path.join(output_dir, MANIFEST_FILE))
+
+def build_detail_sidecars(county_names=None, output_dir=DEFAULT_OUTPUT_DIR, database_url=None):
+    """Build sidecars for the given counties (default: every county with parcels); returns the headers"""
+    conn = connect(database_url)
+    conn.set_session(readonly=True)
+    headers = []
+
+    try:
+        for county_id, county_name, county_slug in resolve_counties(conn, county_names):
+            started = time.perf_counter()
+            header = build_county_sidecar(conn, county_id, county_name, output_dir, county_slug=county_slug)
+            size = os.path.getsize(os.path.join(output_dir, sidecar_file_name(county_id)))
+            print(
+                f"✅ {county_name.title()} County: {header['count']} records, {header['indexMode']} index, "
+                f"{size / 1024:,.0f} KB, data version {header['dataVersion']} ({time.perf_counter() - started:.1f}s)"
+            )
+            headers.append(header)
+    finally:
+        conn.close()
+
+    return headers
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the per-county property detail sidecars read by /api/properties/details")
+    parser.add_argument('command', choices=('build', 'show'))
+    parser.add_argument('--county', action='append', help="County to build (repeatable; default: every county)")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help=f"Sidecar directory (default: {DEFAULT_OUTPUT_DIR})")
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        counties = read_manifest(args.output_dir)['counties']
+        print(f"📋 {len(counties)} sidecar(s) in {args.output_dir}")
+        for entry in sorted(counties.values(), key=lambda e: e['county']):
+            print(
+                f"   {entry['county']}: {entry['count']} records, ids {entry['minId']}-{entry['maxId']}, "
+                f"data version {entry['dataVersion']}, built {entry['builtAt']}"
+            )
+        return
+
+    print("🚀 Building property detail sidecars...")
+    print(f"📂 Output: {args.output_dir}")
+    print("-" * 70)
+
+    try:
+        build_detail_sidecars(args.county, args.output_dir)
+    except Exception as e:
+        print(f"❌ Error building sidecars: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
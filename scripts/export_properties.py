@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Streaming bulk export of properties
+
+Reads through a server-side cursor in fixed-size batches and streams each batch straight
+to a gzip CSV or Parquet file, so memory stays constant however large the county is.
+Counties are exported one at a time, into one combined file or one file per county. Rows
+are matched on properties.county, so rows the baseline importers loaded without a
+county_id are exported too; on a table partitioned by county_id the filter still prunes
+to the county's partition.
+
+Columns are projected up front; the geometry column, which makes up most of a full dump
+like properties_rows.csv, is left out unless asked for in full or as a centroid.
+Skip-trace contacts from the contact store (contact_names, mobiles, landlines, emails)
+can be projected alongside the parcel columns.
+
+Usage: python export_properties.py <output> [--county madison ...] [--saved-only]
+                                   [--columns prop_id,owner_name,...] [--geometry none|full|centroid]
+                                   [--format csv|parquet] [--split-by-county] [--batch-size 10000]
+Example: python export_properties.py exports/all_counties.csv.gz --geometry centroid
+"""
+
+import argparse
+import csv
+import gzip
+import os
+import sys
+import time
+from decimal import Decimal
+from database import connect
+
+DEFAULT_BATCH_SIZE = 10000
+
+# name -> (SQL expression over properties p / saved_properties s, Parquet type)
+EXPORT_COLUMNS = {
+    'id': ('p.id', 'int64'),
+    'county': ('p.county', 'string'),
+    'county_id': ('p.county_id', 'int64'),
+    'prop_id': ('p.prop_id', 'string'),
+    'owner_name': ('p.owner_name', 'string'),
+    'situs_addr': ('p.situs_addr', 'string'),
+    'mail_addr': ('p.mail_addr', 'string'),
+    'land_value': ('p.land_value', 'float64'),
+    'mkt_value': ('p.mkt_value', 'float64'),
+    'gis_area': ('p.gis_area', 'float64'),
+    'user_number': ('s.user_number', 'string'),
+}
+
+def _contact_list_sql(link_sql, value_sql, condition_sql='true'):
+    """';'-joined contact values stored for the parcel by skip_trace_contacts.py"""
+    return (
+        f"(select string_agg(distinct {value_sql}, ';') from public.persons pe {link_sql} "
+        f"where pe.county = p.county and pe.prop_id = p.prop_id and {condition_sql})"
+    )
+
+_PHONE_LINK_SQL = "join public.person_phones pp on pp.person_id = pe.id join public.phones ph on ph.id = pp.phone_id"
+_EMAIL_LINK_SQL = "join public.person_emails pm on pm.person_id = pe.id join public.emails em on em.id = pm.email_id"
+
+EXPORT_COLUMNS.update({
+    'contact_names': (_contact_list_sql('', 'pe.full_name'), 'string'),
+    'mobiles': (_contact_list_sql(_PHONE_LINK_SQL, 'ph.number', "ph.phone_type = 'mobile'"), 'string'),
+    'landlines': (_contact_list_sql(_PHONE_LINK_SQL, 'ph.number', "ph.phone_type = 'landline'"), 'string'),
+    'emails': (_contact_list_sql(_EMAIL_LINK_SQL, 'em.email'), 'string'),
+})
+
+DEFAULT_COLUMNS = (
+    'id', 'county', 'prop_id', 'owner_name', 'situs_addr', 'mail_addr',
+    'land_value', 'mkt_value', 'gis_area',
+)
+
+_GEOMETRY_SQL = "ST_SetSRID(ST_GeomFromGeoJSON(nullif(p.geometry, '{}')), 4326)"
+GEOMETRY_COLUMNS = {
+    'none': {},
+    'full': {'geometry': ('p.geometry', 'string')},
+    'centroid': {
+        'centroid_lon': (f"ST_X(ST_Centroid({_GEOMETRY_SQL}))", 'float64'),
+        'centroid_lat': (f"ST_Y(ST_Centroid({_GEOMETRY_SQL}))", 'float64'),
+    },
+}
+
+def export_columns(columns, geometry='none'):
+    """Ordered {name: (sql, parquet_type)} for the requested projection"""
+    unknown = [column for column in columns if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(unknown)} (available: {', '.join(EXPORT_COLUMNS)})")
+    if geometry not in GEOMETRY_COLUMNS:
+        raise ValueError(f"geometry must be one of {', '.join(GEOMETRY_COLUMNS)}")
+
+    selected = {column: EXPORT_COLUMNS[column] for column in columns}
+    selected.update(GEOMETRY_COLUMNS[geometry])
+    return selected
+
+def county_filter_sql(alias='p'):
+    """WHERE condition for one county's rows (parameters: county_id, county_names)
+
+    properties.county is what every importer sets; county_id is NULL for rows loaded before
+    counties existed, and only narrows the scan (partition pruning) where it is set.
+    """
+    return (
+        f"{alias}.county = any(%(county_names)s) "
+        f"and ({alias}.county_id = %(county_id)s or {alias}.county_id is null)"
+    )
+
+def county_filter_params(county_id, county_name, county_slug):
+    return {'county_id': county_id, 'county_names': sorted({county_name, county_slug or county_name})}
+
+def build_export_query(columns, saved_only=False):
+    """SELECT for one county (parameters: county_filter_params) with the projected columns"""
+    select_list = ',\n  '.join(f"{sql} as {name}" for name, (sql, _) in columns.items())
+    join = 'join' if saved_only else 'left join'
+    return (
+        f"select\n  {select_list}\n"
+        f"from public.properties p\n"
+        f"{join} public.saved_properties s on s.property_id = p.id\n"
+        f"where {county_filter_sql()}\n"
+        f"order by p.id"
+    )
+
+def resolve_counties(conn, county_names=None):
+    """(id, name, slug) of the requested counties, or of every county that has parcels"""
+    with conn.cursor() as cur:
+        if county_names:
+            slugs = [name.lower() for name in county_names]
+            cur.execute(
+                "select id, name, slug from public.counties where slug = any(%s) or name = any(%s) order by name",
+                (slugs, slugs),
+            )
+        else:
+            cur.execute("""
+                select c.id, c.name, c.slug from public.counties c
+                where exists (
+                  select 1 from public.properties p
+                  where p.county in (c.name, c.slug) and (p.county_id = c.id or p.county_id is null)
+                )
+                order by c.name
+            """)
+        return cur.fetchall()
+
+def stream_batches(conn, query, params, batch_size=DEFAULT_BATCH_SIZE, cursor_name='export_cursor'):
+    """Yield lists of row tuples from a server-side (named) cursor"""
+    with conn.cursor(name=cursor_name) as cur:
+        cur.itersize = batch_size
+        cur.execute(query, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
+class CsvGzipWriter:
+    """gzip CSV with a header row; batches are written as they arrive"""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.file = gzip.open(path, 'wt', newline='', encoding='utf-8', compresslevel=6)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(list(columns))
+
+    def write_batch(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+class ParquetWriter:
+    """Parquet file written one row group per batch"""
+
+    def __init__(self, path, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("❌ Error: Parquet export requires pyarrow (pip install pyarrow)")
+            raise
+
+        self.pa = pa
+        self.path = path
+        self.names = list(columns)
+        self.schema = pa.schema([(name, getattr(pa, arrow_type)()) for name, (_, arrow_type) in columns.items()])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='snappy')
+
+    def write_batch(self, rows):
+        arrays = []
+        for index, field in enumerate(self.schema):
+            values = [row[index] for row in rows]
+            if field.type == self.pa.float64():
+                values = [float(value) if isinstance(value, Decimal) else value for value in values]
+            arrays.append(self.pa.array(values, type=field.type))
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+WRITERS = {'csv': CsvGzipWriter, 'parquet': ParquetWriter}
+FILE_SUFFIXES = {'csv': '.csv.gz', 'parquet': '.parquet'}
+
+def export_properties(output, county_names=None, columns=DEFAULT_COLUMNS, geometry='none',
+                      saved_only=False, file_format='csv', split_by_county=False,
+                      batch_size=DEFAULT_BATCH_SIZE, database_url=None):
+    """Stream the selected counties to disk; returns {county_name: row_count}"""
+    selected = export_columns(columns, geometry)
+    query = build_export_query(selected, saved_only)
+    writer_class = WRITERS[file_format]
+
+    conn = connect(database_url)
+    conn.set_session(readonly=True)
+
+    counts = {}
+    writer = None
+    started = time.perf_counter()
+
+    try:
+        counties = resolve_counties(conn, county_names)
+        if not counties:
+            print("⚠️ No matching counties to export")
+            return counts
+
+        if split_by_county:
+            os.makedirs(output, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+            writer = writer_class(output, selected)
+
+        for county_id, county_name, county_slug in counties:
+            county_started = time.perf_counter()
+
+            if split_by_county:
+                writer = writer_class(os.path.join(output, f"{county_name.lower()}{FILE_SUFFIXES[file_format]}"), selected)
+
+            count = 0
+            for rows in stream_batches(conn, query, county_filter_params(county_id, county_name, county_slug), batch_size):
+                writer.write_batch(rows)
+                count += len(rows)
+
+            if split_by_county:
+                writer.close()
+                writer = None
+
+            seconds = time.perf_counter() - county_started
+            counts[county_name] = count
+            print(f"✅ {county_name.title()} County: {count} rows in {seconds:.1f}s ({count / seconds if seconds else 0:,.0f} rows/s)")
+
+    finally:
+        if writer is not None:
+            writer.close()
+        conn.close()
+
+    total = sum(counts.values())
+    seconds = time.perf_counter() - started
+    print(f"\n🎉 Exported {total} rows from {len(counts)} county(ies) in {seconds:.1f}s ({total / seconds if seconds else 0:,.0f} rows/s)")
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream properties to gzip CSV or Parquet at constant memory",
+        epilog="Example: python export_properties.py exports/all_counties.csv.gz --geometry centroid",
+    )
+    parser.add_argument('output', help="Output file, or a directory with --split-by-county")
+    parser.add_argument('--county', action='append', help="County to export (repeatable; default: every county)")
+    parser.add_argument('--saved-only', action='store_true', help="Only export saved properties")
+    parser.add_argument('--columns', default=','.join(DEFAULT_COLUMNS),
+                        help=f"Comma-separated projection (available: {', '.join(EXPORT_COLUMNS)})")
+    parser.add_argument('--geometry', choices=GEOMETRY_COLUMNS, default='none',
+                        help="Leave geometry out, include the GeoJSON, or only its centroid (default: none)")
+    parser.add_argument('--format', dest='file_format', choices=WRITERS, default='csv')
+    parser.add_argument('--split-by-county', action='store_true', help="Write one file per county into the output directory")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help=f"Rows per fetch (default: {DEFAULT_BATCH_SIZE})")
+    args = parser.parse_args()
+
+    columns = [column.strip() for column in args.columns.split(',') if column.strip()]
+
+    print("🚀 Starting bulk property export...")
+    print(f"📍 Counties: {', '.join(args.county) if args.county else 'all'}{' (saved only)' if args.saved_only else ''}")
+    print(f"📂 Output: {args.output} ({args.file_format}, geometry: {args.geometry})")
+    print("-" * 70)
+
+    try:
+        export_properties(
+            args.output, args.county, columns, args.geometry, args.saved_only,
+            args.file_format, args.split_by_county, args.batch_size,
+        )
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error during export: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
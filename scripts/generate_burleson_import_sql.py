@@ -6,6 +6,7 @@ Generate SQL import file for Burleson County land parcels
 import json
 import os
 import sys
+from generate_county_import_sql import county_id_sql, ensure_county_sql
 
 def generate_burleson_sql():
     """Generate SQL file for Burleson County properties"""
@@ -55,7 +56,9 @@ def generate_burleson_sql():
         
         # Clear existing Burleson data
         f.write("-- Clear existing Burleson County data\n")
-        f.write("DELETE FROM properties WHERE county = 'burleson';\n\n")
+        f.write("DELETE FROM properties WHERE county = 'burleson';\n")
+        # properties is partitioned by county_id: create the county (and its partition) first
+        f.write(ensure_county_sql('burleson') + "\n")
         
         # Start transaction
         f.write("BEGIN;\n\n")
@@ -92,8 +95,8 @@ def generate_burleson_sql():
                 geometry_json = json.dumps(geometry).replace("'", "''")
                 
                 # Write INSERT statement
-                f.write(f"INSERT INTO properties (county, prop_id, owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, geometry) VALUES\n")
-                f.write(f"('burleson', '{prop_id}', '{owner_name}', '{situs_addr}', '{mail_addr}', {land_value}, {mkt_value}, {gis_area}, '{geometry_json}');\n\n")
+                f.write(f"INSERT INTO properties (county, county_id, prop_id, owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, geometry) VALUES\n")
+                f.write(f"('burleson', {county_id_sql('burleson')}, '{prop_id}', '{owner_name}', '{situs_addr}', '{mail_addr}', {land_value}, {mkt_value}, {gis_area}, '{geometry_json}');\n\n")
                 
                 # Progress indicator
                 if (i + 1) % 1000 == 0:
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """
-Generic county property SQL import file generator - works with any county GeoJSON file
-Usage: python generate_county_import_sql.py <county_name> <geojson_file>
+Generic county property SQL import file generator - works with any county GeoJSON, shapefile or File Geodatabase
+Usage: python generate_county_import_sql.py <county_name> <source_file>
 Example: python generate_county_import_sql.py burleson data/burleson_landparcels.geojson
+Example: python generate_county_import_sql.py madison data/madison_parcels.shp
 """
 
+import argparse
+import gzip
 import json
 import os
 import sys
+from parcel_sources import open_source, peek_features, source_exists
+from parcel_reprojection import ReprojectionStats, detect_source_crs, build_transformer, reproject_stream
+from parcel_consolidation import consolidate_import_stream
 
 def detect_property_fields(sample_props):
     """Detect the field mapping based on sample properties"""
@@ -60,30 +66,94 @@ def detect_property_fields(sample_props):
     
     return field_mapping
 
-def generate_county_sql(county_name, geojson_file):
+def map_property_row(county_name, props, feature_index, field_mapping, has_properties):
+    """Map source properties to properties table values (unescaped), generating synthetic data where missing"""
+    county_prefix = county_name[:3].upper()
+    
+    # Map fields using detected mapping or generate synthetic data
+    prop_id = (
+        str(props.get(field_mapping.get('prop_id', ''), '')) or 
+        f'{county_prefix}-{feature_index:06d}'
+    )
+    owner_name = (
+        props.get(field_mapping.get('owner_name', ''), '') or 
+        (f'Property Owner {feature_index}' if not has_properties else '')
+    )
+    
+    return {
+        'county': county_name.lower(),
+        'prop_id': prop_id,
+        'owner_name': owner_name,
+        'situs_addr': props.get(field_mapping.get('situs_addr', ''), ''),
+        'mail_addr': props.get(field_mapping.get('mail_addr', ''), ''),
+        'land_value': props.get(field_mapping.get('land_value', ''), 0) or 0,
+        'mkt_value': props.get(field_mapping.get('mkt_value', ''), 0) or 0,
+        'gis_area': props.get(field_mapping.get('gis_area', ''), 0) or 0,
+    }
+
+def county_id_sql(county_name):
+    """Scalar subquery resolving the county's counties.id, which properties may be partitioned by"""
+    county = county_name.lower()
+    return f"(SELECT id FROM counties WHERE slug = '{county}' OR name = '{county}' ORDER BY slug = '{county}' DESC, id LIMIT 1)"
+
+def ensure_county_sql(county_name):
+    """Create the county (and its partition, if properties is partitioned) before any row references it"""
+    return f"SELECT public.ensure_county('{county_name.lower()}');\n"
+
+def format_insert_statement(county_name, feature, feature_index, field_mapping, has_properties):
+    """Render one feature as an INSERT statement for the properties table"""
+    props = feature.get('properties') or {}
+    geometry = feature.get('geometry') or {}
+    
+    row = map_property_row(county_name, props, feature_index, field_mapping, has_properties)
+    
+    # Escape quotes for SQL
+    prop_id = str(row['prop_id']).replace("'", "''")
+    owner_name = str(row['owner_name']).replace("'", "''")
+    situs_addr = str(row['situs_addr']).replace("'", "''")
+    mail_addr = str(row['mail_addr']).replace("'", "''")
+    geometry_json = json.dumps(geometry).replace("'", "''")
+    
+    return (
+        "INSERT INTO properties (county, county_id, prop_id, owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, geometry) VALUES\n"
+        f"('{row['county']}', {county_id_sql(county_name)}, '{prop_id}', '{owner_name}', '{situs_addr}', '{mail_addr}', "
+        f"{row['land_value']}, {row['mkt_value']}, {row['gis_area']}, '{geometry_json}');\n\n"
+    )
+
+def post_load_sql(county_name):
+    """SQL that refreshes the derived per-county data once every row is loaded"""
+    county = county_name.lower()
+    return (
+        "-- Refresh derived owner portfolio aggregates\n"
+        f"SELECT public.refresh_owner_portfolios('{county}');\n"
+        "-- Rebuild the zoom-level aggregate grid\n"
+        f"SELECT public.build_parcel_grid('{county}');\n"
+        "-- Rebuild the owner/address search entries\n"
+        f"SELECT public.build_property_search('{county}');\n"
+        "-- Stamp the county's data version last, once every derived table is current\n"
+        f"SELECT public.stamp_county_data_version('{county}');\n"
+    )
+
+def generate_county_sql(county_name, source_file, source_crs=None, shards=1, compress=False, consolidate=False):
     """Generate SQL file for county properties"""
     
-    if not os.path.exists(geojson_file):
-        print(f"❌ Error: {geojson_file} not found")
+    if not source_exists(source_file):
+        print(f"❌ Error: {source_file} not found")
         return False
     
-    print(f"📂 Loading {geojson_file}...")
-    
-    with open(geojson_file, 'r') as f:
-        geojson_data = json.load(f)
+    print(f"📂 Loading {source_file}...")
     
-    features = geojson_data.get('features', [])
-    total_features = len(features)
+    total_features, features = open_source(source_file)
     
     print(f"📊 Found {total_features} {county_name.title()} County properties")
     
     if total_features == 0:
-        print("❌ No features found in GeoJSON file")
+        print("❌ No features found in source file")
         return False
     
     # Analyze the properties structure
-    sample_feature = features[0] if features else None
-    sample_props = sample_feature.get('properties', {}) if sample_feature else {}
+    sample_feature, features = peek_features(features)
+    sample_props = (sample_feature.get('properties') or {}) if sample_feature else {}
     
     print(f"📋 Sample properties keys: {list(sample_props.keys())}")
     
@@ -95,15 +165,39 @@ def generate_county_sql(county_name, geojson_file):
     if not has_properties:
         print("⚠️ Properties are empty - will generate synthetic property data")
     
+    # Reproject State Plane (or any non-WGS84) sources so the 4326 assumption downstream holds
+    try:
+        source_crs = detect_source_crs(source_file, sample_feature, source_crs)
+        transformer = build_transformer(source_crs)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
+    
+    reprojection_stats = ReprojectionStats()
+    if transformer is not None:
+        print(f"🧭 Reprojecting from {transformer.source_crs.name} to EPSG:4326")
+        features = reproject_stream(features, transformer, reprojection_stats)
+    
+    # One row per Prop_ID: merge multipart/duplicate features before anything is written
+    if consolidate:
+        total_features, features = consolidate_import_stream(county_name, total_features, features, field_mapping)
+    
+    if shards > 1 or compress:
+        return write_sharded_sql(
+            county_name, source_file, features, total_features, field_mapping, has_properties,
+            shards, compress, transformer, reprojection_stats,
+        )
+    
     # Generate SQL file
     sql_file = f'import_{county_name.lower()}.sql'
+    county_prefix = county_name[:3].upper()
     
     print(f"📝 Generating {sql_file}...")
     
     with open(sql_file, 'w') as f:
         # Write header
         f.write(f"-- {county_name.title()} County Properties Import\n")
-        f.write(f"-- Generated from {geojson_file}\n")
+        f.write(f"-- Generated from {source_file}\n")
         f.write(f"-- Total properties: {total_features}\n")
         if not has_properties:
             f.write("-- Note: Original data has empty properties, synthetic data generated\n")
@@ -111,7 +205,8 @@ def generate_county_sql(county_name, geojson_file):
         
         # Clear existing county data
         f.write(f"-- Clear existing {county_name.title()} County data\n")
-        f.write(f"DELETE FROM properties WHERE county = '{county_name.lower()}';\n\n")
+        f.write(f"DELETE FROM properties WHERE county = '{county_name.lower()}';\n")
+        f.write(ensure_county_sql(county_name) + "\n")
         
         # Start transaction
         f.write("BEGIN;\n\n")
@@ -119,38 +214,7 @@ def generate_county_sql(county_name, geojson_file):
         # Process each feature
         for i, feature in enumerate(features):
             try:
-                props = feature.get('properties', {})
-                geometry = feature.get('geometry', {})
-                
-                # Generate unique feature index
-                feature_index = i + 1
-                county_prefix = county_name[:3].upper()
-                
-                # Map fields using detected mapping or generate synthetic data
-                prop_id = (
-                    str(props.get(field_mapping.get('prop_id', ''), '')) or 
-                    f'{county_prefix}-{feature_index:06d}'
-                )
-                owner_name = (
-                    props.get(field_mapping.get('owner_name', ''), '') or 
-                    f'Property Owner {feature_index}' if not has_properties else ''
-                )
-                situs_addr = props.get(field_mapping.get('situs_addr', ''), '')
-                mail_addr = props.get(field_mapping.get('mail_addr', ''), '')
-                land_value = props.get(field_mapping.get('land_value', ''), 0) or 0
-                mkt_value = props.get(field_mapping.get('mkt_value', ''), 0) or 0
-                gis_area = props.get(field_mapping.get('gis_area', ''), 0) or 0
-                
-                # Escape quotes for SQL
-                prop_id = str(prop_id).replace("'", "''")
-                owner_name = str(owner_name).replace("'", "''")
-                situs_addr = str(situs_addr).replace("'", "''")
-                mail_addr = str(mail_addr).replace("'", "''")
-                geometry_json = json.dumps(geometry).replace("'", "''")
-                
-                # Write INSERT statement
-                f.write(f"INSERT INTO properties (county, prop_id, owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, geometry) VALUES\n")
-                f.write(f"('{county_name.lower()}', '{prop_id}', '{owner_name}', '{situs_addr}', '{mail_addr}', {land_value}, {mkt_value}, {gis_area}, '{geometry_json}');\n\n")
+                f.write(format_insert_statement(county_name, feature, i + 1, field_mapping, has_properties))
                 
                 # Progress indicator
                 if (i + 1) % 1000 == 0:
@@ -161,7 +225,9 @@ def generate_county_sql(county_name, geojson_file):
                 continue
         
         # Commit transaction
-        f.write("COMMIT;\n")
+        f.write("COMMIT;\n\n")
+        
+        f.write(post_load_sql(county_name))
         
         # Add summary comment
         f.write(f"\n-- Import completed: {total_features} {county_name.title()} County properties\n")
@@ -169,6 +235,8 @@ def generate_county_sql(county_name, geojson_file):
             f.write(f"-- Note: Properties have synthetic IDs ({county_prefix}-000001, etc.) due to empty source data\n")
     
     print(f"✅ Generated {sql_file} successfully!")
+    if transformer is not None:
+        print(reprojection_stats.report())
     print(f"📊 Contains {total_features} INSERT statements for {county_name.title()} County properties")
     print("\n📋 Usage:")
     print(f"1. Run: psql 'your_connection_string' -f {sql_file}")
@@ -177,22 +245,119 @@ def generate_county_sql(county_name, geojson_file):
     
     return True
 
+def write_sharded_sql(county_name, source_file, features, total_features, field_mapping, has_properties,
+                      shards, compress, transformer, reprojection_stats):
+    """Write the import as N shard files, each its own transaction, plus a manifest for replay_sql_shards.py"""
+    
+    county = county_name.lower()
+    shards = max(1, min(shards, total_features))
+    shard_size = (total_features + shards - 1) // shards
+    suffix = '.sql.gz' if compress else '.sql'
+    
+    def open_output(path):
+        return gzip.open(path, 'wt', compresslevel=6) if compress else open(path, 'w')
+    
+    # The DELETE has to finish before any shard starts, so it gets its own file
+    pre_file = f'import_{county}.pre{suffix}'
+    with open_output(pre_file) as f:
+        f.write(f"-- {county_name.title()} County Properties Import (pre-load)\n")
+        f.write(f"-- Generated from {source_file}\n\n")
+        f.write(f"DELETE FROM properties WHERE county = '{county}';\n")
+        f.write(ensure_county_sql(county_name))
+    
+    print(f"📝 Generating {shards} shard(s) of up to {shard_size} properties ({'gzip' if compress else 'plain'})...")
+    
+    shard_entries = []
+    current = None
+    current_index = -1
+    
+    try:
+        for i, feature in enumerate(features):
+            shard_index = min(i // shard_size, shards - 1)
+            
+            if shard_index != current_index:
+                if current is not None:
+                    current.write("COMMIT;\n")
+                    current.close()
+                current_index = shard_index
+                shard_file = f'import_{county}.part{shard_index + 1:03d}{suffix}'
+                shard_entries.append({'file': shard_file, 'rows': 0})
+                current = open_output(shard_file)
+                current.write(f"-- {county_name.title()} County Properties Import (shard {shard_index + 1}/{shards})\n")
+                current.write(f"-- Generated from {source_file}\n\n")
+                current.write("BEGIN;\n\n")
+            
+            try:
+                current.write(format_insert_statement(county_name, feature, i + 1, field_mapping, has_properties))
+                shard_entries[-1]['rows'] += 1
+            except Exception as e:
+                print(f"⚠️ Error processing feature {i + 1}: {e}")
+                continue
+            
+            if (i + 1) % 1000 == 0:
+                print(f"📝 Generated {i + 1}/{total_features} INSERT statements...")
+    finally:
+        if current is not None:
+            current.write("COMMIT;\n")
+            current.close()
+    
+    # Derived-data refreshes run once, after every shard has committed
+    post_file = f'import_{county}.post{suffix}'
+    with open_output(post_file) as f:
+        f.write(f"-- {county_name.title()} County Properties Import (post-load)\n\n")
+        f.write(post_load_sql(county_name))
+    
+    manifest_file = f'import_{county}.manifest.json'
+    with open(manifest_file, 'w') as f:
+        json.dump({
+            'county': county,
+            'source': source_file,
+            'total_features': total_features,
+            'compressed': compress,
+            'pre': pre_file,
+            'shards': shard_entries,
+            'post': post_file,
+        }, f, indent=2)
+    
+    print(f"✅ Generated {len(shard_entries)} shard(s) and {manifest_file} successfully!")
+    if transformer is not None:
+        print(reprojection_stats.report())
+    print(f"📊 Contains {sum(entry['rows'] for entry in shard_entries)} INSERT statements for {county_name.title()} County properties")
+    print("\n📋 Usage:")
+    print(f"1. Run: python scripts/replay_sql_shards.py {manifest_file} --jobs 4")
+    if compress:
+        print(f"2. Or replay serially: gunzip -c {pre_file} import_{county}.part*{suffix} {post_file} | psql 'your_connection_string'")
+    else:
+        print(f"2. Or replay serially: cat {pre_file} import_{county}.part*{suffix} {post_file} | psql 'your_connection_string'")
+    
+    return True
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python generate_county_import_sql.py <county_name> <geojson_file>")
-        print("Example: python generate_county_import_sql.py burleson data/burleson_landparcels.geojson")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Generate a SQL import file from a county GeoJSON, shapefile or File Geodatabase",
+        epilog="Example: python generate_county_import_sql.py burleson data/burleson_landparcels.geojson",
+    )
+    parser.add_argument('county_name', help="County name, e.g. burleson")
+    parser.add_argument('source_file', help="GeoJSON, shapefile (.shp/.zip) or geodatabase (.gdb[:layer])")
+    parser.add_argument('--source-crs', help="Source CRS when the file does not declare one, e.g. EPSG:2277")
+    parser.add_argument('--shards', type=int, default=1, help="Split the import into N files, each its own transaction")
+    parser.add_argument('--gzip', action='store_true', help="gzip-compress the generated SQL")
+    parser.add_argument('--consolidate', action='store_true', help="Merge features sharing a Prop_ID into one MultiPolygon row")
+    args = parser.parse_args()
     
-    county_name = sys.argv[1]
-    geojson_file = sys.argv[2]
+    county_name = args.county_name
+    source_file = args.source_file
     
     print("🚀 Generating county property SQL import file...")
     print(f"📍 County: {county_name.title()}")
-    print(f"📂 Source: {geojson_file}")
-    print(f"📝 Output: import_{county_name.lower()}.sql")
+    print(f"📂 Source: {source_file}")
+    if args.shards > 1 or args.gzip:
+        print(f"📝 Output: import_{county_name.lower()}.manifest.json ({args.shards} shard(s))")
+    else:
+        print(f"📝 Output: import_{county_name.lower()}.sql")
     print("-" * 70)
     
-    success = generate_county_sql(county_name, geojson_file)
+    success = generate_county_sql(county_name, source_file, args.source_crs, args.shards, args.gzip, args.consolidate)
     
     if success:
         print(f"\n✅ {county_name.title()} County SQL generation completed successfully!")
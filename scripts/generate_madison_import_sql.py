@@ -6,6 +6,7 @@ Generate SQL import file for Madison County land parcels
 import json
 import os
 import sys
+from generate_county_import_sql import county_id_sql, ensure_county_sql
 
 def generate_madison_sql():
     """Generate SQL file for Madison County properties"""
@@ -45,7 +46,9 @@ def generate_madison_sql():
         
         # Clear existing Madison data
         f.write("-- Clear existing Madison County data\n")
-        f.write("DELETE FROM properties WHERE county = 'madison';\n\n")
+        f.write("DELETE FROM properties WHERE county = 'madison';\n")
+        # properties is partitioned by county_id: create the county (and its partition) first
+        f.write(ensure_county_sql('madison') + "\n")
         
         # Start transaction
         f.write("BEGIN;\n\n")
@@ -67,8 +70,8 @@ def generate_madison_sql():
                 geometry_json = json.dumps(geometry).replace("'", "''")
                 
                 # Write INSERT statement
-                f.write(f"INSERT INTO properties (county, prop_id, owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, geometry) VALUES\n")
-                f.write(f"('madison', '{prop_id}', '{owner_name}', '{situs_addr}', '{mail_addr}', {land_value}, {mkt_value}, {gis_area}, '{geometry_json}');\n\n")
+                f.write(f"INSERT INTO properties (county, county_id, prop_id, owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, geometry) VALUES\n")
+                f.write(f"('madison', {county_id_sql('madison')}, '{prop_id}', '{owner_name}', '{situs_addr}', '{mail_addr}', {land_value}, {mkt_value}, {gis_area}, '{geometry_json}');\n\n")
                 
                 # Progress indicator
                 if (i + 1) % 1000 == 0:
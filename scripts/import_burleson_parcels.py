@@ -30,6 +30,10 @@ def clear_burleson_data():
         print(f"❌ Error clearing Burleson data: {e}")
         return False
 
+def ensure_burleson_county_id(supabase):
+    """Look up (or create) Burleson County's counties.id (and partition) so imported rows carry county_id"""
+    return supabase.rpc('ensure_county', {'p_county': 'burleson'}).execute().data
+
 def import_burleson_properties_chunked():
     """Import Burleson County properties from GeoJSON file in chunks"""
     
@@ -63,12 +67,19 @@ def import_burleson_properties_chunked():
     if not sample_props:
         print("⚠️ Properties are empty - will generate synthetic property data")
     
+    supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    
+    # properties is partitioned by county_id, so every row needs it
+    try:
+        county_id = ensure_burleson_county_id(supabase)
+    except Exception as e:
+        print(f"❌ Error resolving county id for burleson: {e}")
+        return False
+    
     # Clear existing Burleson data first
     if not clear_burleson_data():
         return False
     
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-    
     # Process in chunks of 100
     chunk_size = 100
     successful_imports = 0
@@ -94,6 +105,7 @@ def import_burleson_properties_chunked():
                 # Handle Burleson County fields (mostly empty properties)
                 property_data = {
                     'county': 'burleson',
+                    'county_id': county_id,
                     'prop_id': f'BUR-{feature_index:06d}',  # Generate synthetic ID
                     'owner_name': props.get('OWNER_NAME', props.get('owner_name', f'Property Owner {feature_index}')),
                     'situs_addr': props.get('SITUS_ADDR', props.get('situs_addr', '')),
@@ -1,14 +1,27 @@
 #!/usr/bin/env python3
 """
-Generic county property import script - works with any county GeoJSON file
-Usage: python import_county_parcels.py <county_name> <geojson_file>
+Generic county property import script - works with any county GeoJSON, shapefile or File Geodatabase
+Usage: python import_county_parcels.py <county_name> <source_file>
 Example: python import_county_parcels.py burleson data/burleson_landparcels.geojson
+Example: python import_county_parcels.py madison data/madison_parcels.shp
 """
 
+import argparse
 import json
 import os
 import sys
 from supabase import create_client, Client
+from parcel_sources import open_source, peek_features, iter_feature_chunks, source_exists
+from parcel_reprojection import ReprojectionStats, detect_source_crs, build_transformer, reproject_stream
+from parcel_consolidation import consolidate_import_stream
+from parcel_adjacency import build_parcel_adjacency
+from owner_portfolios import refresh_owner_portfolios
+from parcel_grid import build_parcel_grid
+from property_search import build_property_search
+from county_versions import stamp_county_data_version
+from database import connect, DATABASE_URL
+from detail_sidecar import build_detail_sidecars
+from bulk_load_indexes import suspend_indexes, finish_bulk_load
 
 # You'll need to set these environment variables
 SUPABASE_URL = os.getenv('SUPABASE_URL')
@@ -32,6 +45,10 @@ def clear_county_data(county_name):
         print(f"❌ Error clearing {county_name} data: {e}")
         return False
 
+def ensure_county_id(supabase, county_name):
+    """Look up (or create) the county's counties.id (and partition) so imported rows carry county_id"""
+    return supabase.rpc('ensure_county', {'p_county': county_name.lower()}).execute().data
+
 def detect_property_fields(sample_props):
     """Detect the field mapping based on sample properties"""
     field_mapping = {}
@@ -83,30 +100,26 @@ def detect_property_fields(sample_props):
     
     return field_mapping
 
-def import_county_properties_chunked(county_name, geojson_file):
-    """Import county properties from GeoJSON file in chunks"""
+def import_county_properties_chunked(county_name, source_file, source_crs=None, consolidate=False):
+    """Import county properties from a GeoJSON, shapefile or geodatabase source in chunks"""
     
-    if not os.path.exists(geojson_file):
-        print(f"❌ Error: {geojson_file} not found")
+    if not source_exists(source_file):
+        print(f"❌ Error: {source_file} not found")
         return False
     
-    print(f"📂 Loading {geojson_file}...")
-    
-    with open(geojson_file, 'r') as f:
-        geojson_data = json.load(f)
+    print(f"📂 Loading {source_file}...")
     
-    features = geojson_data.get('features', [])
-    total_features = len(features)
+    total_features, features = open_source(source_file)
     
     print(f"📊 Found {total_features} {county_name.title()} County properties to import")
     
     if total_features == 0:
-        print("❌ No features found in GeoJSON file")
+        print("❌ No features found in source file")
         return False
     
     # Analyze the properties structure
-    sample_feature = features[0] if features else None
-    sample_props = sample_feature.get('properties', {}) if sample_feature else {}
+    sample_feature, features = peek_features(features)
+    sample_props = (sample_feature.get('properties') or {}) if sample_feature else {}
     
     print(f"📋 Sample properties keys: {list(sample_props.keys())}")
     
@@ -118,20 +131,43 @@ def import_county_properties_chunked(county_name, geojson_file):
     if not has_properties:
         print("⚠️ Properties are empty - will generate synthetic property data")
     
-    # Clear existing county data first
-    if not clear_county_data(county_name):
+    # Reproject State Plane (or any non-WGS84) sources so the 4326 assumption downstream holds
+    try:
+        source_crs = detect_source_crs(source_file, sample_feature, source_crs)
+        transformer = build_transformer(source_crs)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
         return False
     
+    reprojection_stats = ReprojectionStats()
+    if transformer is not None:
+        print(f"🧭 Reprojecting from {transformer.source_crs.name} to EPSG:4326")
+        features = reproject_stream(features, transformer, reprojection_stats)
+    
+    # One row per Prop_ID: merge multipart/duplicate features before anything is inserted
+    if consolidate:
+        total_features, features = consolidate_import_stream(county_name, total_features, features, field_mapping)
+    
     supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
     
-    # Process in chunks of 100
+    try:
+        county_id = ensure_county_id(supabase, county_name)
+    except Exception as e:
+        print(f"❌ Error resolving county id for {county_name}: {e}")
+        return False
+    
+    # Clear existing county data first
+    if not clear_county_data(county_name):
+        return False
+    
+    # Process in chunks of 100, streaming records straight from the source
     chunk_size = 100
     successful_imports = 0
+    total_chunks = (total_features + chunk_size - 1) // chunk_size
     
-    for i in range(0, total_features, chunk_size):
-        chunk = features[i:i + chunk_size]
-        chunk_num = (i // chunk_size) + 1
-        total_chunks = (total_features + chunk_size - 1) // chunk_size
+    for chunk_index, chunk in enumerate(iter_feature_chunks(features, chunk_size)):
+        i = chunk_index * chunk_size
+        chunk_num = chunk_index + 1
         
         print(f"📦 Processing chunk {chunk_num}/{total_chunks} ({len(chunk)} properties)...")
         
@@ -140,8 +176,8 @@ def import_county_properties_chunked(county_name, geojson_file):
         
         for idx, feature in enumerate(chunk):
             try:
-                props = feature.get('properties', {})
-                geometry = feature.get('geometry', {})
+                props = feature.get('properties') or {}
+                geometry = feature.get('geometry') or {}
                 
                 # Generate a unique feature index
                 feature_index = i + idx + 1
@@ -150,13 +186,14 @@ def import_county_properties_chunked(county_name, geojson_file):
                 # Map fields using detected mapping or generate synthetic data
                 property_data = {
                     'county': county_name.lower(),
+                    'county_id': county_id,
                     'prop_id': (
                         str(props.get(field_mapping.get('prop_id', ''), '')) or 
                         f'{county_prefix}-{feature_index:06d}'
                     ),
                     'owner_name': (
                         props.get(field_mapping.get('owner_name', ''), '') or 
-                        f'Property Owner {feature_index}' if not has_properties else ''
+                        (f'Property Owner {feature_index}' if not has_properties else '')
                     ),
                     'situs_addr': props.get(field_mapping.get('situs_addr', ''), ''),
                     'mail_addr': props.get(field_mapping.get('mail_addr', ''), ''),
@@ -190,37 +227,112 @@ def import_county_properties_chunked(county_name, geojson_file):
     
     print(f"\n🎉 Import completed!")
     print(f"📊 Successfully imported {successful_imports}/{total_features} {county_name.title()} County properties")
+    if transformer is not None:
+        print(reprojection_stats.report())
     
     if successful_imports < total_features:
         print(f"⚠️ {total_features - successful_imports} properties failed to import")
+    if not has_properties:
+        print("📝 Note: Properties have synthetic data because the source properties are empty")
     
     return successful_imports > 0
 
+def run_post_import_stages(county_name, adjacency=False):
+    """Run the import-time derived-data stages for a freshly loaded county"""
+    supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    
+    try:
+        print(f"📊 Refreshing owner portfolios for {county_name.title()} County...")
+        changed = refresh_owner_portfolios(supabase, county_name)
+        print(f"✅ Updated {changed} owner portfolio(s)")
+    except Exception as e:
+        print(f"⚠️ Error refreshing owner portfolios: {e}")
+    
+    try:
+        print(f"🗺️ Building parcel grid for {county_name.title()} County...")
+        cell_count = build_parcel_grid(supabase, county_name)
+        print(f"✅ Stored {cell_count} grid cells")
+    except Exception as e:
+        print(f"⚠️ Error building parcel grid: {e}")
+    
+    try:
+        print(f"🔎 Building search entries for {county_name.title()} County...")
+        entry_count = build_property_search(supabase, county_name)
+        print(f"✅ Stored {entry_count} search entries")
+    except Exception as e:
+        print(f"⚠️ Error building search entries: {e}")
+    
+    if adjacency:
+        try:
+            print(f"🧩 Building parcel adjacency for {county_name.title()} County...")
+            edge_count = build_parcel_adjacency(supabase, county_name)
+            print(f"✅ Stored {edge_count} adjacency edges")
+        except Exception as e:
+            print(f"⚠️ Error building parcel adjacency: {e}")
+    
+    # Last, so a new version is only published once every derived table is current
+    try:
+        version = stamp_county_data_version(supabase, county_name)
+        print(f"🏷️ {county_name.title()} County is at data version {version}")
+    except Exception as e:
+        print(f"⚠️ Error stamping data version: {e}")
+    
+    # The sidecar is built through a server-side cursor, so it needs DATABASE_URL rather than PostgREST
+    if DATABASE_URL:
+        try:
+            print(f"🗂️ Writing detail sidecar for {county_name.title()} County...")
+            build_detail_sidecars([county_name])
+        except Exception as e:
+            print(f"⚠️ Error writing detail sidecar: {e}")
+    else:
+        print("⚠️ DATABASE_URL is not set - skipping the detail sidecar (details fall back to the database)")
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python import_county_parcels.py <county_name> <geojson_file>")
-        print("Example: python import_county_parcels.py burleson data/burleson_landparcels.geojson")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Import county parcels from a GeoJSON, shapefile or File Geodatabase into Supabase",
+        epilog="Example: python import_county_parcels.py burleson data/burleson_landparcels.geojson",
+    )
+    parser.add_argument('county_name', help="County name, e.g. burleson")
+    parser.add_argument('source_file', help="GeoJSON, shapefile (.shp/.zip) or geodatabase (.gdb[:layer])")
+    parser.add_argument('--source-crs', help="Source CRS when the file does not declare one, e.g. EPSG:2277")
+    parser.add_argument('--consolidate', action='store_true', help="Merge features sharing a Prop_ID into one MultiPolygon row")
+    parser.add_argument('--adjacency', action='store_true', help="Rebuild the parcel adjacency graph after the import")
+    parser.add_argument('--bulk-load', action='store_true', help="Suspend properties indexes during the load and rebuild them after (needs DATABASE_URL)")
+    parser.add_argument('--cluster', action='store_true', help="With --bulk-load, CLUSTER the county's partition spatially before the rebuild")
+    args = parser.parse_args()
     
-    county_name = sys.argv[1]
-    geojson_file = sys.argv[2]
+    county_name = args.county_name
+    source_file = args.source_file
     
     print("🚀 Starting county property import...")
     print(f"📍 County: {county_name.title()}")
-    print(f"📂 Source: {geojson_file}")
+    print(f"📂 Source: {source_file}")
     print("🗄️ Target: Supabase properties table")
     print("-" * 70)
     
-    success = import_county_properties_chunked(county_name, geojson_file)
+    if args.bulk_load:
+        conn = connect()
+        dropped = suspend_indexes(conn)
+        print(f"⏸️ Suspended {len(dropped)} index(es) for the bulk load: {', '.join(dropped) or 'none'}")
+    
+    success = False
+    try:
+        success = import_county_properties_chunked(county_name, source_file, args.source_crs, args.consolidate)
+    finally:
+        if args.bulk_load:
+            # Rebuild even after a failed or interrupted import so the table is never left unindexed
+            try:
+                finish_bulk_load(conn, cluster=args.cluster and success, county_name=county_name)
+            finally:
+                conn.close()
     
     if success:
+        run_post_import_stages(county_name, adjacency=args.adjacency)
         print(f"\n✅ {county_name.title()} County import completed successfully!")
         print("\n📋 Next steps:")
         print("1. Check the properties table in your Supabase dashboard")
         print(f"2. Verify the map shows {county_name.title()} County properties")
         print("3. Test property selection and skip tracing")
-        if not os.path.exists(geojson_file) or not json.load(open(geojson_file))['features'][0].get('properties'):
-            print("4. Note: Properties may have synthetic data due to empty source properties")
     else:
         print(f"\n❌ {county_name.title()} County import failed!")
         print("Please check the error messages above and try again.")
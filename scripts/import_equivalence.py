@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+"""
+Golden-output equivalence harness for the import paths
+
+Runs the legacy and fast import paths over the same inputs and compares the rows each
+one would load, so a faster path only ships when it produces today's rows exactly.
+
+Paths (all offline - nothing is loaded; rows are parsed back out of what each path emits):
+  county_sql      generate_county_sql() single-file INSERTs (legacy, the reference)
+  sharded_gzip    generate_county_sql(shards=4, compress=True), every shard parsed back
+  partition_copy  partition_swap_import's COPY rows, read with COPY's CSV rules
+                  (an unquoted empty field is NULL, a quoted one is '')
+  burnet_sql      generate_sql() from generate_import_sql.py (original Burnet import)
+
+The fast paths are gated against county_sql. burnet_sql applies different rules on
+purpose (parse_address picks the situs address, 0 values become NULL, strings are
+stripped), so its comparison with county_sql is reported for information only.
+
+Rows are compared as multisets keyed by prop_id on county, prop_id, owner_name,
+situs_addr, mail_addr, the numeric columns (by value, so 1140750.0 = 1140750) and the
+geometry (same type and nesting, coordinates within --tolerance). county_id is left out:
+the SQL paths resolve it with a subquery at load time.
+
+Inputs:
+  generated          synthetic parcels covering the mapping edge cases (quotes, missing
+                     and None fields, zero values, numeric Prop_IDs, MultiPolygons)
+  generated_empty    parcels with empty properties (synthetic IDs, placeholder owners)
+  properties_rows    real rows exported to properties_rows.csv, turned back into features
+
+Each path is timed (best of --repeat) and every fast path's speedup over county_sql is
+reported. Exits non-zero when a gated comparison differs.
+
+Usage: python import_equivalence.py [--generated 2000] [--sample ../properties_rows.csv]
+                                    [--tolerance 1e-9] [--repeat 3] [--report equivalence.json]
+Example: python import_equivalence.py --report equivalence.json
+"""
+
+import argparse
+import contextlib
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from decimal import Decimal, InvalidOperation
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPTS_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from generate_county_import_sql import detect_property_fields, generate_county_sql
+from partition_swap_import import copy_csv, copy_rows, COPY_COLUMNS
+from parcel_sources import open_source, peek_features
+from generate_import_sql import generate_sql
+
+DEFAULT_SAMPLE = os.path.join(REPO_DIR, 'properties_rows.csv')
+DEFAULT_TOLERANCE = 1e-9
+COMPARED_COLUMNS = (
+    'county', 'prop_id', 'owner_name', 'situs_addr', 'mail_addr',
+    'land_value', 'mkt_value', 'gis_area', 'geometry',
+)
+NUMERIC_COLUMNS = ('land_value', 'mkt_value', 'gis_area')
+MAX_SAMPLE_DIFFERENCES = 10
+
+# (legacy path, fast path, gated)
+COMPARISONS = (
+    ('county_sql', 'sharded_gzip', True),
+    ('county_sql', 'partition_copy', True),
+    ('county_sql', 'burnet_sql', False),
+)
+
+# ---------------------------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------------------------
+
+def _square(rng, lon, lat, size):
+    ring = [[lon, lat], [lon + size, lat], [lon + size, lat + size], [lon, lat + size], [lon, lat]]
+    return [[[round(x + rng.uniform(-1e-7, 1e-7), 10), round(y + rng.uniform(-1e-7, 1e-7), 10)] for x, y in ring]]
+
+def generated_features(count, seed=0):
+    """Synthetic Burnet-style features exercising the mapping rules"""
+    rng = random.Random(seed)
+    owners = ["O'NEIL PATRICK", 'SMITH JOHN & MARY', '  PADDED OWNER  ', 'MUÑOZ ROSA', 'D\'ARCY "DOC" LLC']
+    features = []
+
+    for i in range(count):
+        lon, lat = -98.4 + (i % 100) * 0.002, 30.7 + (i // 100) * 0.002
+        if i % 7 == 0:
+            geometry = {'type': 'MultiPolygon', 'coordinates': [_square(rng, lon, lat, 0.0008), _square(rng, lon + 0.001, lat, 0.0005)]}
+        else:
+            geometry = {'type': 'Polygon', 'coordinates': _square(rng, lon, lat, 0.0015)}
+
+        props = {
+            'Prop_ID': i + 1000 if i % 3 else str(i + 1000),
+            'OWNER_NAME': rng.choice(owners),
+            'SITUS_ADDR': f"{rng.randint(1, 999)}  MOUNTAIN VIEW, BURNET, TX" if i % 4 else ' ',
+            'MAIL_ADDR': f" PO BOX {rng.randint(1, 999)} , BURNET, TX 78611" if i % 5 else '',
+            'LAND_VALUE': 0 if i % 6 == 0 else float(rng.randint(1000, 900000)),
+            'MKT_VALUE': None if i % 11 == 0 else rng.randint(1000, 2000000),
+            'GIS_AREA': round(rng.uniform(0.05, 40), 9),
+        }
+        if i % 13 == 0:
+            del props['OWNER_NAME']
+        features.append({'type': 'Feature', 'properties': props, 'geometry': geometry})
+
+    return features
+
+def generated_empty_features(count, seed=1):
+    """Features with empty properties, as in the Burleson drop"""
+    rng = random.Random(seed)
+    return [
+        {'type': 'Feature', 'properties': {}, 'geometry': {'type': 'Polygon', 'coordinates': _square(rng, -96.6 + i * 0.001, 30.5, 0.0009)}}
+        for i in range(count)
+    ]
+
+def _source_number(value):
+    if value in (None, ''):
+        return None
+    return int(value) if re.fullmatch(r'-?\d+', value) else float(value)
+
+def sample_features(path, limit=None):
+    """properties_rows.csv rows turned back into source features with the Burnet field names"""
+    features = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for n, row in enumerate(csv.DictReader(f)):
+            if limit and n >= limit:
+                break
+            features.append({
+                'type': 'Feature',
+                'properties': {
+                    'Prop_ID': row['prop_id'],
+                    'OWNER_NAME': row['owner_name'],
+                    'SITUS_ADDR': row['situs_addr'],
+                    'MAIL_ADDR': row['mail_addr'],
+                    'LAND_VALUE': _source_number(row['land_value']),
+                    'MKT_VALUE': _source_number(row['mkt_value']),
+                    'GIS_AREA': _source_number(row['gis_area']),
+                },
+                'geometry': json.loads(row['geometry']) if row['geometry'] else None,
+            })
+    return features
+
+# ---------------------------------------------------------------------------
+# Reading rows back out of SQL and COPY text
+# ---------------------------------------------------------------------------
+
+_SQL_TOKEN = re.compile(r"\s+|--[^\n]*|'(?:[^']|'')*'|\(|\)|,|;|[^\s(),;']+")
+
+def _sql_tokens(text):
+    for match in _SQL_TOKEN.finditer(text):
+        token = match.group(0)
+        if token.isspace() or token.startswith('--'):
+            continue
+        yield token
+
+def _sql_value(token):
+    if token.startswith("'"):
+        return token[1:-1].replace("''", "'")
+    if token.upper() == 'NULL':
+        return None
+    return token
+
+def parse_insert_rows(text):
+    """Rows (column -> value) of every INSERT ... VALUES statement; subquery values become '<subquery>'"""
+    tokens = _sql_tokens(text)
+    rows = []
+
+    for token in tokens:
+        if token.upper() != 'INSERT':
+            # Skip the rest of any other statement (BEGIN, DELETE, SELECT ...)
+            if token != ';':
+                for token in tokens:
+                    if token == ';':
+                        break
+            continue
+
+        next(tokens)  # INTO
+        next(tokens)  # table
+        assert next(tokens) == '('
+        columns = []
+        for token in tokens:
+            if token == ')':
+                break
+            if token != ',':
+                columns.append(token.strip('"'))
+        assert next(tokens).upper() == 'VALUES'
+
+        for token in tokens:
+            if token == ';':
+                break
+            if token == ',':
+                continue
+            assert token == '(', f"Unexpected token {token!r} in VALUES"
+            values = []
+            for token in tokens:
+                if token == ')':
+                    break
+                if token == ',':
+                    continue
+                if token == '(':
+                    depth = 1
+                    for inner in tokens:
+                        depth += {'(': 1, ')': -1}.get(inner, 0)
+                        if depth == 0:
+                            break
+                    values.append('<subquery>')
+                else:
+                    values.append(_sql_value(token))
+            rows.append(dict(zip(columns, values)))
+
+    return rows
+
+def parse_copy_csv(text, columns=COPY_COLUMNS):
+    """Rows of COPY ... (format csv) input, following COPY's NULL rules"""
+    rows = []
+    record, field, quoted, in_quotes = [], [], False, False
+    i, length = 0, len(text)
+
+    def end_field():
+        record.append(''.join(field) if quoted or field else None)
+
+    while i < length:
+        char = text[i]
+        if in_quotes:
+            if char == '"':
+                if i + 1 < length and text[i + 1] == '"':
+                    field.append('"')
+                    i += 1
+                else:
+                    in_quotes = False
+            else:
+                field.append(char)
+        elif char == '"':
+            in_quotes, quoted = True, True
+        elif char == ',':
+            end_field()
+            field, quoted = [], False
+        elif char in '\r\n':
+            if char == '\r' and i + 1 < length and text[i + 1] == '\n':
+                i += 1
+            end_field()
+            rows.append(dict(zip(columns, record)))
+            record, field, quoted = [], [], False
+        else:
+            field.append(char)
+        i += 1
+
+    if field or quoted or record:
+        end_field()
+        rows.append(dict(zip(columns, record)))
+    return rows
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def _working_directory(path):
+    previous = os.getcwd()
+    os.makedirs(path, exist_ok=True)
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def _read_text(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt') as f:
+        return f.read()
+
+def run_county_sql(county, source_file, work_dir):
+    with _working_directory(work_dir), contextlib.redirect_stdout(io.StringIO()):
+        if not generate_county_sql(county, source_file):
+            raise RuntimeError("generate_county_sql failed")
+    return lambda: parse_insert_rows(_read_text(os.path.join(work_dir, f'import_{county}.sql')))
+
+def run_sharded_gzip(county, source_file, work_dir):
+    with _working_directory(work_dir), contextlib.redirect_stdout(io.StringIO()):
+        if not generate_county_sql(county, source_file, shards=4, compress=True):
+            raise RuntimeError("generate_county_sql --shards failed")
+
+    def rows():
+        with open(os.path.join(work_dir, f'import_{county}.manifest.json'), 'r') as f:
+            manifest = json.load(f)
+        return [
+            row for shard in manifest['shards']
+            for row in parse_insert_rows(_read_text(os.path.join(work_dir, shard['file'])))
+        ]
+    return rows
+
+def run_partition_copy(county, source_file, work_dir):
+    """The staging rows partition_swap_import would COPY (same source handling, no database)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, features = open_source(source_file)
+        sample_feature, features = peek_features(features)
+        sample_props = (sample_feature.get('properties') or {}) if sample_feature else {}
+        rows = copy_rows(county, '<county_id>', list(features), detect_property_fields(sample_props), bool(sample_props))
+        text = copy_csv(rows)
+    return lambda: parse_copy_csv(text)
+
+def run_burnet_sql(county, source_file, work_dir):
+    """generate_sql() reads data/burnet_parcels.geojson from the working directory and prints the SQL"""
+    data_dir = os.path.join(work_dir, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    target = os.path.join(data_dir, 'burnet_parcels.geojson')
+    if not os.path.exists(target):
+        os.symlink(os.path.abspath(source_file), target)
+
+    output = io.StringIO()
+    try:
+        with _working_directory(work_dir), contextlib.redirect_stdout(output):
+            generate_sql()
+    except SystemExit:
+        raise RuntimeError(output.getvalue().strip().splitlines()[-1] if output.getvalue().strip() else "generate_sql failed")
+    text = output.getvalue()
+    return lambda: parse_insert_rows(text)
+
+PATHS = {
+    'county_sql': run_county_sql,
+    'sharded_gzip': run_sharded_gzip,
+    'partition_copy': run_partition_copy,
+    'burnet_sql': run_burnet_sql,
+}
+
+def time_path(name, county, source_file, work_dir, repeat):
+    """Best wall time over `repeat` runs, plus the rows of the last run"""
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        read_rows = PATHS[name](county, source_file, os.path.join(work_dir, name))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, read_rows()
+
+# ---------------------------------------------------------------------------
+# Canonical comparison
+# ---------------------------------------------------------------------------
+
+def _canonical_number(value):
+    if value is None:
+        return None
+    try:
+        return Decimal(str(value)).normalize()
+    except InvalidOperation:
+        return str(value)
+
+def canonical_row(row):
+    canonical = {}
+    for column in COMPARED_COLUMNS:
+        value = row.get(column)
+        if column in NUMERIC_COLUMNS:
+            value = _canonical_number(value)
+        elif column == 'geometry':
+            value = json.loads(value) if value else None
+        canonical[column] = value
+    return canonical
+
+def geometry_difference(a, b, tolerance):
+    """None when the geometries match within tolerance, else a short reason"""
+    if a is None or b is None:
+        return None if a is b else 'missing geometry'
+    if isinstance(a, dict) and isinstance(b, dict):
+        if a.get('type') != b.get('type'):
+            return f"type {a.get('type')} != {b.get('type')}"
+        if 'geometries' in a or 'geometries' in b:
+            members_a, members_b = a.get('geometries') or [], b.get('geometries') or []
+            if len(members_a) != len(members_b):
+                return 'member count differs'
+            for member_a, member_b in zip(members_a, members_b):
+                reason = geometry_difference(member_a, member_b, tolerance)
+                if reason:
+                    return reason
+            return None
+        return geometry_difference(a.get('coordinates'), b.get('coordinates'), tolerance)
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return 'vertex/part count differs'
+        for item_a, item_b in zip(a, b):
+            reason = geometry_difference(item_a, item_b, tolerance)
+            if reason:
+                return reason
+        return None
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return None if abs(a - b) <= tolerance else f"coordinate off by {abs(a - b):.3g}"
+    return None if a == b else 'structure differs'
+
+def _row_order(row):
+    return json.dumps(row['geometry'], sort_keys=True)
+
+def compare_rows(reference_rows, candidate_rows, tolerance=DEFAULT_TOLERANCE):
+    """Multiset comparison keyed by prop_id; returns a summary with per-column difference counts"""
+    reference = defaultdict(list)
+    candidate = defaultdict(list)
+    for row in map(canonical_row, reference_rows):
+        reference[row['prop_id']].append(row)
+    for row in map(canonical_row, candidate_rows):
+        candidate[row['prop_id']].append(row)
+
+    column_differences = Counter()
+    samples = []
+    missing = extra = compared = 0
+
+    for prop_id in reference.keys() | candidate.keys():
+        expected = sorted(reference.get(prop_id, []), key=_row_order)
+        actual = sorted(candidate.get(prop_id, []), key=_row_order)
+        missing += max(0, len(expected) - len(actual))
+        extra += max(0, len(actual) - len(expected))
+
+        for expected_row, actual_row in zip(expected, actual):
+            compared += 1
+            for column in COMPARED_COLUMNS:
+                if column == 'geometry':
+                    reason = geometry_difference(expected_row[column], actual_row[column], tolerance)
+                else:
+                    reason = None if expected_row[column] == actual_row[column] else 'value differs'
+                if reason:
+                    column_differences[column] += 1
+                    if len(samples) < MAX_SAMPLE_DIFFERENCES:
+                        samples.append({
+                            'prop_id': prop_id,
+                            'column': column,
+                            'reason': reason,
+                            'expected': None if column == 'geometry' else str(expected_row[column]),
+                            'actual': None if column == 'geometry' else str(actual_row[column]),
+                        })
+
+    return {
+        'reference_rows': len(reference_rows),
+        'candidate_rows': len(candidate_rows),
+        'compared_rows': compared,
+        'missing_rows': missing,
+        'extra_rows': extra,
+        'column_differences': dict(column_differences),
+        'samples': samples,
+        'equivalent': not missing and not extra and not column_differences,
+    }
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def run_equivalence(inputs, tolerance=DEFAULT_TOLERANCE, repeat=3):
+    """Run every path over every input; returns the report"""
+    report = {'tolerance': tolerance, 'repeat': repeat, 'inputs': {}}
+
+    with tempfile.TemporaryDirectory(prefix='import_equivalence_') as work_dir:
+        for input_name, features in inputs.items():
+            county = 'burnet'
+            input_dir = os.path.join(work_dir, input_name)
+            os.makedirs(input_dir)
+            source_file = os.path.join(input_dir, f'{input_name}.geojson')
+            with open(source_file, 'w') as f:
+                json.dump({'type': 'FeatureCollection', 'features': features}, f)
+
+            print(f"\n📂 {input_name}: {len(features)} features")
+            timings, rows, errors = {}, {}, {}
+            for name in PATHS:
+                try:
+                    timings[name], rows[name] = time_path(name, county, source_file, input_dir, repeat)
+                    print(f"   ⏱️ {name:<15} {timings[name] * 1000:>9,.0f}ms  {len(rows[name])} rows")
+                except Exception as e:
+                    errors[name] = str(e)
+                    print(f"   ❌ {name:<15} failed: {e}")
+
+            comparisons = []
+            for legacy, fast, gated in COMPARISONS:
+                if legacy not in rows or fast not in rows:
+                    comparisons.append({'legacy': legacy, 'fast': fast, 'gated': gated, 'equivalent': False,
+                                        'error': errors.get(legacy) or errors.get(fast)})
+                    continue
+                result = compare_rows(rows[legacy], rows[fast], tolerance)
+                result.update({
+                    'legacy': legacy,
+                    'fast': fast,
+                    'gated': gated,
+                    'speedup': timings[legacy] / timings[fast] if timings[fast] else None,
+                })
+                comparisons.append(result)
+
+                status = '✅' if result['equivalent'] else ('❌' if gated else 'ℹ️')
+                speedup = f"{result['speedup']:.2f}x" if result['speedup'] else '-'
+                differences = ', '.join(f"{column} {count}" for column, count in sorted(result['column_differences'].items()))
+                detail = 'identical rows' if result['equivalent'] else (
+                    f"{result['missing_rows']} missing, {result['extra_rows']} extra"
+                    + (f", differing: {differences}" if differences else '')
+                )
+                print(f"   {status} {fast} vs {legacy}: {detail} (speedup {speedup})")
+
+            report['inputs'][input_name] = {
+                'features': len(features),
+                'timings_seconds': timings,
+                'errors': errors,
+                'comparisons': comparisons,
+            }
+
+    report['equivalent'] = all(
+        comparison['equivalent']
+        for entry in report['inputs'].values()
+        for comparison in entry['comparisons']
+        if comparison['gated']
+    )
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the fast import paths produce the same rows as the legacy ones, and how much faster they are",
+        epilog="Example: python import_equivalence.py --report equivalence.json",
+    )
+    parser.add_argument('--generated', type=int, default=2000, help="Synthetic edge-case features (default: 2000, 0 to skip)")
+    parser.add_argument('--sample', default=DEFAULT_SAMPLE, help="Real rows exported from properties (default: properties_rows.csv)")
+    parser.add_argument('--sample-limit', type=int, help="Only use the first N sample rows")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help=f"Coordinate tolerance in degrees (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per path, best kept (default: 3)")
+    parser.add_argument('--report', help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    inputs = {}
+    if args.generated:
+        inputs['generated'] = generated_features(args.generated)
+        inputs['generated_empty'] = generated_empty_features(max(1, args.generated // 10))
+    if args.sample and os.path.exists(args.sample):
+        inputs['properties_rows'] = sample_features(args.sample, args.sample_limit)
+    elif args.sample:
+        print(f"⚠️ {args.sample} not found - skipping the real sample")
+
+    if not inputs:
+        print("❌ No inputs to compare")
+        sys.exit(1)
+
+    print("🚀 Running import equivalence checks...")
+    print("-" * 70)
+
+    report = run_equivalence(inputs, args.tolerance, args.repeat)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\n💾 Report written to {args.report}")
+
+    if report['equivalent']:
+        print("\n✅ Every fast path produces the legacy rows")
+    else:
+        print("\n❌ A fast path differs from the legacy rows - see above")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
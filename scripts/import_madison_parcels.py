@@ -30,6 +30,10 @@ def clear_madison_data():
         print(f"❌ Error clearing Madison data: {e}")
         return False
 
+def ensure_madison_county_id(supabase):
+    """Look up (or create) Madison County's counties.id (and partition) so imported rows carry county_id"""
+    return supabase.rpc('ensure_county', {'p_county': 'madison'}).execute().data
+
 def import_madison_properties_chunked():
     """Import Madison County properties from GeoJSON file in chunks"""
     
@@ -54,12 +58,19 @@ def import_madison_properties_chunked():
         print("❌ No features found in GeoJSON file")
         return False
     
+    supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    
+    # properties is partitioned by county_id, so every row needs it
+    try:
+        county_id = ensure_madison_county_id(supabase)
+    except Exception as e:
+        print(f"❌ Error resolving county id for madison: {e}")
+        return False
+    
     # Clear existing Madison data first
     if not clear_madison_data():
         return False
     
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-    
     # Process in chunks of 100
     chunk_size = 100
     successful_imports = 0
@@ -82,6 +93,7 @@ def import_madison_properties_chunked():
                 # Map Madison County fields to our database schema
                 property_data = {
                     'county': 'madison',
+                    'county_id': county_id,
                     'prop_id': str(props.get('Prop_ID', '')),
                     'owner_name': props.get('OWNER_NAME', ''),
                     'situs_addr': props.get('SITUS_ADDR', ''),
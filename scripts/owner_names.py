@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Owner name normalization shared by the import-time stages
+"""
+
+import re
+
+_NON_KEY_CHARS = re.compile(r'[^A-Z0-9& ]+')
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_owner_name(owner_name):
+    """Uppercase, drop punctuation (keeping '&'), collapse whitespace; '' for missing names"""
+    if not owner_name:
+        return ''
+    key = _NON_KEY_CHARS.sub(' ', str(owner_name).upper())
+    return _WHITESPACE.sub(' ', key).strip()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Owner portfolio aggregates - refresh after an import and query them
+
+public.owner_portfolios (all counties) and public.owner_portfolio_counties (per county)
+hold parcel count, total gis_area, land/market value and county spread per normalized
+owner. refresh_owner_portfolios() is a per-county recompute: it re-aggregates every owner
+in the imported county, diffs those totals against the stored ones and re-rolls just the
+owners whose totals changed. Refreshes take an advisory lock on the portfolio tables, so
+imports of several counties at once queue rather than overwrite each other's owners.
+
+Usage:
+  python owner_portfolios.py refresh <county_name>
+  python owner_portfolios.py top [--county madison] [--min-acres 200] [--limit 50]
+Example: python owner_portfolios.py top --county madison --min-acres 200
+"""
+
+import argparse
+import sys
+import time
+from supabase_client import get_supabase
+
+def refresh_owner_portfolios(supabase, county_name):
+    """Recompute the county's owner totals and apply the changes; returns the number of owners changed"""
+    result = supabase.rpc('refresh_owner_portfolios', {'p_county': county_name.lower()}).execute()
+    return result.data
+
+def top_owners(supabase, county_name=None, min_acres=0, limit=50):
+    """Owners ordered by total acreage, optionally restricted to one county's holdings"""
+    if county_name:
+        query = (
+            supabase.from_('owner_portfolio_counties')
+            .select('owner_key, owner_name, parcel_count, total_gis_area, total_land_value, total_mkt_value')
+            .eq('county', county_name.lower())
+        )
+    else:
+        query = (
+            supabase.from_('owner_portfolios')
+            .select('owner_key, owner_name, parcel_count, total_gis_area, total_land_value, total_mkt_value, county_count, counties')
+        )
+
+    return (
+        query.gte('total_gis_area', min_acres)
+        .order('total_gis_area', desc=True)
+        .limit(limit)
+        .execute()
+        .data
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh and query owner portfolio aggregates")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    refresh_parser = subparsers.add_parser('refresh', help="Refresh a county's contribution after an import")
+    refresh_parser.add_argument('county_name')
+
+    top_parser = subparsers.add_parser('top', help="List owners by total acreage")
+    top_parser.add_argument('--county', help="Only count holdings in this county")
+    top_parser.add_argument('--min-acres', type=float, default=0)
+    top_parser.add_argument('--limit', type=int, default=50)
+
+    args = parser.parse_args()
+    supabase = get_supabase()
+
+    if args.command == 'refresh':
+        print(f"📊 Refreshing owner portfolios for {args.county_name.title()} County...")
+        started = time.perf_counter()
+        try:
+            changed = refresh_owner_portfolios(supabase, args.county_name)
+        except Exception as e:
+            print(f"❌ Error refreshing owner portfolios: {e}")
+            sys.exit(1)
+        print(f"✅ Updated {changed} owner portfolio(s) in {time.perf_counter() - started:.1f}s")
+        return
+
+    scope = f"{args.county.title()} County" if args.county else "all counties"
+    owners = top_owners(supabase, args.county, args.min_acres, args.limit)
+    print(f"🔍 {len(owners)} owner(s) holding {args.min_acres:g}+ acres in {scope}")
+
+    for owner in owners:
+        spread = f" across {owner['county_count']} counties" if 'county_count' in owner else ""
+        print(
+            f"   {owner['owner_name']}: {owner['parcel_count']} parcels, "
+            f"{owner['total_gis_area']:,.1f} acres, ${owner['total_mkt_value']:,.0f} market value{spread}"
+        )
+
+if __name__ == "__main__":
+    main()
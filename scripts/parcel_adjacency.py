@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Parcel adjacency graph - build it at import time and query land assemblages
+
+The graph is stored as an edge table (public.parcel_adjacency) built inside PostGIS by
+build_parcel_adjacency(): a GIST bbox join generates candidate pairs and an exact
+shared-boundary length test keeps only parcels that really share an edge.
+
+For queries the county's edges are loaded once into compact CSR arrays, after which
+neighbors-of-N and same-owner assemblage lookups are plain array walks.
+
+Usage:
+  python parcel_adjacency.py build <county_name> [--min-shared-m 1.0]
+  python parcel_adjacency.py neighbors <county_name> <property_id> [--hops 1]
+  python parcel_adjacency.py assemblages <county_name> [--min-parcels 2] [--limit 20]
+Example: python parcel_adjacency.py assemblages madison --min-parcels 3
+"""
+
+import argparse
+import sys
+import time
+from array import array
+from supabase_client import get_supabase, fetch_all_rows
+from owner_names import normalize_owner_name
+
+def build_parcel_adjacency(supabase, county_name, min_shared_m=1.0):
+    """Rebuild the county's adjacency edges in the database; returns the edge count"""
+    result = supabase.rpc('build_parcel_adjacency', {
+        'p_county': county_name.lower(),
+        'p_min_shared_m': min_shared_m,
+    }).execute()
+    return result.data
+
+class ParcelAdjacencyGraph:
+    """Undirected parcel graph in CSR form: neighbors of the node at index i are
+    targets[offsets[i]:offsets[i + 1]]"""
+
+    def __init__(self, ids, edges, owners=None):
+        self.ids = array('q', sorted(ids))
+        self.index = {parcel_id: i for i, parcel_id in enumerate(self.ids)}
+        self.owner_keys = [normalize_owner_name((owners or {}).get(parcel_id)) for parcel_id in self.ids]
+
+        degree = [0] * (len(self.ids) + 1)
+        for a_id, b_id in edges:
+            degree[self.index[a_id] + 1] += 1
+            degree[self.index[b_id] + 1] += 1
+
+        self.offsets = array('q', [0]) * len(degree)
+        for i in range(1, len(degree)):
+            self.offsets[i] = self.offsets[i - 1] + degree[i]
+
+        self.targets = array('q', [0]) * self.offsets[-1]
+        cursor = array('q', self.offsets[:-1])
+        for a_id, b_id in edges:
+            a, b = self.index[a_id], self.index[b_id]
+            self.targets[cursor[a]] = b
+            cursor[a] += 1
+            self.targets[cursor[b]] = a
+            cursor[b] += 1
+
+    @classmethod
+    def load(cls, supabase, county_name):
+        """Load a county's parcels, owners and adjacency edges from Supabase"""
+        county = county_name.lower()
+
+        parcels = fetch_all_rows(lambda: supabase.from_('properties').select('id, owner_name').eq('county', county).order('id'))
+        edges = fetch_all_rows(lambda: supabase.from_('parcel_adjacency').select('a_id, b_id').eq('county', county).order('a_id').order('b_id'))
+
+        owners = {row['id']: row['owner_name'] for row in parcels}
+        known_edges = [(row['a_id'], row['b_id']) for row in edges if row['a_id'] in owners and row['b_id'] in owners]
+
+        return cls(owners.keys(), known_edges, owners)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def edge_count(self):
+        return len(self.targets) // 2
+
+    def _adjacent(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def neighbors(self, parcel_id, hops=1):
+        """Property ids within `hops` shared boundaries of parcel_id (excluding itself)"""
+        start = self.index.get(parcel_id)
+        if start is None:
+            return []
+
+        seen = {start}
+        frontier = [start]
+        for _ in range(hops):
+            next_frontier = []
+            for i in frontier:
+                for j in self._adjacent(i):
+                    if j not in seen:
+                        seen.add(j)
+                        next_frontier.append(j)
+            frontier = next_frontier
+
+        seen.discard(start)
+        return sorted(self.ids[i] for i in seen)
+
+    def _owner_component(self, start, visited):
+        owner_key = self.owner_keys[start]
+        component = [start]
+        visited[start] = 1
+        stack = [start]
+
+        while stack:
+            i = stack.pop()
+            for j in self._adjacent(i):
+                if not visited[j] and self.owner_keys[j] == owner_key:
+                    visited[j] = 1
+                    component.append(j)
+                    stack.append(j)
+
+        return component
+
+    def assemblage(self, parcel_id):
+        """Contiguous same-owner parcels containing parcel_id (just [parcel_id] if the owner is unknown)"""
+        start = self.index.get(parcel_id)
+        if start is None:
+            return []
+        if not self.owner_keys[start]:
+            return [parcel_id]
+
+        visited = bytearray(len(self.ids))
+        return sorted(self.ids[i] for i in self._owner_component(start, visited))
+
+    def same_owner_assemblages(self, min_parcels=2):
+        """All connected same-owner groups with at least min_parcels parcels, largest first"""
+        visited = bytearray(len(self.ids))
+        assemblages = []
+
+        for start in range(len(self.ids)):
+            if visited[start] or not self.owner_keys[start]:
+                continue
+            component = self._owner_component(start, visited)
+            if len(component) >= min_parcels:
+                assemblages.append({
+                    'owner_key': self.owner_keys[start],
+                    'property_ids': sorted(self.ids[i] for i in component),
+                })
+
+        assemblages.sort(key=lambda item: len(item['property_ids']), reverse=True)
+        return assemblages
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the parcel adjacency graph")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Rebuild a county's adjacency edges")
+    build_parser.add_argument('county_name')
+    build_parser.add_argument('--min-shared-m', type=float, default=1.0, help="Minimum shared boundary in meters (default: 1.0)")
+
+    neighbors_parser = subparsers.add_parser('neighbors', help="List parcels adjacent to a property")
+    neighbors_parser.add_argument('county_name')
+    neighbors_parser.add_argument('property_id', type=int)
+    neighbors_parser.add_argument('--hops', type=int, default=1)
+
+    assemblages_parser = subparsers.add_parser('assemblages', help="List contiguous same-owner assemblages")
+    assemblages_parser.add_argument('county_name')
+    assemblages_parser.add_argument('--min-parcels', type=int, default=2)
+    assemblages_parser.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args()
+    supabase = get_supabase()
+    county_label = args.county_name.title()
+
+    if args.command == 'build':
+        print(f"🧩 Building parcel adjacency for {county_label} County...")
+        started = time.perf_counter()
+        try:
+            edge_count = build_parcel_adjacency(supabase, args.county_name, args.min_shared_m)
+        except Exception as e:
+            print(f"❌ Error building adjacency: {e}")
+            sys.exit(1)
+        print(f"✅ Stored {edge_count} adjacency edges in {time.perf_counter() - started:.1f}s")
+        return
+
+    print(f"📂 Loading {county_label} County adjacency graph...")
+    started = time.perf_counter()
+    graph = ParcelAdjacencyGraph.load(supabase, args.county_name)
+    print(f"📊 {len(graph)} parcels, {graph.edge_count} edges loaded in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    if args.command == 'neighbors':
+        neighbors = graph.neighbors(args.property_id, args.hops)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"🔍 {len(neighbors)} parcel(s) within {args.hops} hop(s) of {args.property_id} ({elapsed_ms:.2f}ms)")
+        for parcel_id in neighbors:
+            print(f"   {parcel_id}")
+        return
+
+    assemblages = graph.same_owner_assemblages(args.min_parcels)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"🔍 {len(assemblages)} same-owner assemblage(s) of {args.min_parcels}+ parcels ({elapsed_ms:.2f}ms)")
+    for item in assemblages[:args.limit]:
+        print(f"   {item['owner_key']}: {len(item['property_ids'])} parcels {item['property_ids']}")
+
+if __name__ == "__main__":
+    main()
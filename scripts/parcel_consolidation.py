@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Multipart parcel consolidation - one row per Prop_ID
+
+Appraisal layers often carry several features for one Prop_ID: a parcel split by a road
+or creek exported as separate polygons, or plain duplicate records. Inserted as-is, each
+becomes its own properties row, inflating row counts, geometry bytes and boundary
+payloads, and giving skip-trace sessions duplicate targets.
+
+This stage groups the feature stream by the mapped prop_id field and emits one feature
+per parcel:
+  - geometry: every polygon of every part in one MultiPolygon (a single part stays a
+    Polygon); exact duplicate parts are dropped, non-polygonal parts keep a
+    GeometryCollection
+  - owner_name / situs_addr / mail_addr: the most common non-empty value
+  - land_value / mkt_value: the largest value (parts repeat the parcel's value)
+  - gis_area: the sum over the distinct parts
+  - other attributes: taken from the first part
+Differing non-empty values are recorded as conflicts in the report.
+
+Grouping needs the whole stream, so features are buffered in memory up to
+max_buffered_features; past that, every buffered and later feature is spilled to
+hash-partitioned temp files (JSON lines), and each partition is grouped on its own.
+Output keeps first-seen order unless the stream spilled, in which case it comes out
+partition by partition. The stream is read completely before anything is emitted, so
+the report is final before the first row reaches the sink.
+
+Usage: python parcel_consolidation.py <source_file> [--report consolidation.json] [--max-buffered 100000]
+Example: python parcel_consolidation.py data/madison_parcels.shp --report madison_consolidation.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+from collections import Counter
+from parcel_sources import open_source, peek_features, source_exists
+
+DEFAULT_MAX_BUFFERED_FEATURES = 100000
+DEFAULT_SPILL_PARTITIONS = 64
+MAX_REPORTED_GROUPS = 10000
+
+TEXT_FIELDS = ('owner_name', 'situs_addr', 'mail_addr')
+VALUE_FIELDS = ('land_value', 'mkt_value')
+
+class ConsolidationStats:
+    """Running totals and merged-group details for the consolidation stage"""
+
+    def __init__(self):
+        self.input_features = 0
+        self.output_features = 0
+        self.merged_groups = 0
+        self.merged_features = 0
+        self.duplicate_parts = 0
+        self.conflicts = Counter()
+        self.spilled_features = 0
+        self.spill_partitions = 0
+        self.seconds = 0.0
+        self.groups = []
+
+    def record_group(self, prop_id, parts, duplicates, conflicts):
+        self.merged_groups += 1
+        self.merged_features += parts - 1
+        self.duplicate_parts += duplicates
+        for field in conflicts:
+            self.conflicts[field] += 1
+        if len(self.groups) < MAX_REPORTED_GROUPS:
+            self.groups.append({
+                'prop_id': prop_id,
+                'parts': parts,
+                'duplicate_parts': duplicates,
+                'conflicts': conflicts,
+            })
+
+    def report(self, examples=5):
+        lines = [
+            f"🧩 Consolidated {self.input_features} features into {self.output_features} parcels: "
+            f"{self.merged_groups} multipart Prop_ID(s) absorbed {self.merged_features} features "
+            f"({self.duplicate_parts} exact duplicate part(s)), {self.seconds:.2f}s"
+        ]
+        if self.spilled_features:
+            lines.append(f"   Spilled {self.spilled_features} features to {self.spill_partitions} partition file(s)")
+        if self.conflicts:
+            lines.append("   Conflicting values: " + ', '.join(f"{field} {count}" for field, count in self.conflicts.most_common()))
+        for group in sorted(self.groups, key=lambda g: g['parts'], reverse=True)[:examples]:
+            conflicts = f", conflicts: {', '.join(group['conflicts'])}" if group['conflicts'] else ''
+            lines.append(f"   {group['prop_id']}: {group['parts']} parts{conflicts}")
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        return {
+            'input_features': self.input_features,
+            'output_features': self.output_features,
+            'merged_groups': self.merged_groups,
+            'merged_features': self.merged_features,
+            'duplicate_parts': self.duplicate_parts,
+            'conflicts': dict(self.conflicts),
+            'spilled_features': self.spilled_features,
+            'spill_partitions': self.spill_partitions,
+            'seconds': round(self.seconds, 3),
+            'groups': self.groups,
+            'groups_truncated': self.merged_groups > len(self.groups),
+        }
+
+    def write_report(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+def _polygon_parts(geometry):
+    """Split a geometry into (polygon coordinate lists, other geometries)"""
+    if not geometry:
+        return [], []
+    geometry_type = geometry.get('type')
+    if geometry_type == 'Polygon':
+        return [geometry.get('coordinates') or []], []
+    if geometry_type == 'MultiPolygon':
+        return list(geometry.get('coordinates') or []), []
+    if geometry_type == 'GeometryCollection':
+        polygons, others = [], []
+        for child in geometry.get('geometries') or []:
+            child_polygons, child_others = _polygon_parts(child)
+            polygons.extend(child_polygons)
+            others.extend(child_others)
+        return polygons, others
+    return [], [geometry]
+
+def merge_geometries(geometries):
+    """One geometry covering every part; returns (geometry, exact duplicate parts dropped)"""
+    polygons, others = [], []
+    seen = set()
+    duplicates = 0
+
+    for geometry in geometries:
+        if not geometry:
+            continue
+        key = json.dumps(geometry, sort_keys=True)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+
+        part_polygons, part_others = _polygon_parts(geometry)
+        polygons.extend(part_polygons)
+        others.extend(part_others)
+
+    if others:
+        members = [{'type': 'Polygon', 'coordinates': polygon} for polygon in polygons] + others
+        return {'type': 'GeometryCollection', 'geometries': members}, duplicates
+    if not polygons:
+        return {}, duplicates
+    if len(polygons) == 1:
+        return {'type': 'Polygon', 'coordinates': polygons[0]}, duplicates
+    return {'type': 'MultiPolygon', 'coordinates': polygons}, duplicates
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def reconcile_features(features, field_mapping):
+    """Merge the parts of one Prop_ID into a single feature; returns (feature, duplicates, conflicting fields)"""
+    properties = dict(features[0].get('properties') or {})
+    conflicts = []
+
+    for field in TEXT_FIELDS:
+        source_field = field_mapping.get(field)
+        if not source_field:
+            continue
+        values = [
+            str(value).strip() for value in ((f.get('properties') or {}).get(source_field) for f in features)
+            if value not in (None, '') and str(value).strip()
+        ]
+        if values:
+            # most_common keeps first-seen order on ties
+            properties[source_field] = Counter(values).most_common(1)[0][0]
+            if len(set(values)) > 1:
+                conflicts.append(field)
+
+    for field in VALUE_FIELDS:
+        source_field = field_mapping.get(field)
+        if not source_field:
+            continue
+        values = [(f.get('properties') or {}).get(source_field) for f in features]
+        nonzero = {_number(value) for value in values if _number(value)}
+        if nonzero:
+            properties[source_field] = max(values, key=_number)
+            if len(nonzero) > 1:
+                conflicts.append(field)
+
+    geometry, duplicates = merge_geometries([f.get('geometry') for f in features])
+
+    area_field = field_mapping.get('gis_area')
+    if area_field:
+        # Exact duplicate parts would double count
+        seen = set()
+        total_area = 0.0
+        for feature in features:
+            key = json.dumps(feature.get('geometry'), sort_keys=True)
+            if key in seen:
+                continue
+            seen.add(key)
+            total_area += _number((feature.get('properties') or {}).get(area_field))
+        properties[area_field] = round(total_area, 6)
+
+    return {'type': 'Feature', 'properties': properties, 'geometry': geometry}, duplicates, conflicts
+
+def _group_key(feature, prop_id_field, sequence):
+    """The mapped Prop_ID as map_property_row renders it; features without one stay on their own"""
+    value = (feature.get('properties') or {}).get(prop_id_field) if prop_id_field else None
+    if value in (None, '') or not str(value).strip():
+        return f"\0{sequence}"
+    return str(value)
+
+def _partition_of(key, partitions):
+    return zlib.crc32(key.encode('utf-8')) % partitions
+
+class _Spill:
+    """Hash-partitioned JSON-lines temp files holding (key, feature) records"""
+
+    def __init__(self, partitions):
+        self.directory = tempfile.TemporaryDirectory(prefix='parcel_consolidation_')
+        self.partitions = partitions
+        self.files = [
+            open(os.path.join(self.directory.name, f'part{n:03d}.jsonl'), 'w')
+            for n in range(partitions)
+        ]
+
+    def write(self, key, feature):
+        self.files[_partition_of(key, self.partitions)].write(json.dumps([key, feature], default=str) + '\n')
+
+    def read_partitions(self):
+        """Yield each partition's {key: [features]} in first-seen order within the partition"""
+        for f in self.files:
+            f.close()
+        for n in range(self.partitions):
+            groups = {}
+            with open(os.path.join(self.directory.name, f'part{n:03d}.jsonl'), 'r') as f:
+                for line in f:
+                    key, feature = json.loads(line)
+                    groups.setdefault(key, []).append(feature)
+            yield groups
+
+    def cleanup(self):
+        for f in self.files:
+            if not f.closed:
+                f.close()
+        self.directory.cleanup()
+
+def _merge_group(key, parts, field_mapping, stats):
+    if len(parts) == 1:
+        return parts[0]
+    feature, duplicates, conflicts = reconcile_features(parts, field_mapping)
+    stats.record_group(key, len(parts), duplicates, conflicts)
+    return feature
+
+def consolidate_features(features, field_mapping, stats=None,
+                         max_buffered_features=DEFAULT_MAX_BUFFERED_FEATURES,
+                         partitions=DEFAULT_SPILL_PARTITIONS):
+    """Group a feature stream by Prop_ID and return (parcel_count, consolidated_feature_stream)
+
+    Reads and merges the whole input before returning, spilling to disk past
+    max_buffered_features, so stats are final by the time the stream is consumed.
+    """
+    stats = stats if stats is not None else ConsolidationStats()
+    prop_id_field = field_mapping.get('prop_id')
+    started = time.perf_counter()
+
+    groups = {}
+    spill = None
+
+    try:
+        for sequence, feature in enumerate(features):
+            stats.input_features += 1
+            key = _group_key(feature, prop_id_field, sequence)
+
+            if spill is not None:
+                spill.write(key, feature)
+                stats.spilled_features += 1
+                continue
+
+            groups.setdefault(key, []).append(feature)
+
+            if stats.input_features > max_buffered_features:
+                print(f"💾 Over {max_buffered_features} buffered features - spilling to {partitions} partition files...")
+                spill = _Spill(partitions)
+                stats.spill_partitions = partitions
+                for buffered_key, buffered_features in groups.items():
+                    for buffered_feature in buffered_features:
+                        spill.write(buffered_key, buffered_feature)
+                        stats.spilled_features += 1
+                groups = {}
+
+        if spill is None:
+            output = [_merge_group(key, parts, field_mapping, stats) for key, parts in groups.items()]
+            stats.output_features = len(output)
+            stats.seconds += time.perf_counter() - started
+            return len(output), iter(output)
+
+        # Merge one partition at a time into a single file the returned stream reads back
+        consolidated_path = os.path.join(spill.directory.name, 'consolidated.jsonl')
+        with open(consolidated_path, 'w') as out:
+            for partition_groups in spill.read_partitions():
+                for key, parts in partition_groups.items():
+                    out.write(json.dumps(_merge_group(key, parts, field_mapping, stats), default=str) + '\n')
+                    stats.output_features += 1
+    except Exception:
+        if spill is not None:
+            spill.cleanup()
+        raise
+
+    stats.seconds += time.perf_counter() - started
+
+    def stream():
+        try:
+            with open(consolidated_path, 'r') as f:
+                for line in f:
+                    yield json.loads(line)
+        finally:
+            spill.cleanup()
+
+    return stats.output_features, stream()
+
+def consolidate_import_stream(county_name, total_features, features, field_mapping,
+                              max_buffered_features=DEFAULT_MAX_BUFFERED_FEATURES):
+    """Importer hook (--consolidate): consolidate, print the summary and write import_<county>.consolidation.json
+
+    Returns (total_features, features) for the rest of the import.
+    """
+    if 'prop_id' not in field_mapping:
+        print("⚠️ No Prop_ID field detected - skipping multipart consolidation")
+        return total_features, features
+
+    print(f"🧩 Consolidating multipart parcels by {field_mapping['prop_id']}...")
+    stats = ConsolidationStats()
+    total_features, features = consolidate_features(features, field_mapping, stats, max_buffered_features)
+    print(stats.report())
+
+    report_file = f'import_{county_name.lower()}.consolidation.json'
+    stats.write_report(report_file)
+    print(f"💾 Consolidation report written to {report_file}")
+
+    return total_features, features
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report how a parcel source consolidates by Prop_ID (dry run)",
+        epilog="Example: python parcel_consolidation.py data/madison_parcels.shp --report madison_consolidation.json",
+    )
+    parser.add_argument('source_file', help="GeoJSON, shapefile (.shp/.zip) or geodatabase (.gdb[:layer])")
+    parser.add_argument('--report', help="Write the full report (every merged Prop_ID) as JSON")
+    parser.add_argument('--max-buffered', type=int, default=DEFAULT_MAX_BUFFERED_FEATURES,
+                        help=f"Features held in memory before spilling to disk (default: {DEFAULT_MAX_BUFFERED_FEATURES})")
+    args = parser.parse_args()
+
+    if not source_exists(args.source_file):
+        print(f"❌ Error: {args.source_file} not found")
+        sys.exit(1)
+
+    from generate_county_import_sql import detect_property_fields
+
+    total_features, features = open_source(args.source_file)
+    sample_feature, features = peek_features(features)
+    field_mapping = detect_property_fields((sample_feature.get('properties') or {}) if sample_feature else {})
+
+    if 'prop_id' not in field_mapping:
+        print(f"⚠️ No Prop_ID field detected in {args.source_file} - nothing to consolidate")
+        return
+
+    print(f"📊 Consolidating {total_features} features by {field_mapping['prop_id']} (dry run)...")
+
+    stats = ConsolidationStats()
+    _, consolidated = consolidate_features(features, field_mapping, stats, args.max_buffered)
+    for _ in consolidated:
+        pass
+
+    print(stats.report())
+    if args.report:
+        stats.write_report(args.report)
+        print(f"💾 Report written to {args.report}")
+
+if __name__ == "__main__":
+    main()
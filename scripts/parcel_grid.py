@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Zoom-level aggregate grid - bin a county's parcels into map tiles at several zooms
+
+build_parcel_grid() (see the parcel_grid_cells migration) stores, per county, zoom and
+Web Mercator tile: parcel count, total acreage, total market value, a representative
+point and the tile quadkey. /api/properties/grid serves one zoom level as GeoJSON points.
+
+Usage: python parcel_grid.py <county_name> [--min-zoom 8] [--max-zoom 14]
+Example: python parcel_grid.py madison
+"""
+
+import argparse
+import sys
+import time
+from supabase_client import get_supabase, fetch_all_rows
+
+def build_parcel_grid(supabase, county_name, min_zoom=8, max_zoom=14):
+    """Rebuild the county's grid cells; returns the number of cells stored"""
+    result = supabase.rpc('build_parcel_grid', {
+        'p_county': county_name.lower(),
+        'p_min_zoom': min_zoom,
+        'p_max_zoom': max_zoom,
+    }).execute()
+    return result.data
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the zoom-level aggregate grid for a county")
+    parser.add_argument('county_name')
+    parser.add_argument('--min-zoom', type=int, default=8)
+    parser.add_argument('--max-zoom', type=int, default=14)
+    args = parser.parse_args()
+
+    if not 0 < args.min_zoom <= args.max_zoom <= 20:
+        print("❌ Error: zooms must satisfy 0 < min-zoom <= max-zoom <= 20")
+        sys.exit(1)
+
+    supabase = get_supabase()
+    county = args.county_name.lower()
+
+    print(f"🗺️ Building parcel grid for {args.county_name.title()} County (zoom {args.min_zoom}-{args.max_zoom})...")
+    started = time.perf_counter()
+    try:
+        cell_count = build_parcel_grid(supabase, county, args.min_zoom, args.max_zoom)
+    except Exception as e:
+        print(f"❌ Error building parcel grid: {e}")
+        sys.exit(1)
+    print(f"✅ Stored {cell_count} grid cells in {time.perf_counter() - started:.1f}s")
+
+    cells = fetch_all_rows(lambda: supabase.from_('parcel_grid_cells').select('zoom').eq('county', county).order('zoom'))
+    per_zoom = {}
+    for cell in cells:
+        per_zoom[cell['zoom']] = per_zoom.get(cell['zoom'], 0) + 1
+    for zoom, count in sorted(per_zoom.items()):
+        print(f"   zoom {zoom}: {count} cells")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Batched reprojection of parcel geometries to WGS84 (EPSG:4326)
+
+Several Texas appraisal districts publish parcels in State Plane feet
+(e.g. EPSG:2277 Central, EPSG:2278 South Central). The properties table,
+idx_properties_geom_gist and the Leaflet map all assume EPSG:4326, so the
+importers reproject every chunk before it reaches the insert path.
+
+All vertices of a chunk are flattened into two numpy buffers and pushed
+through a single pyproj transform call instead of transforming point by point.
+Needs `pip install pyproj numpy`.
+
+Usage: python parcel_reprojection.py <source_file> [source_crs]
+Example: python parcel_reprojection.py data/madison_parcels.shp
+Example: python parcel_reprojection.py data/burleson_landparcels.geojson EPSG:2277
+"""
+
+import sys
+import time
+from parcel_sources import open_source, peek_features, read_source_crs, iter_feature_chunks, source_exists
+
+TARGET_CRS = 'EPSG:4326'
+
+# Authority names GeoJSON files commonly use for plain longitude/latitude
+WGS84_NAMES = {
+    'EPSG:4326',
+    'urn:ogc:def:crs:EPSG::4326',
+    'urn:ogc:def:crs:OGC:1.3:CRS84',
+    'urn:ogc:def:crs:OGC::CRS84',
+    'OGC:CRS84',
+}
+
+class ReprojectionStats:
+    """Running totals for the reprojection stage"""
+
+    def __init__(self):
+        self.features = 0
+        self.vertices = 0
+        self.chunks = 0
+        self.seconds = 0.0
+
+    def report(self):
+        rate = self.vertices / self.seconds if self.seconds > 0 else 0
+        return (
+            f"🌐 Reprojected {self.features} features / {self.vertices} vertices "
+            f"in {self.chunks} chunks, {self.seconds:.2f}s ({rate:,.0f} vertices/s)"
+        )
+
+def _sample_position(geometry):
+    """Return the first coordinate pair of a geometry, or None"""
+    if not geometry:
+        return None
+    if geometry.get('type') == 'GeometryCollection':
+        for child in geometry.get('geometries') or []:
+            position = _sample_position(child)
+            if position:
+                return position
+        return None
+
+    coords = geometry.get('coordinates')
+    while isinstance(coords, (list, tuple)) and coords and isinstance(coords[0], (list, tuple)):
+        coords = coords[0]
+    return coords if coords else None
+
+def looks_like_lon_lat(geometry):
+    """True when the sample geometry's coordinates fall inside longitude/latitude bounds"""
+    position = _sample_position(geometry)
+    if not position:
+        return True
+    x, y = position[0], position[1]
+    return -180 <= x <= 180 and -90 <= y <= 90
+
+def detect_source_crs(source_file, sample_feature, source_crs=None):
+    """Resolve the CRS of the source: explicit override, then the declared CRS, then a coordinate sanity check"""
+    if source_crs:
+        return source_crs
+
+    declared = read_source_crs(source_file)
+    if declared:
+        return declared
+
+    if looks_like_lon_lat((sample_feature or {}).get('geometry')):
+        return TARGET_CRS
+
+    raise ValueError(
+        f"{source_file} has projected coordinates but declares no CRS - "
+        "pass the source CRS explicitly (e.g. EPSG:2277 for Texas Central State Plane feet)"
+    )
+
+def build_transformer(source_crs):
+    """Return a pyproj Transformer to EPSG:4326, or None if the source is already WGS84"""
+    if source_crs in WGS84_NAMES:
+        return None
+
+    try:
+        from pyproj import CRS, Transformer
+    except ImportError:
+        print("❌ Error: Reprojection requires pyproj and numpy (pip install pyproj numpy)")
+        raise
+
+    source = CRS.from_user_input(source_crs)
+    target = CRS.from_user_input(TARGET_CRS)
+    if source.equals(target, ignore_axis_order=True):
+        return None
+
+    # always_xy keeps GeoJSON's (lon, lat) order regardless of the authority axis order
+    return Transformer.from_crs(source, target, always_xy=True)
+
+def _is_position(coords):
+    return bool(coords) and not isinstance(coords[0], (list, tuple))
+
+def _collect_positions(coords, xs, ys):
+    if _is_position(coords):
+        xs.append(coords[0])
+        ys.append(coords[1])
+        return
+    for child in coords:
+        _collect_positions(child, xs, ys)
+
+def _rebuild_positions(coords, positions):
+    if _is_position(coords):
+        x, y = next(positions)
+        return [x, y, *coords[2:]]
+    return [_rebuild_positions(child, positions) for child in coords]
+
+def _geometry_parts(geometry):
+    """Yield the coordinate-bearing geometries, descending into GeometryCollections"""
+    if not geometry:
+        return
+    if geometry.get('type') == 'GeometryCollection':
+        for child in geometry.get('geometries') or []:
+            yield from _geometry_parts(child)
+    elif geometry.get('coordinates'):
+        yield geometry
+
+def reproject_chunk(features, transformer, stats=None):
+    """Reproject every geometry in a chunk in place with one vectorized transform call"""
+    if transformer is None:
+        return features
+
+    import numpy as np
+
+    started = time.perf_counter()
+
+    parts = [part for feature in features for part in _geometry_parts(feature.get('geometry'))]
+    xs, ys = [], []
+    for part in parts:
+        _collect_positions(part['coordinates'], xs, ys)
+
+    if xs:
+        lons, lats = transformer.transform(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64))
+        positions = zip(lons.tolist(), lats.tolist())
+        for part in parts:
+            part['coordinates'] = _rebuild_positions(part['coordinates'], positions)
+
+    for feature in features:
+        geometry = feature.get('geometry')
+        if geometry:
+            geometry.pop('crs', None)
+
+    if stats is not None:
+        stats.features += len(features)
+        stats.vertices += len(xs)
+        stats.chunks += 1
+        stats.seconds += time.perf_counter() - started
+
+    return features
+
+def reproject_stream(features, transformer, stats=None, chunk_size=1000):
+    """Reproject a feature stream chunk by chunk, yielding features in their original order"""
+    if transformer is None:
+        yield from features
+        return
+
+    for chunk in iter_feature_chunks(features, chunk_size):
+        yield from reproject_chunk(chunk, transformer, stats)
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python parcel_reprojection.py <source_file> [source_crs]")
+        print("Example: python parcel_reprojection.py data/madison_parcels.shp")
+        print("Example: python parcel_reprojection.py data/burleson_landparcels.geojson EPSG:2277")
+        sys.exit(1)
+
+    source_file = sys.argv[1]
+    source_crs = sys.argv[2] if len(sys.argv) == 3 else None
+
+    if not source_exists(source_file):
+        print(f"❌ Error: {source_file} not found")
+        sys.exit(1)
+
+    total_features, features = open_source(source_file)
+    sample_feature, features = peek_features(features)
+
+    try:
+        source_crs = detect_source_crs(source_file, sample_feature, source_crs)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    transformer = build_transformer(source_crs)
+    if transformer is None:
+        print(f"✅ {source_file} is already in {TARGET_CRS} - nothing to reproject")
+        return
+
+    print(f"🧭 Source CRS: {transformer.source_crs.name}")
+    print(f"📊 Reprojecting {total_features} features to {TARGET_CRS} (dry run)...")
+
+    stats = ReprojectionStats()
+    for _ in reproject_stream(features, transformer, stats):
+        pass
+
+    print(stats.report())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Parcel source readers - stream county parcel features straight from the
+appraisal district drop without converting it to GeoJSON first.
+
+Supported sources:
+  - GeoJSON (.geojson / .json)
+  - Shapefile (.shp with its .dbf/.prj sidecars, or a zipped shapefile .zip) - needs `pip install pyshp`
+  - File Geodatabase (.gdb) and any other OGR format - needs `pip install fiona`
+
+Every reader yields GeoJSON-like feature dicts ({'properties': ..., 'geometry': ...})
+so records feed directly into the existing field detection and insert path. All of them
+stream: a GeoJSON FeatureCollection is decoded one feature at a time from fixed-size
+blocks (one pass to count the features, one to yield them), so memory stays flat however
+large the county's file is.
+
+Usage: python parcel_sources.py <source_file>
+Example: python parcel_sources.py data/madison_parcels.shp
+"""
+
+import json
+import os
+import re
+import sys
+import zipfile
+
+GEOJSON_EXTENSIONS = ('.geojson', '.json')
+GEOJSON_READ_SIZE = 1024 * 1024
+SHAPEFILE_EXTENSIONS = ('.shp', '.zip')
+
+def source_kind(source_file):
+    """Work out which reader handles the given source file"""
+    path = source_file.rstrip('/\\')
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext in GEOJSON_EXTENSIONS:
+        return 'geojson'
+    if ext in SHAPEFILE_EXTENSIONS:
+        return 'shapefile'
+    return 'ogr'
+
+def _split_layer(source_file):
+    """Split an optional ':layer' suffix off a geodatabase path (data/parcels.gdb:Parcels)"""
+    base, sep, layer = source_file.rpartition(':')
+    if sep and base.lower().rstrip('/\\').endswith('.gdb'):
+        return base, layer
+    return source_file, None
+
+def _open_shapefile(source_file):
+    try:
+        import shapefile
+    except ImportError:
+        print("❌ Error: Reading shapefiles requires pyshp (pip install pyshp)")
+        raise
+
+    # Appraisal district .dbf files are frequently latin-1; never abort a run on one bad byte
+    return shapefile.Reader(source_file, encodingErrors='replace')
+
+def _open_ogr(source_file):
+    try:
+        import fiona
+    except ImportError:
+        print("❌ Error: Reading File Geodatabase/OGR sources requires fiona (pip install fiona)")
+        raise
+
+    path, layer = _split_layer(source_file)
+    return fiona.open(path, layer=layer) if layer else fiona.open(path)
+
+def source_exists(source_file):
+    """Check the source exists on disk (geodatabases are directories)"""
+    path, _ = _split_layer(source_file)
+    return os.path.exists(path)
+
+def _zipped_prj(source_file):
+    """The .prj next to the archive's shapefile (the first .shp member, as pyshp reads it)"""
+    with zipfile.ZipFile(source_file) as archive:
+        members = archive.namelist()
+        shp_member = next((m for m in members if m.lower().endswith('.shp')), None)
+        if shp_member is None:
+            return None
+
+        prj_name = os.path.splitext(shp_member)[0].lower() + '.prj'
+        prj_member = next((m for m in members if m.lower() == prj_name), None)
+        if prj_member is None:
+            return None
+        return archive.read(prj_member).decode('utf-8', errors='replace').strip() or None
+
+def read_source_crs(source_file):
+    """Return the CRS declared by the source (WKT or an authority string), or None if it declares none"""
+    kind = source_kind(source_file)
+
+    if kind == 'geojson':
+        # Legacy GeoJSON 'crs' members sit in the document header, so there is no need to parse the whole file
+        with open(source_file, 'r') as f:
+            header = f.read(4096)
+        match = re.search(r'"crs"\s*:\s*\{.*?"name"\s*:\s*"([^"]+)"', header, re.DOTALL)
+        return match.group(1) if match else None
+
+    if kind == 'shapefile':
+        if source_file.lower().endswith('.zip'):
+            return _zipped_prj(source_file)
+        prj_file = os.path.splitext(source_file)[0] + '.prj'
+        if os.path.exists(prj_file):
+            with open(prj_file, 'r') as f:
+                return f.read().strip() or None
+        return None
+
+    with _open_ogr(source_file) as collection:
+        return collection.crs_wkt or None
+
+_FEATURES_ARRAY = re.compile(r'"features"\s*:\s*\[')
+
+def iter_geojson_features(source_file, read_size=GEOJSON_READ_SIZE):
+    """Yield the features of a GeoJSON FeatureCollection one at a time, reading read_size blocks"""
+    decoder = json.JSONDecoder()
+
+    with open(source_file, 'r', encoding='utf-8') as f:
+        buffer = ''
+        while True:
+            match = _FEATURES_ARRAY.search(buffer)
+            if match:
+                buffer = buffer[match.end():]
+                break
+            block = f.read(read_size)
+            if not block:
+                return
+            # Keep a tail in case the key straddles two blocks
+            buffer = buffer[-32:] + block
+
+        position = 0
+        eof = False
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+
+            if position < len(buffer) and buffer[position] == ']':
+                return
+
+            try:
+                if position >= len(buffer):
+                    raise json.JSONDecodeError("Need more data", buffer, position)
+                feature, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The next feature is incomplete: read another block and decode it again
+                if eof:
+                    raise ValueError(f"{source_file}: truncated or invalid GeoJSON features array")
+                block = f.read(read_size)
+                eof = not block
+                buffer = buffer[position:] + block
+                position = 0
+                continue
+
+            yield feature
+            position = end
+
+def _geojson_source(source_file):
+    total = sum(1 for _ in iter_geojson_features(source_file))
+    return total, iter_geojson_features(source_file)
+
+def _shapefile_source(source_file):
+    reader = _open_shapefile(source_file)
+
+    def stream():
+        try:
+            for shape_record in reader.iterShapeRecords():
+                shape = shape_record.shape
+                geometry = shape.__geo_interface__ if shape.shapeType != 0 else None
+                yield {
+                    'type': 'Feature',
+                    'properties': shape_record.record.as_dict(),
+                    'geometry': geometry,
+                }
+        finally:
+            reader.close()
+
+    return len(reader), stream()
+
+def _ogr_source(source_file):
+    collection = _open_ogr(source_file)
+
+    def stream():
+        try:
+            for feature in collection:
+                geometry = feature['geometry']
+                # fiona >= 1.9 returns model objects rather than plain dicts
+                geometry = getattr(geometry, '__geo_interface__', geometry)
+                yield {
+                    'type': 'Feature',
+                    'properties': dict(feature['properties']),
+                    'geometry': dict(geometry) if geometry is not None else None,
+                }
+        finally:
+            collection.close()
+
+    return len(collection), stream()
+
+def open_source(source_file):
+    """Open any supported source and return (total_features, feature_stream)
+
+    Shapefiles and geodatabases are read record by record; GeoJSON is decoded one
+    feature at a time by iter_geojson_features.
+    """
+    kind = source_kind(source_file)
+
+    if kind == 'geojson':
+        return _geojson_source(source_file)
+    if kind == 'shapefile':
+        return _shapefile_source(source_file)
+    return _ogr_source(source_file)
+
+def peek_features(features):
+    """Return (first_feature, feature_stream) where the stream still starts at the first feature"""
+    features = iter(features)
+    first_feature = next(features, None)
+
+    def replay():
+        if first_feature is not None:
+            yield first_feature
+        yield from features
+
+    return first_feature, replay()
+
+def iter_feature_chunks(features, chunk_size):
+    """Group a feature stream into lists of at most chunk_size features"""
+    chunk = []
+    for feature in features:
+        chunk.append(feature)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python parcel_sources.py <source_file>")
+        print("Example: python parcel_sources.py data/madison_parcels.shp")
+        sys.exit(1)
+
+    source_file = sys.argv[1]
+
+    if not source_exists(source_file):
+        print(f"❌ Error: {source_file} not found")
+        sys.exit(1)
+
+    total_features, features = open_source(source_file)
+    print(f"📂 Source: {source_file} ({source_kind(source_file)})")
+    print(f"📊 Features: {total_features}")
+
+    first_feature, _ = peek_features(features)
+    if first_feature:
+        print(f"📋 Sample properties keys: {list((first_feature.get('properties') or {}).keys())}")
+        print(f"🧭 Sample geometry type: {(first_feature.get('geometry') or {}).get('type')}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Partition-swap county import - reload a county by attaching a freshly loaded partition
+
+Requires properties to be list-partitioned by county_id (sql/partition-properties-by-county.sql).
+The new snapshot is streamed with COPY into a detached staging table, indexed and analyzed
+there, and the cutover is a short metadata transaction:
+
+  delete the county's saved_properties (what the DELETE-based reload cascades to today)
+  DETACH + DROP the old partition
+  ATTACH the staging table as the county's partition (its CHECK constraint skips the scan)
+
+Row mapping is the same as generate_county_import_sql.py (map_property_row), so both paths
+load identical rows.
+
+Usage: python partition_swap_import.py <county_name> <source_file> [--source-crs EPSG:2277] [--consolidate]
+Example: python partition_swap_import.py madison data/madison_parcels.shp
+"""
+
+import argparse
+import csv
+import io
+import json
+import re
+import sys
+import time
+from parcel_sources import open_source, peek_features, iter_feature_chunks, source_exists
+from parcel_reprojection import ReprojectionStats, detect_source_crs, build_transformer, reproject_stream
+from parcel_consolidation import consolidate_import_stream
+from generate_county_import_sql import detect_property_fields, map_property_row, post_load_sql
+from database import connect
+from detail_sidecar import build_county_sidecar
+
+COPY_CHUNK_SIZE = 5000
+COPY_COLUMNS = (
+    'county', 'county_id', 'prop_id', 'owner_name', 'situs_addr', 'mail_addr',
+    'land_value', 'mkt_value', 'gis_area', 'geometry',
+)
+
+def ensure_county_id(cur, county_name):
+    """Return the counties.id for the county, creating the county (and an empty partition) if needed"""
+    cur.execute("select public.ensure_county(%s)", (county_name.lower(),))
+    return cur.fetchone()[0]
+
+def is_partitioned(cur):
+    cur.execute("select relkind from pg_class where oid = 'public.properties'::regclass")
+    return cur.fetchone()[0] == 'p'
+
+def copy_values(row, county_id, geometry):
+    """Text values for COPY, rendered exactly as format_insert_statement renders them"""
+    return [
+        row['county'],
+        county_id,
+        str(row['prop_id']),
+        str(row['owner_name']),
+        str(row['situs_addr']),
+        str(row['mail_addr']),
+        str(row['land_value']),
+        str(row['mkt_value']),
+        str(row['gis_area']),
+        json.dumps(geometry),
+    ]
+
+def copy_rows(county_name, county_id, features, field_mapping, has_properties, first_index=1):
+    """COPY value lists for a chunk of features; features that fail to map are reported and skipped"""
+    rows = []
+    for idx, feature in enumerate(features):
+        feature_index = first_index + idx
+        try:
+            props = feature.get('properties') or {}
+            row = map_property_row(county_name, props, feature_index, field_mapping, has_properties)
+            rows.append(copy_values(row, county_id, feature.get('geometry') or {}))
+        except Exception as e:
+            print(f"⚠️ Error processing feature {feature_index}: {e}")
+    return rows
+
+def copy_csv(rows):
+    """COPY ... (format csv) input; every field is quoted so empty strings stay '' rather than NULL"""
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows(rows)
+    return buffer.getvalue()
+
+def copy_chunk(cur, table_name, rows):
+    cur.copy_expert(
+        f"copy public.{table_name} ({', '.join(COPY_COLUMNS)}) from stdin with (format csv)",
+        io.StringIO(copy_csv(rows)),
+    )
+
+def create_stage_indexes(cur, stage_table):
+    """Build the parent's indexes on the staging table so ATTACH can adopt them instead of building them"""
+    cur.execute(f"alter table public.{stage_table} add primary key (id, county_id)")
+
+    cur.execute("""
+        select pg_get_indexdef(x.indexrelid)
+        from pg_index x
+        where x.indrelid = 'public.properties'::regclass
+          and not exists (select 1 from pg_constraint c where c.conindid = x.indexrelid)
+        order by x.indexrelid
+    """)
+    index_defs = [row[0] for row in cur.fetchall()]
+
+    for n, index_def in enumerate(index_defs, start=1):
+        cur.execute(re.sub(
+            r'^CREATE (UNIQUE )?INDEX \S+ ON (ONLY )?public\.properties ',
+            lambda match: f"CREATE {match.group(1) or ''}INDEX {stage_table}_idx{n} ON public.{stage_table} ",
+            index_def,
+        ))
+
+    return len(index_defs)
+
+def swap_partition(cur, county_id, stage_table):
+    """Cut over: drop the county's old partition and attach the staging table in its place"""
+    partition_table = f'properties_c{county_id}'
+
+    cur.execute("set local lock_timeout = '30s'")
+    cur.execute("delete from public.saved_properties where county_id = %s", (county_id,))
+
+    cur.execute("select to_regclass(%s)", (f'public.{partition_table}',))
+    if cur.fetchone()[0] is not None:
+        cur.execute(f"alter table public.properties detach partition public.{partition_table}")
+        cur.execute(f"drop table public.{partition_table}")
+
+    cur.execute(f"alter table public.properties attach partition public.{stage_table} for values in ({int(county_id)})")
+    cur.execute(f"alter table public.{stage_table} rename to {partition_table}")
+    cur.execute(f"alter table public.{partition_table} drop constraint {stage_table}_county_check")
+    cur.execute(f"alter index public.{stage_table}_pkey rename to {partition_table}_pkey")
+
+    cur.execute(
+        "select indexrelid::regclass::text from pg_index where indrelid = %s::regclass",
+        (f'public.{partition_table}',),
+    )
+    for (index_name,) in cur.fetchall():
+        staged_prefix = f'{stage_table}_idx'
+        bare_name = index_name.split('.')[-1]
+        if bare_name.startswith(staged_prefix):
+            cur.execute(f"alter index public.{bare_name} rename to {partition_table}_idx{bare_name[len(staged_prefix):]}")
+
+def partition_swap_import(county_name, source_file, source_crs=None, consolidate=False):
+    """Load a county snapshot into a staging partition and swap it in"""
+
+    if not source_exists(source_file):
+        print(f"❌ Error: {source_file} not found")
+        return False
+
+    print(f"📂 Loading {source_file}...")
+
+    total_features, features = open_source(source_file)
+    print(f"📊 Found {total_features} {county_name.title()} County properties to import")
+
+    if total_features == 0:
+        print("❌ No features found in source file")
+        return False
+
+    sample_feature, features = peek_features(features)
+    sample_props = (sample_feature.get('properties') or {}) if sample_feature else {}
+
+    field_mapping = detect_property_fields(sample_props)
+    print(f"🔍 Detected field mapping: {field_mapping}")
+
+    has_properties = bool(sample_props)
+    if not has_properties:
+        print("⚠️ Properties are empty - will generate synthetic property data")
+
+    try:
+        source_crs = detect_source_crs(source_file, sample_feature, source_crs)
+        transformer = build_transformer(source_crs)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
+
+    reprojection_stats = ReprojectionStats()
+    if transformer is not None:
+        print(f"🧭 Reprojecting from {transformer.source_crs.name} to EPSG:4326")
+        features = reproject_stream(features, transformer, reprojection_stats)
+
+    # One row per Prop_ID: merge multipart/duplicate features before anything is copied
+    if consolidate:
+        total_features, features = consolidate_import_stream(county_name, total_features, features, field_mapping)
+
+    conn = connect()
+
+    try:
+        with conn.cursor() as cur:
+            if not is_partitioned(cur):
+                print("❌ Error: properties is not partitioned - run sql/partition-properties-by-county.sql first")
+                return False
+
+            county_id = ensure_county_id(cur, county_name)
+            stage_table = f'properties_c{county_id}_stage'
+
+            print(f"🧱 Creating staging partition {stage_table} (county_id {county_id})...")
+            cur.execute(f"drop table if exists public.{stage_table}")
+            cur.execute(f"""
+                create table public.{stage_table} (
+                  like public.properties including defaults including generated including storage
+                )
+            """)
+            cur.execute(f"alter table public.{stage_table} add constraint {stage_table}_county_check check (county_id = {int(county_id)})")
+        conn.commit()
+
+        started = time.perf_counter()
+        loaded = 0
+
+        with conn.cursor() as cur:
+            for chunk_index, chunk in enumerate(iter_feature_chunks(features, COPY_CHUNK_SIZE)):
+                rows = copy_rows(
+                    county_name, county_id, chunk, field_mapping, has_properties,
+                    first_index=chunk_index * COPY_CHUNK_SIZE + 1,
+                )
+                copy_chunk(cur, stage_table, rows)
+                loaded += len(rows)
+                print(f"📦 Copied {loaded}/{total_features} properties...")
+        conn.commit()
+
+        load_seconds = time.perf_counter() - started
+        print(f"✅ Loaded {loaded} rows in {load_seconds:.1f}s ({loaded / load_seconds if load_seconds else 0:,.0f} rows/s)")
+        if transformer is not None:
+            print(reprojection_stats.report())
+
+        print("🔧 Indexing and analyzing the staging partition...")
+        started = time.perf_counter()
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("set maintenance_work_mem = '1GB'")
+            cur.execute("set statement_timeout = 0")
+            index_count = create_stage_indexes(cur, stage_table)
+            cur.execute(f"analyze public.{stage_table}")
+        conn.autocommit = False
+        print(f"✅ Built primary key + {index_count} index(es) in {time.perf_counter() - started:.1f}s")
+
+        print("🔀 Swapping partitions...")
+        started = time.perf_counter()
+        with conn.cursor() as cur:
+            swap_partition(cur, county_id, stage_table)
+        conn.commit()
+        print(f"✅ Cutover completed in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+        with conn.cursor() as cur:
+            cur.execute(post_load_sql(county_name))
+        conn.commit()
+
+        try:
+            header = build_county_sidecar(conn, county_id, county_name, county_slug=county_name.lower())
+            print(f"🗂️ Wrote detail sidecar ({header['count']} records, data version {header['dataVersion']})")
+        except Exception as e:
+            conn.rollback()
+            print(f"⚠️ Error writing detail sidecar: {e}")
+
+        print(f"\n🎉 {loaded} {county_name.title()} County properties are live")
+        return True
+
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error during partition-swap import: {e}")
+        print("The live partition is untouched; the staging table is dropped on the next run")
+        return False
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reload a county by loading a detached partition and attaching it",
+        epilog="Example: python partition_swap_import.py madison data/madison_parcels.shp",
+    )
+    parser.add_argument('county_name', help="County name, e.g. madison")
+    parser.add_argument('source_file', help="GeoJSON, shapefile (.shp/.zip) or geodatabase (.gdb[:layer])")
+    parser.add_argument('--source-crs', help="Source CRS when the file does not declare one, e.g. EPSG:2277")
+    parser.add_argument('--consolidate', action='store_true', help="Merge features sharing a Prop_ID into one MultiPolygon row")
+    args = parser.parse_args()
+
+    print("🚀 Starting partition-swap county import...")
+    print(f"📍 County: {args.county_name.title()}")
+    print(f"📂 Source: {args.source_file}")
+    print("🗄️ Target: properties partition (via DATABASE_URL)")
+    print("-" * 70)
+
+    if not partition_swap_import(args.county_name, args.source_file, args.source_crs, args.consolidate):
+        print(f"\n❌ {args.county_name.title()} County import failed!")
+        sys.exit(1)
+
+    print(f"\n✅ {args.county_name.title()} County import completed successfully!")
+
+if __name__ == "__main__":
+    main()
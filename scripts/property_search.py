@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Owner and address search - rebuild a county's search entries and query them
+
+public.property_search holds each parcel's owner name and situs address normalized
+(normalize_owner_name / normalize_situs_address) with prefix and pg_trgm indexes.
+search_properties() ranks exact keys, then key prefixes, then trigram word similarity,
+which covers token lookups ("SMITH" in "SMITH JOHN & MARY") and misspellings.
+
+Usage:
+  python property_search.py build <county_name>
+  python property_search.py search <query> [--county madison] [--field any|owner|address] [--limit 20]
+Example: python property_search.py search "smith family" --county madison
+"""
+
+import argparse
+import sys
+import time
+from supabase_client import get_supabase
+
+SEARCH_FIELDS = ('any', 'owner', 'address')
+
+def build_property_search(supabase, county_name):
+    """Rebuild the county's search entries from its current rows; returns the number stored"""
+    result = supabase.rpc('build_property_search', {'p_county': county_name.lower()}).execute()
+    return result.data
+
+def search_properties(supabase, query, county_name=None, field='any', limit=20, min_similarity=0.5):
+    """Top matches for a free-text owner/address query, best first"""
+    if field not in SEARCH_FIELDS:
+        raise ValueError(f"field must be one of {', '.join(SEARCH_FIELDS)}")
+
+    result = supabase.rpc('search_properties', {
+        'p_query': query,
+        'p_county': county_name.lower() if county_name else None,
+        'p_field': field,
+        'p_limit': limit,
+        'p_min_similarity': min_similarity,
+    }).execute()
+    return result.data or []
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the owner/address search index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Rebuild a county's search entries after an import")
+    build_parser.add_argument('county_name')
+
+    search_parser = subparsers.add_parser('search', help="Search owner names and situs addresses")
+    search_parser.add_argument('query')
+    search_parser.add_argument('--county', help="Only search this county")
+    search_parser.add_argument('--field', choices=SEARCH_FIELDS, default='any')
+    search_parser.add_argument('--limit', type=int, default=20)
+    search_parser.add_argument('--min-similarity', type=float, default=0.5, help="Trigram word similarity cutoff (default: 0.5)")
+
+    args = parser.parse_args()
+    supabase = get_supabase()
+
+    if args.command == 'build':
+        print(f"🔎 Building search entries for {args.county_name.title()} County...")
+        started = time.perf_counter()
+        try:
+            entry_count = build_property_search(supabase, args.county_name)
+        except Exception as e:
+            print(f"❌ Error building search entries: {e}")
+            sys.exit(1)
+        print(f"✅ Stored {entry_count} search entries in {time.perf_counter() - started:.1f}s")
+        return
+
+    started = time.perf_counter()
+    try:
+        matches = search_properties(supabase, args.query, args.county, args.field, args.limit, args.min_similarity)
+    except Exception as e:
+        print(f"❌ Error searching: {e}")
+        sys.exit(1)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    scope = f"{args.county.title()} County" if args.county else "all counties"
+    print(f"🔍 {len(matches)} match(es) for \"{args.query}\" in {scope} ({elapsed_ms:.0f}ms)")
+
+    for match in matches:
+        print(
+            f"   [{match['score']:.2f} {match['match_field']}] {match['county'].title()} #{match['prop_id']}: "
+            f"{match['owner_name']} - {match['situs_addr']}"
+        )
+
+if __name__ == "__main__":
+    main()
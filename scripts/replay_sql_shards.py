@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Replay a sharded SQL import produced by generate_county_import_sql.py --shards N [--gzip]
+
+The pre-load file (the county DELETE) runs first on its own, then the shards are
+loaded concurrently, one psql session per shard, over at most --jobs connections.
+Each shard is its own transaction, so a failed shard can be re-run by itself.
+The post-load file (derived-data refreshes) runs once every shard has loaded, and the
+county's detail sidecar (detail_sidecar.py) is rewritten last.
+
+With --bulk-load the properties indexes are suspended before the load and rebuilt
+in parallel afterwards (see bulk_load_indexes.py); --cluster also reorders the
+county's partition spatially before the rebuild. The indexes are rebuilt even if the
+pre-load or a shard fails; pass --keep-suspended to leave them dropped while the
+failed shards are re-run.
+
+Usage: python replay_sql_shards.py <manifest_file> [--jobs N] [--database-url URL] [--bulk-load [--cluster] [--keep-suspended]]
+Example: python replay_sql_shards.py import_madison.manifest.json --jobs 4
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from database import connect
+from bulk_load_indexes import suspend_indexes, finish_bulk_load
+from detail_sidecar import build_detail_sidecars
+
+def open_sql(path):
+    """Open a plain or gzip-compressed SQL file for binary reading"""
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+def run_sql_file(database_url, path):
+    """Stream one SQL file into its own psql session; returns (seconds, error_output)"""
+    started = time.perf_counter()
+
+    process = subprocess.Popen(
+        ['psql', database_url, '--quiet', '--no-psqlrc', '-v', 'ON_ERROR_STOP=1', '-f', '-'],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
+    try:
+        with open_sql(path) as f:
+            shutil.copyfileobj(f, process.stdin, length=1024 * 1024)
+        process.stdin.close()
+    except BrokenPipeError:
+        # psql already exited (ON_ERROR_STOP); its stderr explains why
+        pass
+
+    stderr = process.stderr.read().decode('utf-8', errors='replace')
+    process.wait()
+    elapsed = time.perf_counter() - started
+
+    return elapsed, (stderr.strip() or f"psql exited with {process.returncode}") if process.returncode else None
+
+def load_shards(manifest, base_dir, database_url, jobs):
+    """Run the pre-load file, then every shard concurrently; returns True if all of them loaded"""
+    shards = manifest['shards']
+    total_rows = sum(shard['rows'] for shard in shards)
+
+    pre_file = os.path.join(base_dir, manifest['pre'])
+    print(f"🗑️ Running pre-load {manifest['pre']}...")
+    seconds, error = run_sql_file(database_url, pre_file)
+    if error:
+        print(f"❌ Pre-load failed after {seconds:.1f}s: {error}")
+        return False
+    print(f"✅ Pre-load finished in {seconds:.1f}s")
+
+    jobs = max(1, min(jobs, len(shards)))
+    print(f"📦 Loading shards over {jobs} connection(s)...")
+
+    started = time.perf_counter()
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(run_sql_file, database_url, os.path.join(base_dir, shard['file'])): shard
+            for shard in shards
+        }
+
+        for future in as_completed(futures):
+            shard = futures[future]
+            seconds, error = future.result()
+            rate = shard['rows'] / seconds if seconds > 0 else 0
+
+            if error:
+                failed.append(shard)
+                print(f"❌ {shard['file']} failed after {seconds:.1f}s: {error}")
+            else:
+                print(f"✅ {shard['file']}: {shard['rows']} rows in {seconds:.1f}s ({rate:,.0f} rows/s)")
+
+    elapsed = time.perf_counter() - started
+    loaded_rows = total_rows - sum(shard['rows'] for shard in failed)
+    rate = loaded_rows / elapsed if elapsed > 0 else 0
+
+    print(f"\n🎉 Replay completed in {elapsed:.1f}s")
+    print(f"📊 Loaded {loaded_rows}/{total_rows} rows ({rate:,.0f} rows/s)")
+
+    if failed:
+        print(f"⚠️ {len(failed)} shard(s) failed - re-run them individually:")
+        for shard in failed:
+            print(f"   {shard['file']}")
+        return False
+
+    return True
+
+def replay_manifest(manifest_file, database_url, jobs, bulk_load=False, cluster=False, keep_suspended=False):
+    """Run the pre-load file, every shard concurrently, then the post-load file; returns True on success
+
+    With bulk_load the suspended indexes are rebuilt even when the load fails, unless
+    keep_suspended is set (to re-run failed shards before paying for the rebuild).
+    """
+
+    with open(manifest_file, 'r') as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    county = manifest['county']
+    shards = manifest['shards']
+    total_rows = sum(shard['rows'] for shard in shards)
+
+    print(f"📊 {len(shards)} shard(s), {total_rows} {county.title()} County properties")
+
+    if bulk_load:
+        conn = connect(database_url)
+        try:
+            dropped = suspend_indexes(conn)
+        finally:
+            conn.close()
+        print(f"⏸️ Suspended {len(dropped)} index(es) for the bulk load: {', '.join(dropped) or 'none'}")
+
+    loaded = False
+    try:
+        loaded = load_shards(manifest, base_dir, database_url, jobs)
+    finally:
+        # Never leave properties without its indexes unless asked to: a failed load
+        # still gets them rebuilt, the same way import_county_parcels.py does
+        if bulk_load and (loaded or not keep_suspended):
+            conn = connect(database_url)
+            try:
+                finish_bulk_load(conn, database_url, cluster=cluster and loaded, county_name=county)
+            finally:
+                conn.close()
+        elif bulk_load:
+            print("⚠️ Indexes are still suspended (--keep-suspended) - run bulk_load_indexes.py rebuild once the shards are in")
+
+    if not loaded:
+        return False
+
+    if manifest.get('post'):
+        print(f"📊 Running post-load {manifest['post']}...")
+        seconds, error = run_sql_file(database_url, os.path.join(base_dir, manifest['post']))
+        if error:
+            print(f"❌ Post-load failed after {seconds:.1f}s: {error}")
+            return False
+        print(f"✅ Post-load finished in {seconds:.1f}s")
+
+    # After the post-load stamp, so the sidecar carries the new data version
+    try:
+        print(f"🗂️ Writing detail sidecar for {county.title()} County...")
+        build_detail_sidecars([county], database_url=database_url)
+    except Exception as e:
+        print(f"⚠️ Error writing detail sidecar: {e}")
+
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay a sharded county SQL import concurrently",
+        epilog="Example: python replay_sql_shards.py import_madison.manifest.json --jobs 4",
+    )
+    parser.add_argument('manifest_file', help="Manifest written by generate_county_import_sql.py --shards")
+    parser.add_argument('--jobs', type=int, default=4, help="Maximum concurrent connections (default: 4)")
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'), help="Defaults to $DATABASE_URL")
+    parser.add_argument('--bulk-load', action='store_true', help="Suspend properties indexes during the load and rebuild them after")
+    parser.add_argument('--cluster', action='store_true', help="With --bulk-load, CLUSTER the county's partition spatially before the rebuild")
+    parser.add_argument('--keep-suspended', action='store_true', help="With --bulk-load, leave the indexes suspended if a shard fails instead of rebuilding them")
+    args = parser.parse_args()
+
+    if not args.database_url:
+        print("Error: Please set DATABASE_URL or pass --database-url")
+        sys.exit(1)
+
+    if not os.path.exists(args.manifest_file):
+        print(f"❌ Error: {args.manifest_file} not found")
+        sys.exit(1)
+
+    if shutil.which('psql') is None:
+        print("❌ Error: psql was not found on PATH")
+        sys.exit(1)
+
+    print("🚀 Replaying sharded SQL import...")
+    print(f"📂 Manifest: {args.manifest_file}")
+    print(f"🔀 Jobs: {args.jobs}")
+    print("-" * 70)
+
+    if not replay_manifest(args.manifest_file, args.database_url, args.jobs, args.bulk_load, args.cluster, args.keep_suspended):
+        print("\n❌ Replay finished with errors!")
+        sys.exit(1)
+
+    print("\n✅ Replay completed successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Skip-trace contact store - ingest provider responses and check for existing contacts
+
+Takes the { "results": [{ propertyId, status, data }] } documents the skip-trace routes
+return (Enformion: data.person, see references/enformion.json; BatchData: data.name /
+data.phoneNumbers / data.emails) and flattens them into persons, phones and emails.
+
+Phone numbers are normalized to 10 digits and emails lowercased, then bulk-upserted so
+each number/address is stored once however many parcels and providers reported it.
+Every completed lookup is recorded in skip_trace_lookups, matched or not.
+
+Usage:
+  python skip_trace_contacts.py ingest <results.json> [...] [--provider enformion|batchdata]
+  python skip_trace_contacts.py lookup --parcel burnet 12345 | --owner "SMITH JOHN" | --property-id 123
+Example: python skip_trace_contacts.py ingest references/enformion.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import datetime
+from owner_names import normalize_owner_name
+from database import connect
+
+PROVIDERS = ('enformion', 'batchdata')
+
+_NON_DIGITS = re.compile(r'\D+')
+_PHONE_TYPES = {'mobile': 'mobile', 'wireless': 'mobile', 'landline': 'landline', 'land line': 'landline'}
+
+def normalize_phone(number):
+    """10-digit US number ('5127567747'), or None if the value is not one"""
+    digits = _NON_DIGITS.sub('', str(number or ''))
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    return digits if len(digits) == 10 else None
+
+def normalize_email(email):
+    email = str(email or '').strip().lower()
+    return email if '@' in email else None
+
+def normalize_phone_type(phone_type):
+    phone_type = str(phone_type or '').strip().lower()
+    return _PHONE_TYPES.get(phone_type, phone_type or None)
+
+def parse_date(value):
+    """Provider dates ('8/1/2025' or ISO) as an ISO date string, None if unparseable"""
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return datetime.strptime(value, '%m/%d/%Y').date().isoformat()
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d').date().isoformat()
+    except ValueError:
+        return None
+
+def detect_provider(data):
+    if 'person' in data:
+        return 'enformion'
+    if 'phoneNumbers' in data or 'name' in data or 'meta' in data:
+        return 'batchdata'
+    return None
+
+def _enformion_contacts(data):
+    person = data.get('person') or {}
+    name = person.get('name') or {}
+    full_name = ' '.join(part for part in (name.get('firstName'), name.get('middleName'), name.get('lastName')) if part)
+    age = str(person.get('age') or '').strip()
+
+    person_row = {
+        'first_name': name.get('firstName'),
+        'middle_name': name.get('middleName'),
+        'last_name': name.get('lastName'),
+        'full_name': full_name or None,
+        'age': int(age) if age.isdigit() else None,
+        'identity_score': data.get('identityScore'),
+    }
+    phones = [
+        {
+            'number': phone.get('number'),
+            'phone_type': phone.get('type'),
+            'carrier': None,
+            'is_connected': phone.get('isConnected'),
+            'dnc': None,
+            'first_reported': parse_date(phone.get('firstReportedDate')),
+            'last_reported': parse_date(phone.get('lastReportedDate')),
+        }
+        for phone in person.get('phones') or []
+    ]
+    emails = [
+        {'email': email.get('email'), 'is_validated': email.get('isValidated'), 'is_business': email.get('isBusiness')}
+        for email in person.get('emails') or []
+    ]
+    return person_row, phones, emails, data.get('requestId')
+
+def _batchdata_contacts(data):
+    name = data.get('name') or {}
+    full_name = name.get('full') or ' '.join(part for part in (name.get('first'), name.get('middle'), name.get('last')) if part)
+
+    person_row = {
+        'first_name': name.get('first'),
+        'middle_name': name.get('middle'),
+        'last_name': name.get('last'),
+        'full_name': full_name or None,
+        'age': None,
+        'identity_score': None,
+    }
+    phones = [
+        {
+            'number': phone.get('number'),
+            'phone_type': phone.get('type'),
+            'carrier': phone.get('carrier'),
+            'is_connected': phone.get('reachable'),
+            'dnc': phone.get('dnc'),
+            'first_reported': None,
+            'last_reported': parse_date(phone.get('lastReportedDate')),
+        }
+        for phone in data.get('phoneNumbers') or []
+    ]
+    emails = [
+        {'email': email.get('email'), 'is_validated': email.get('tested'), 'is_business': None}
+        for email in data.get('emails') or []
+    ]
+    return person_row, phones, emails, None
+
+def flatten_results(documents, provider=None):
+    """Flatten results documents into (lookups, persons, phones, emails) row lists, deduplicated"""
+    lookups, persons, phones, emails = {}, {}, {}, {}
+    results = [result for document in documents for result in document.get('results') or []]
+
+    for result in results:
+        property_id = result.get('propertyId')
+        data = result.get('data')
+        if result.get('status') != 'completed' or property_id is None or not isinstance(data, dict):
+            continue
+
+        result_provider = provider or detect_provider(data)
+        if result_provider not in PROVIDERS:
+            continue
+
+        extract = _enformion_contacts if result_provider == 'enformion' else _batchdata_contacts
+        person_row, phone_rows, email_rows, request_id = extract(data)
+
+        phone_rows = [dict(row, number=normalize_phone(row['number']), phone_type=normalize_phone_type(row['phone_type'])) for row in phone_rows]
+        phone_rows = [row for row in phone_rows if row['number']]
+        email_rows = [dict(row, email=normalize_email(row['email'])) for row in email_rows]
+        email_rows = [row for row in email_rows if row['email']]
+
+        matched = bool(person_row['full_name'] or phone_rows or email_rows)
+        lookups[(property_id, result_provider)] = {
+            'property_id': property_id, 'provider': result_provider, 'matched': matched, 'request_id': request_id,
+        }
+        if not matched:
+            continue
+
+        person_key = normalize_owner_name(person_row['full_name'])
+        key = (property_id, result_provider, person_key)
+        persons[key] = dict(person_row, property_id=property_id, provider=result_provider, person_key=person_key)
+
+        for row in phone_rows:
+            phones[key + (row['number'],)] = dict(row, property_id=property_id, provider=result_provider, person_key=person_key)
+        for row in email_rows:
+            emails[key + (row['email'],)] = dict(row, property_id=property_id, provider=result_provider, person_key=person_key)
+
+    return list(lookups.values()), list(persons.values()), list(phones.values()), list(emails.values())
+
+_STAGE_TABLES = {
+    '_trace_lookups': ('property_id bigint, provider text, matched boolean, request_id text',
+                       ('property_id', 'provider', 'matched', 'request_id')),
+    '_trace_persons': ('property_id bigint, provider text, person_key text, first_name text, middle_name text, '
+                       'last_name text, full_name text, age integer, identity_score integer',
+                       ('property_id', 'provider', 'person_key', 'first_name', 'middle_name', 'last_name',
+                        'full_name', 'age', 'identity_score')),
+    '_trace_phones': ('property_id bigint, provider text, person_key text, number text, phone_type text, carrier text, '
+                      'is_connected boolean, dnc boolean, first_reported date, last_reported date',
+                      ('property_id', 'provider', 'person_key', 'number', 'phone_type', 'carrier',
+                       'is_connected', 'dnc', 'first_reported', 'last_reported')),
+    '_trace_emails': ('property_id bigint, provider text, person_key text, email text, is_validated boolean, is_business boolean',
+                      ('property_id', 'provider', 'person_key', 'email', 'is_validated', 'is_business')),
+}
+
+_UPSERT_SQL = """
+insert into public.skip_trace_lookups (county, prop_id, provider, property_id, matched, request_id, traced_at)
+select distinct on (p.county, p.prop_id, t.provider)
+       p.county, p.prop_id, t.provider, t.property_id, t.matched, t.request_id, now()
+from _trace_lookups t
+join public.properties p on p.id = t.property_id
+order by p.county, p.prop_id, t.provider, t.matched desc
+on conflict (county, prop_id, provider) do update
+set property_id = excluded.property_id,
+    matched = excluded.matched,
+    request_id = excluded.request_id,
+    traced_at = excluded.traced_at;
+
+insert into public.persons
+  (county, prop_id, provider, person_key, property_id, owner_key,
+   first_name, middle_name, last_name, full_name, age, identity_score, traced_at)
+select distinct on (p.county, p.prop_id, t.provider, t.person_key)
+       p.county, p.prop_id, t.provider, t.person_key, t.property_id, public.normalize_owner_name(p.owner_name),
+       t.first_name, t.middle_name, t.last_name, t.full_name, t.age, t.identity_score, now()
+from _trace_persons t
+join public.properties p on p.id = t.property_id
+order by p.county, p.prop_id, t.provider, t.person_key, t.property_id desc
+on conflict (county, prop_id, provider, person_key) do update
+set property_id = excluded.property_id,
+    owner_key = excluded.owner_key,
+    first_name = excluded.first_name,
+    middle_name = excluded.middle_name,
+    last_name = excluded.last_name,
+    full_name = excluded.full_name,
+    age = coalesce(excluded.age, persons.age),
+    identity_score = coalesce(excluded.identity_score, persons.identity_score),
+    traced_at = excluded.traced_at;
+
+-- Multipart parcels share a prop_id, hence the distinct on above; numbers and addresses
+-- are stored once even when several parcels or providers reported them in this batch
+insert into public.phones (number, phone_type, carrier, is_connected, dnc, first_reported, last_reported)
+select distinct on (number) number, phone_type, carrier, is_connected, dnc, first_reported, last_reported
+from _trace_phones
+order by number, last_reported desc nulls last
+on conflict (number) do update
+set phone_type = coalesce(excluded.phone_type, phones.phone_type),
+    carrier = coalesce(excluded.carrier, phones.carrier),
+    is_connected = coalesce(excluded.is_connected, phones.is_connected),
+    dnc = coalesce(excluded.dnc, phones.dnc),
+    first_reported = least(excluded.first_reported, phones.first_reported),
+    last_reported = greatest(excluded.last_reported, phones.last_reported),
+    updated_at = now();
+
+insert into public.emails (email, is_validated, is_business)
+select distinct on (email) email, is_validated, is_business
+from _trace_emails
+order by email, is_validated desc nulls last
+on conflict (email) do update
+set is_validated = coalesce(excluded.is_validated, emails.is_validated),
+    is_business = coalesce(excluded.is_business, emails.is_business),
+    updated_at = now();
+
+insert into public.person_phones (person_id, phone_id, provider)
+select pe.id, ph.id, t.provider
+from _trace_phones t
+join public.properties p on p.id = t.property_id
+join public.persons pe on (pe.county, pe.prop_id, pe.provider, pe.person_key) = (p.county, p.prop_id, t.provider, t.person_key)
+join public.phones ph on ph.number = t.number
+on conflict do nothing;
+
+insert into public.person_emails (person_id, email_id, provider)
+select pe.id, em.id, t.provider
+from _trace_emails t
+join public.properties p on p.id = t.property_id
+join public.persons pe on (pe.county, pe.prop_id, pe.provider, pe.person_key) = (p.county, p.prop_id, t.provider, t.person_key)
+join public.emails em on em.email = t.email
+on conflict do nothing;
+"""
+
+def upsert_contacts(conn, lookups, persons, phones, emails, page_size=1000):
+    """Bulk-upsert flattened rows in one transaction; returns the number of lookups whose parcel exists"""
+    from psycopg2.extras import execute_values
+
+    rows_by_table = {
+        '_trace_lookups': lookups,
+        '_trace_persons': persons,
+        '_trace_phones': phones,
+        '_trace_emails': emails,
+    }
+
+    with conn.cursor() as cur:
+        for table_name, (columns_sql, columns) in _STAGE_TABLES.items():
+            cur.execute(f"create temp table {table_name} ({columns_sql}) on commit drop")
+            rows = rows_by_table[table_name]
+            if rows:
+                execute_values(
+                    cur,
+                    f"insert into {table_name} ({', '.join(columns)}) values %s",
+                    [tuple(row[column] for column in columns) for row in rows],
+                    page_size=page_size,
+                )
+
+        cur.execute("select count(*) from _trace_lookups t join public.properties p on p.id = t.property_id")
+        known = cur.fetchone()[0]
+        cur.execute(_UPSERT_SQL)
+
+    conn.commit()
+    return known
+
+def has_contacts_for_parcel(supabase, county_name, prop_id):
+    """True if the parcel has already been traced with a match, by any provider
+
+    Keyed on (county, prop_id) through skip_trace_lookups, which holds every completed
+    lookup and survives a county reload.
+    """
+    result = (
+        supabase.from_('skip_trace_lookups')
+        .select('provider')
+        .eq('county', county_name.lower())
+        .eq('prop_id', str(prop_id))
+        .eq('matched', True)
+        .limit(1)
+        .execute()
+    )
+    return bool(result.data)
+
+def has_contacts_for_owner(supabase, owner_name):
+    """True if any traced parcel of this (normalized) owner already has a matched person
+
+    persons.owner_key is copied from the parcel's owner name at ingest, so it is blank for
+    parcels imported without one; has_contacts_for_parcel is the reliable per-parcel check.
+    """
+    owner_key = normalize_owner_name(owner_name)
+    if not owner_key:
+        return False
+    result = supabase.from_('persons').select('id').eq('owner_key', owner_key).limit(1).execute()
+    return bool(result.data)
+
+def contacts_for_property(supabase, property_id):
+    """Stored persons for a parcel with their phones and emails"""
+    return (
+        supabase.from_('persons')
+        .select('id, provider, full_name, age, traced_at, '
+                'person_phones(phones(number, phone_type, is_connected, dnc, last_reported)), '
+                'person_emails(emails(email, is_validated))')
+        .eq('property_id', property_id)
+        .execute()
+        .data
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest skip-trace results into the contact store and query it")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help="Flatten and upsert skip-trace result documents")
+    ingest_parser.add_argument('results_files', nargs='+', help="JSON documents returned by the skip-trace routes")
+    ingest_parser.add_argument('--provider', choices=PROVIDERS, help="Provider of every document (default: detect per result)")
+
+    lookup_parser = subparsers.add_parser('lookup', help="Check the store before calling a provider")
+    lookup_group = lookup_parser.add_mutually_exclusive_group(required=True)
+    lookup_group.add_argument('--parcel', nargs=2, metavar=('COUNTY', 'PROP_ID'), help="Parcel to check by county and prop_id")
+    lookup_group.add_argument('--owner', help="Parcel owner name")
+    lookup_group.add_argument('--property-id', type=int)
+
+    args = parser.parse_args()
+
+    if args.command == 'lookup':
+        from supabase_client import get_supabase
+        supabase = get_supabase()
+        if args.parcel:
+            county_name, prop_id = args.parcel
+            found = has_contacts_for_parcel(supabase, county_name, prop_id)
+            print(f"{'✅' if found else '❌'} Contacts {'already stored' if found else 'not stored'} for {county_name.title()} County parcel {prop_id}")
+            return
+        if args.owner:
+            found = has_contacts_for_owner(supabase, args.owner)
+            print(f"{'✅' if found else '❌'} Contacts {'already stored' if found else 'not stored'} for {normalize_owner_name(args.owner)}")
+            return
+        for person in contacts_for_property(supabase, args.property_id):
+            numbers = [link['phones']['number'] for link in person.get('person_phones') or []]
+            addresses = [link['emails']['email'] for link in person.get('person_emails') or []]
+            print(f"   [{person['provider']}] {person['full_name']}: phones {', '.join(numbers) or '-'}; emails {', '.join(addresses) or '-'}")
+        return
+
+    started = time.perf_counter()
+    documents = []
+
+    for results_file in args.results_files:
+        try:
+            with open(results_file, 'r') as f:
+                documents.append(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ Error reading {results_file}: {e}")
+            sys.exit(1)
+
+    lookups, persons, phones, emails = flatten_results(documents, args.provider)
+    print(f"📂 {len(documents)} file(s): {len(lookups)} lookups, {len(persons)} persons, {len(phones)} phones, {len(emails)} emails")
+
+    conn = connect()
+    try:
+        known = upsert_contacts(conn, lookups, persons, phones, emails)
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error upserting contacts: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    if known < len(lookups):
+        print(f"⚠️ Skipped {len(lookups) - known} lookup(s) for properties that no longer exist")
+    print(f"✅ Stored {known} lookup(s) in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Shared Supabase client setup for the import-time stage scripts
+"""
+
+import os
+import sys
+from supabase import create_client, Client
+
+# You'll need to set these environment variables
+SUPABASE_URL = os.getenv('SUPABASE_URL')
+SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+# PostgREST caps rows per request; page through anything larger than this
+PAGE_SIZE = 1000
+
+def get_supabase() -> Client:
+    """Create a service-role client, exiting with setup instructions if the environment is missing"""
+    if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
+        print("Error: Please set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY environment variables")
+        print("You can find these in your Supabase project settings > API")
+        sys.exit(1)
+
+    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+
+def fetch_all_rows(query_builder, page_size=PAGE_SIZE):
+    """Page through a select query with .range() until it is exhausted
+
+    query_builder is a zero-argument callable returning a fresh filtered select, since
+    supabase query builders cannot be reused once executed.
+    """
+    rows = []
+    start = 0
+
+    while True:
+        page = query_builder().range(start, start + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Saved-property user number maintenance (MAD-000001, BUR-000002, ...)
+
+Numbers are allocated in the database by allocate_user_numbers(): per county prefix a
+high-water mark plus a free list of released numbers (user_number_counters /
+user_number_free, kept in step with saved_properties by a trigger).
+
+  status    counters, free-list sizes, rows without a number and duplicated numbers
+  repair    rebuild counters and free lists from the numbers in use, then give rows that
+            have no number (or a duplicate of an earlier row's) a fresh allocation
+  renumber  compact every county's numbers to 1..n in one pass, keeping their current
+            order (rows without a number go last), then rebuild the allocator
+
+Usage: python user_numbers.py status | repair | renumber [--county madison ...]
+Example: python user_numbers.py repair
+"""
+
+import argparse
+import sys
+import time
+from database import connect
+
+_SAVED_WITH_PREFIX_SQL = """
+    select s.id, s.user_number, s.created_at, c.id as county_id, c.slug,
+           public.user_number_prefix(c.name) as prefix
+    from public.saved_properties s
+    join public.properties p on p.id = s.property_id
+    -- Resolved from p.county, like export_properties.county_filter_sql: older rows have no county_id
+    join public.counties c on c.slug = lower(p.county)
+    where (%(counties)s::text[] is null or c.slug = any(%(counties)s))
+"""
+
+def _county_params(county_names):
+    return {'counties': [name.lower() for name in county_names] if county_names else None}
+
+def allocator_status(conn):
+    with conn.cursor() as cur:
+        cur.execute("""
+            select c.prefix, c.high_water, count(f.number)
+            from public.user_number_counters c
+            left join public.user_number_free f on f.prefix = c.prefix
+            group by c.prefix, c.high_water
+            order by c.prefix
+        """)
+        counters = cur.fetchall()
+        cur.execute("select count(*) from public.saved_properties where user_number is null")
+        missing = cur.fetchone()[0]
+        cur.execute("""
+            select count(*) from (
+                select user_number from public.saved_properties
+                where user_number is not null
+                group by user_number having count(*) > 1
+            ) duplicates
+        """)
+        duplicated = cur.fetchone()[0]
+    conn.commit()
+    return counters, missing, duplicated
+
+def rebuild_allocator(conn):
+    """Recompute counters and free lists from saved_properties; returns the number of prefixes"""
+    with conn.cursor() as cur:
+        cur.execute("select public.rebuild_user_number_allocator()")
+        prefix_count = cur.fetchone()[0]
+    conn.commit()
+    return prefix_count
+
+def repair_user_numbers(conn, county_names=None):
+    """Rebuild the allocator, then allocate numbers for rows missing one; returns (duplicates cleared, numbers assigned)"""
+    params = _county_params(county_names)
+
+    with conn.cursor() as cur:
+        # Later holders of a duplicated number (concurrent saves under the old allocator) lose it
+        cur.execute(f"""
+            with saved as ({_SAVED_WITH_PREFIX_SQL}),
+            ranked as (
+                select id, row_number() over (partition by user_number order by created_at, id) as holder
+                from saved
+            )
+            update public.saved_properties s
+            set user_number = null
+            from ranked
+            where ranked.id = s.id
+              and ranked.holder > 1
+              and s.user_number is not null
+        """, params)
+        cleared = cur.rowcount
+    conn.commit()
+
+    rebuild_allocator(conn)
+
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            with saved as ({_SAVED_WITH_PREFIX_SQL})
+            select county_id, array_agg(id order by created_at, id)
+            from saved
+            where user_number is null
+            group by county_id
+        """, params)
+        missing_by_county = cur.fetchall()
+
+        assigned = 0
+        for county_id, saved_ids in missing_by_county:
+            cur.execute("select public.allocate_user_numbers(%s, %s)", (county_id, len(saved_ids)))
+            user_numbers = [row[0] for row in cur.fetchall()]
+            cur.execute(
+                """
+                update public.saved_properties s
+                set user_number = numbers.user_number
+                from unnest(%s::bigint[], %s::text[]) as numbers(id, user_number)
+                where s.id = numbers.id
+                """,
+                (saved_ids, user_numbers),
+            )
+            assigned += cur.rowcount
+    conn.commit()
+
+    return cleared, assigned
+
+def renumber_user_numbers(conn, county_names=None):
+    """Compact numbers to 1..n per prefix in one UPDATE; returns the rows whose number changed"""
+    params = _county_params(county_names)
+
+    with conn.cursor() as cur:
+        cur.execute("set local statement_timeout = 0")
+        cur.execute(f"""
+            with saved as ({_SAVED_WITH_PREFIX_SQL}),
+            numbered as (
+                select id, public.format_user_number(
+                    prefix,
+                    (row_number() over (partition by prefix order by user_number is null, length(user_number), user_number, created_at, id))::integer
+                ) as user_number
+                from saved
+            )
+            update public.saved_properties s
+            set user_number = numbered.user_number
+            from numbered
+            where numbered.id = s.id
+              and s.user_number is distinct from numbered.user_number
+        """, params)
+        changed = cur.rowcount
+    conn.commit()
+
+    rebuild_allocator(conn)
+    return changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect, repair and renumber saved-property user numbers")
+    parser.add_argument('command', choices=('status', 'repair', 'renumber'))
+    parser.add_argument('--county', action='append', help="Limit repair/renumber to this county (repeatable)")
+    args = parser.parse_args()
+
+    conn = connect()
+    started = time.perf_counter()
+
+    try:
+        if args.command == 'repair':
+            print("🔧 Repairing user numbers...")
+            cleared, assigned = repair_user_numbers(conn, args.county)
+            print(f"   Cleared {cleared} duplicated number(s)")
+            print(f"✅ Assigned {assigned} number(s) in {time.perf_counter() - started:.1f}s")
+        elif args.command == 'renumber':
+            print("🔢 Renumbering saved properties...")
+            changed = renumber_user_numbers(conn, args.county)
+            print(f"✅ Renumbered {changed} saved propert(ies) in {time.perf_counter() - started:.1f}s")
+
+        counters, missing, duplicated = allocator_status(conn)
+        print(f"📋 {len(counters)} prefix(es), {missing} saved propert(ies) without a number, {duplicated} duplicated number(s)")
+        for prefix, high_water, free_count in counters:
+            print(f"   {prefix}: high-water {high_water}, {free_count} free")
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
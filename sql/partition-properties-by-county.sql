@@ -0,0 +1,155 @@
+-- Convert properties into a table list-partitioned by county_id
+-- One partition per county (properties_c<county_id>), so county filters prune to a single
+-- partition and scripts/partition_swap_import.py can reload a county by attaching a
+-- freshly loaded partition instead of a mass DELETE plus reinsert.
+--
+-- Run once, during a maintenance window: psql 'your_connection_string' -f sql/partition-properties-by-county.sql
+
+BEGIN;
+
+SET LOCAL statement_timeout = 0;
+SET LOCAL maintenance_work_mem = '1GB';
+
+-- Every row needs a county_id to be routed to a partition
+insert into public.counties (name, state, slug)
+select distinct p.county as name, 'TX' as state, lower(p.county) as slug
+from public.properties p
+where p.county is not null and p.county <> ''
+on conflict do nothing;
+
+update public.properties p
+set county_id = c.id
+from public.counties c
+where p.county_id is null
+  and (c.slug = lower(p.county) or c.name = p.county);
+
+-- Rows without a county_id cannot be routed to a partition; stop here, before anything is swapped
+DO $$
+DECLARE
+  unmatched text;
+BEGIN
+  select string_agg(format('%L (%s rows)', county, row_count), ', ' order by county)
+  into unmatched
+  from (
+    select county, count(*) as row_count
+    from public.properties
+    where county_id is null
+    group by county
+  ) u;
+
+  IF unmatched IS NOT NULL THEN
+    RAISE EXCEPTION 'properties rows with no matching county: %', unmatched
+      USING HINT = 'Add the counties (or fix properties.county) and re-run; nothing has been changed.';
+  END IF;
+END$$;
+
+-- A foreign key to a partitioned table has to include the partition key, so
+-- saved_properties carries the county_id of the property it points at
+alter table public.saved_properties add column if not exists county_id bigint;
+
+update public.saved_properties s
+set county_id = p.county_id
+from public.properties p
+where p.id = s.property_id;
+
+alter table public.saved_properties drop constraint if exists saved_properties_property_id_fkey;
+
+create or replace function public.set_saved_property_county_id()
+returns trigger
+language plpgsql
+as $$
+begin
+  if new.county_id is null then
+    select county_id into new.county_id from public.properties where id = new.property_id;
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists trg_saved_properties_county_id on public.saved_properties;
+create trigger trg_saved_properties_county_id
+  before insert or update of property_id on public.saved_properties
+  for each row execute function public.set_saved_property_county_id();
+
+-- Swap in the partitioned table
+alter table public.properties rename to properties_unpartitioned;
+alter index if exists public.properties_pkey rename to properties_unpartitioned_pkey;
+alter table public.properties_unpartitioned rename constraint properties_county_id_fkey to properties_unpartitioned_county_id_fkey;
+
+create table public.properties (
+  like public.properties_unpartitioned including defaults including generated including storage
+) partition by list (county_id);
+
+alter table public.properties alter column county_id set not null;
+alter table public.properties add constraint properties_pkey primary key (id, county_id);
+alter table public.properties
+  add constraint properties_county_id_fkey
+  foreign key (county_id) references public.counties(id)
+  on update no action on delete no action;
+
+-- Keep the id sequence alive once the old table is dropped
+DO $$
+DECLARE
+  id_sequence text := pg_get_serial_sequence('public.properties_unpartitioned', 'id');
+BEGIN
+  IF id_sequence IS NOT NULL THEN
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY public.properties.id', id_sequence);
+  END IF;
+END$$;
+
+DO $$
+DECLARE
+  county_row record;
+BEGIN
+  FOR county_row IN
+    select distinct county_id from public.properties_unpartitioned where county_id is not null
+  LOOP
+    EXECUTE format(
+      'CREATE TABLE public.properties_c%s PARTITION OF public.properties FOR VALUES IN (%s)',
+      county_row.county_id, county_row.county_id
+    );
+  END LOOP;
+END$$;
+
+insert into public.properties
+select * from public.properties_unpartitioned;
+
+-- Recreate every other index as a partitioned index under its old name (constraint indexes
+-- are handled above). county_id is the partition key now, so idx_properties_county_id is not.
+DO $$
+DECLARE
+  index_row record;
+BEGIN
+  FOR index_row IN
+    select ix.relname as index_name, pg_get_indexdef(x.indexrelid) as index_def
+    from pg_index x
+    join pg_class ix on ix.oid = x.indexrelid
+    where x.indrelid = 'public.properties_unpartitioned'::regclass
+      and ix.relname <> 'idx_properties_county_id'
+      and not exists (select 1 from pg_constraint c where c.conindid = x.indexrelid)
+    order by x.indexrelid
+  LOOP
+    EXECUTE format('DROP INDEX public.%I', index_row.index_name);
+    EXECUTE replace(index_row.index_def, ' ON public.properties_unpartitioned ', ' ON public.properties ');
+  END LOOP;
+END$$;
+
+-- Same constraint name, so PostgREST embeds (properties!saved_properties_property_id_fkey) keep working
+alter table public.saved_properties
+  add constraint saved_properties_property_id_fkey
+  foreign key (property_id, county_id)
+  references public.properties(id, county_id)
+  on delete cascade;
+
+drop table public.properties_unpartitioned;
+
+analyze public.properties;
+
+COMMIT;
+
+-- Show the resulting partitions
+select inhrelid::regclass as partition, pg_get_expr(c.relpartbound, c.oid) as bounds
+from pg_inherits i
+join pg_class c on c.oid = i.inhrelid
+where i.inhparent = 'public.properties'::regclass
+order by 1;
@@ -1,17 +1,31 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase';
+import { getCountyDataVersion, dataVersionHeaders, notModifiedResponse } from '@/lib/countyDataVersion';
 
 export async function GET(request: NextRequest) {
   try {
     const { searchParams } = new URL(request.url);
     const county = searchParams.get('county') || 'burnet';
+    const countyId = searchParams.get('countyId');
+
+    const dataVersion = await getCountyDataVersion(county, countyId);
+    const notModified = notModifiedResponse(request, 'boundaries', dataVersion);
+    if (notModified) return notModified;
         
-    const { data: properties, error } = await supabase
+    let query = supabase
       .from('properties')
       .select('id, prop_id, geometry')
-      .eq('county', county)
       .range(0, 99999); 
 
+    // county_id is the partition key, so filtering on it prunes to one partition
+    if (countyId) {
+      query = query.eq('county_id', parseInt(countyId));
+    } else {
+      query = query.eq('county', county);
+    }
+
+    const { data: properties, error } = await query;
+
     if (error) {
       console.error("❌ API: Supabase error:", error);
       throw error;
@@ -29,7 +43,7 @@ export async function GET(request: NextRequest) {
       })),
     };
     
-    return NextResponse.json(geojson);
+    return NextResponse.json(geojson, { headers: dataVersionHeaders('boundaries', dataVersion) });
     
   } catch (error) {
     console.error('❌ Property boundaries API error:', error);
@@ -1,19 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase';
-
-interface PropertyDetails {
-  id: number;
-  propId: string;
-  ownerName: string | null;
-  situsAddr: string | null;
-  mailAddr: string | null;
-  landValue: number | null;
-  mktValue: number | null;
-  gisArea: number | null;
-  county: string;
-  county_id: number | null;
-  geometry?: string;
-}
+import { readSidecarDetails } from '@/lib/propertyDetailsSidecar';
 
 export async function GET(request: NextRequest) {
   try {
@@ -30,29 +17,32 @@ export async function GET(request: NextRequest) {
       return NextResponse.json({ error: 'Valid property IDs required' }, { status: 400 });
     }
     
-    const { data: properties, error } = await supabase
-      .from('properties')
-      .select('id, prop_id, owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, county, county_id, geometry')
-      .in('id', ids);
+    // Per-county sidecars answer with one positioned read per id; anything they cannot is read from the table
+    const { details: propertyDetails, missing } = await readSidecarDetails(ids);
 
-    if (error) throw error;
+    if (missing.length > 0) {
+      const { data: properties, error } = await supabase
+        .from('properties')
+        .select('id, prop_id, owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, county, county_id')
+        .in('id', missing);
 
-    const propertyDetails = properties.reduce((acc, prop) => {
-      acc[prop.id] = {
-        id: prop.id,
-        propId: prop.prop_id,
-        ownerName: prop.owner_name,
-        situsAddr: prop.situs_addr,
-        mailAddr: prop.mail_addr,
-        landValue: prop.land_value,
-        mktValue: prop.mkt_value,
-        gisArea: prop.gis_area,
-        county: prop.county,
-        county_id: prop.county_id,
-        geometry: prop.geometry,
-      };
-      return acc;
-    }, {} as Record<number, PropertyDetails>);
+      if (error) throw error;
+
+      for (const prop of properties) {
+        propertyDetails[prop.id] = {
+          id: prop.id,
+          propId: prop.prop_id,
+          ownerName: prop.owner_name,
+          situsAddr: prop.situs_addr,
+          mailAddr: prop.mail_addr,
+          landValue: prop.land_value,
+          mktValue: prop.mkt_value,
+          gisArea: prop.gis_area,
+          county: prop.county,
+          county_id: prop.county_id,
+        };
+      }
+    }
     
     return NextResponse.json(propertyDetails);
     
@@ -0,0 +1,83 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { supabase } from '@/lib/supabase';
+import { getCountyDataVersion, dataVersionHeaders, notModifiedResponse } from '@/lib/countyDataVersion';
+
+// build_parcel_grid() defaults, used when the county has no grid yet
+const DEFAULT_MIN_GRID_ZOOM = 8;
+const DEFAULT_MAX_GRID_ZOOM = 14;
+
+// The zoom range the county's grid was built with (parcel_grid.py --min-zoom/--max-zoom);
+// closer zooms should load real boundaries
+async function getGridZoomRange(county: string): Promise<[number, number]> {
+  const zoomQuery = (ascending: boolean) =>
+    supabase
+      .from('parcel_grid_cells')
+      .select('zoom')
+      .eq('county', county)
+      .order('zoom', { ascending })
+      .limit(1)
+      .maybeSingle();
+
+  const [min, max] = await Promise.all([zoomQuery(true), zoomQuery(false)]);
+  if (min.error) throw min.error;
+  if (max.error) throw max.error;
+
+  if (!min.data || !max.data) {
+    return [DEFAULT_MIN_GRID_ZOOM, DEFAULT_MAX_GRID_ZOOM];
+  }
+  return [min.data.zoom, max.data.zoom];
+}
+
+export async function GET(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const county = searchParams.get('county') || 'burnet';
+    const [minZoom, maxZoom] = await getGridZoomRange(county);
+    const requestedZoom = parseInt(searchParams.get('zoom') || `${minZoom}`);
+    const zoom = Math.min(Math.max(isNaN(requestedZoom) ? minZoom : requestedZoom, minZoom), maxZoom);
+
+    const dataVersion = await getCountyDataVersion(county, null);
+    const notModified = notModifiedResponse(request, `grid-z${zoom}`, dataVersion);
+    if (notModified) return notModified;
+
+    const { data: cells, error } = await supabase
+      .from('parcel_grid_cells')
+      .select('quadkey, tile_x, tile_y, parcel_count, total_acres, total_mkt_value, rep_lon, rep_lat')
+      .eq('county', county)
+      .eq('zoom', zoom)
+      .range(0, 99999);
+
+    if (error) throw error;
+
+    const geojson = {
+      type: "FeatureCollection",
+      zoom,
+      minZoom,
+      maxZoom,
+      features: cells.map((cell) => ({
+        type: "Feature",
+        properties: {
+          quadkey: cell.quadkey,
+          tileX: cell.tile_x,
+          tileY: cell.tile_y,
+          parcelCount: cell.parcel_count,
+          totalAcres: cell.total_acres,
+          totalMktValue: cell.total_mkt_value,
+        },
+        geometry: {
+          type: "Point",
+          coordinates: [cell.rep_lon, cell.rep_lat],
+        },
+      })),
+    };
+
+    return NextResponse.json(geojson, { headers: dataVersionHeaders(`grid-z${zoom}`, dataVersion) });
+
+  } catch (error) {
+    console.error('Property grid API error:', error);
+    return NextResponse.json(
+      { error: 'Failed to fetch property grid' },
+      { status: 500 }
+    );
+  }
+}
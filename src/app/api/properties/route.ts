@@ -1,5 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase';
+import { getCountyDataVersion, dataVersionHeaders, notModifiedResponse } from '@/lib/countyDataVersion';
 
 export async function GET(request: NextRequest) {
   try {
@@ -9,6 +10,10 @@ export async function GET(request: NextRequest) {
     
     const defaultCounty = 'burnet';
     
+    const dataVersion = await getCountyDataVersion(county || defaultCounty, countyId);
+    const notModified = notModifiedResponse(request, 'properties', dataVersion);
+    if (notModified) return notModified;
+    
     let query = supabase
       .from('properties')
       .select('id, prop_id, owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, geometry, county, county_id')
@@ -43,7 +48,7 @@ export async function GET(request: NextRequest) {
       })),
     };
     
-    return NextResponse.json(geojson);
+    return NextResponse.json(geojson, { headers: dataVersionHeaders('properties', dataVersion) });
     
   } catch (error) {
     console.error('Properties API error:', error);
@@ -0,0 +1,67 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { supabase } from '@/lib/supabase';
+
+const SEARCH_FIELDS = ['any', 'owner', 'address'];
+const MAX_LIMIT = 100;
+
+export async function GET(request: NextRequest) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const query = (searchParams.get('q') || '').trim();
+    const county = searchParams.get('county');
+    const field = searchParams.get('field') || 'any';
+    const requestedLimit = parseInt(searchParams.get('limit') || '20');
+    const limit = Math.min(Math.max(isNaN(requestedLimit) ? 20 : requestedLimit, 1), MAX_LIMIT);
+
+    if (!query) {
+      return NextResponse.json(
+        { error: 'Missing search query (q)' },
+        { status: 400 }
+      );
+    }
+
+    if (!SEARCH_FIELDS.includes(field)) {
+      return NextResponse.json(
+        { error: `field must be one of ${SEARCH_FIELDS.join(', ')}` },
+        { status: 400 }
+      );
+    }
+
+    const { data: matches, error } = await supabase.rpc('search_properties', {
+      p_query: query,
+      p_county: county ? county.toLowerCase() : null,
+      p_field: field,
+      p_limit: limit,
+    });
+
+    if (error) throw error;
+
+    return NextResponse.json({
+      query,
+      results: (matches || []).map((match: {
+        property_id: number;
+        county: string;
+        prop_id: string;
+        owner_name: string;
+        situs_addr: string;
+        match_field: string;
+        score: number;
+      }) => ({
+        id: match.property_id,
+        county: match.county,
+        propId: match.prop_id,
+        ownerName: match.owner_name,
+        situsAddr: match.situs_addr,
+        matchField: match.match_field,
+        score: match.score,
+      })),
+    });
+
+  } catch (error) {
+    console.error('Property search API error:', error);
+    return NextResponse.json(
+      { error: 'Failed to search properties' },
+      { status: 500 }
+    );
+  }
+}
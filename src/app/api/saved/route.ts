@@ -1,6 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { supabase } from '@/lib/supabase';
-import { getNextUserNumber } from '@/utils/propertyNumbering';
+import { getNextUserNumber, releaseUserNumbers } from '@/utils/propertyNumbering';
 
 export async function GET(request: NextRequest) {
   try {
@@ -146,7 +146,10 @@ export async function POST(request: NextRequest) {
         user_number: userNumber
       });
 
-    if (error) throw error;
+    if (error) {
+      await releaseUserNumbers([userNumber]);
+      throw error;
+    }
 
     return NextResponse.json({ 
       ok: true, 
@@ -1,7 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getProviderById } from '@/config/skipTraceProviders';
 
-const BATCHDATA_BASE_URL = 'https://api.batchdata.com';
+const BATCHDATA_BASE_URL = process.env.BATCHDATA_BASE_URL || 'https://api.batchdata.com';
 interface EditablePropertyData {
   propertyId: number;
   firstName: string;
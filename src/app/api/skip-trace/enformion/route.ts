@@ -2,7 +2,7 @@ import { NextRequest, NextResponse } from 'next/server';
 import { getProviderByEndpoint } from '@/config/skipTraceProviders';
 import { buildPayloadFromTemplate } from '@/utils/payloadBuilder';
 
-const ENFORMION_BASE_URL = 'https://devapi.enformion.com';
+const ENFORMION_BASE_URL = process.env.ENFORMION_BASE_URL || 'https://devapi.enformion.com';
 
 interface EditablePropertyData {
   propertyId: number;
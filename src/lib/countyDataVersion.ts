@@ -0,0 +1,87 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { supabase } from '@/lib/supabase';
+
+export interface CountyDataVersion {
+  countyId: number;
+  version: number;
+}
+
+// Stamped by stamp_county_data_version() at the end of every import
+export async function getCountyDataVersion(
+  county: string | null,
+  countyId: string | null
+): Promise<CountyDataVersion | null> {
+  if (countyId) {
+    return lookupDataVersion('id', parseInt(countyId));
+  }
+  if (!county) {
+    return null;
+  }
+
+  // Slug first, as ensure_county() resolves it; separate .eq() lookups keep the raw
+  // parameter out of the filter string
+  return (
+    (await lookupDataVersion('slug', county.toLowerCase())) ??
+    (await lookupDataVersion('name', county.toLowerCase()))
+  );
+}
+
+async function lookupDataVersion(
+  column: 'id' | 'slug' | 'name',
+  value: string | number
+): Promise<CountyDataVersion | null> {
+  const { data, error } = await supabase
+    .from('counties')
+    .select('id, data_version')
+    .eq(column, value)
+    .order('id')
+    .limit(1);
+
+  if (error || !data || data.length === 0) {
+    return null;
+  }
+
+  return {
+    countyId: data[0].id,
+    version: data[0].data_version,
+  };
+}
+
+export function dataVersionETag(scope: string, dataVersion: CountyDataVersion): string {
+  return `"${scope}-c${dataVersion.countyId}-v${dataVersion.version}"`;
+}
+
+// Clients may reuse a response but must revalidate; a matching If-None-Match costs one counties lookup
+export function dataVersionHeaders(scope: string, dataVersion: CountyDataVersion | null): Record<string, string> {
+  if (!dataVersion) {
+    return {};
+  }
+
+  return {
+    'ETag': dataVersionETag(scope, dataVersion),
+    'X-Data-Version': String(dataVersion.version),
+    'Cache-Control': 'public, max-age=0, must-revalidate',
+  };
+}
+
+export function notModifiedResponse(
+  request: NextRequest,
+  scope: string,
+  dataVersion: CountyDataVersion | null
+): NextResponse | null {
+  if (!dataVersion) {
+    return null;
+  }
+
+  const ifNoneMatch = request.headers.get('if-none-match');
+  if (!ifNoneMatch) {
+    return null;
+  }
+
+  const etag = dataVersionETag(scope, dataVersion);
+  const matches = ifNoneMatch.split(',').some((tag) => tag.trim().replace(/^W\//, '') === etag);
+
+  return matches
+    ? new NextResponse(null, { status: 304, headers: dataVersionHeaders(scope, dataVersion) })
+    : null;
+}
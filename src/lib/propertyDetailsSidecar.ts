@@ -0,0 +1,149 @@
+import { open, readFile, stat, type FileHandle } from 'fs/promises';
+import path from 'path';
+import { supabase } from '@/lib/supabase';
+import { locateRecord, type SidecarHeader, type SidecarIndex } from '@/lib/propertyDetailsSidecarIndex';
+
+// Per-county attribute sidecars written by scripts/detail_sidecar.py (see its docstring for the layout)
+const SIDECAR_DIR = process.env.PROPERTY_DETAILS_DIR || path.join(process.cwd(), 'data', 'details');
+const MAGIC = 'PDS1';
+
+export interface PropertyDetails {
+  id: number;
+  propId: string;
+  ownerName: string | null;
+  situsAddr: string | null;
+  mailAddr: string | null;
+  landValue: number | null;
+  mktValue: number | null;
+  gisArea: number | null;
+  county: string;
+  county_id: number | null;
+}
+
+interface ManifestEntry {
+  countyId: number;
+  county: string;
+  dataVersion: number;
+  file: string;
+  count: number;
+  minId: number;
+  maxId: number;
+}
+
+interface LoadedSidecar extends SidecarIndex {
+  ino: number;
+  mtimeMs: number;
+}
+
+let manifestCache: { mtimeMs: number; entries: ManifestEntry[] } | null = null;
+const sidecarCache = new Map<string, LoadedSidecar>();
+
+async function loadManifest(): Promise<ManifestEntry[]> {
+  const manifestPath = path.join(SIDECAR_DIR, 'manifest.json');
+  const { mtimeMs } = await stat(manifestPath);
+
+  if (!manifestCache || manifestCache.mtimeMs !== mtimeMs) {
+    const manifest = JSON.parse(await readFile(manifestPath, 'utf-8'));
+    manifestCache = { mtimeMs, entries: Object.values(manifest.counties) as ManifestEntry[] };
+  }
+  return manifestCache.entries;
+}
+
+// Header and offset index stay in memory; a lookup is then one positioned read of the record.
+// Read through the caller's handle so index and records always come from the same file, even
+// if a rebuild replaces it meanwhile.
+async function loadSidecar(file: string, handle: FileHandle): Promise<LoadedSidecar> {
+  const { ino, mtimeMs } = await handle.stat();
+  const cached = sidecarCache.get(file);
+  if (cached && cached.ino === ino && cached.mtimeMs === mtimeMs) {
+    return cached;
+  }
+
+  const prefix = Buffer.alloc(8);
+  await handle.read(prefix, 0, 8, 0);
+  if (prefix.toString('ascii', 0, 4) !== MAGIC) {
+    throw new Error(`${file} is not a property detail sidecar`);
+  }
+
+  const headerBytes = Buffer.alloc(prefix.readUInt32LE(4));
+  await handle.read(headerBytes, 0, headerBytes.length, 8);
+  const header: SidecarHeader = JSON.parse(headerBytes.toString('utf-8'));
+
+  const index = Buffer.alloc(header.recordsOffset - header.indexOffset);
+  await handle.read(index, 0, index.length, header.indexOffset);
+
+  const loaded = { ino, mtimeMs, header, index };
+  sidecarCache.set(file, loaded);
+  return loaded;
+}
+
+// Sidecars are only trusted while the county is still at the data version they were built from
+async function currentEntries(entries: ManifestEntry[]): Promise<ManifestEntry[]> {
+  if (entries.length === 0) {
+    return [];
+  }
+
+  const { data, error } = await supabase
+    .from('counties')
+    .select('id, data_version')
+    .in('id', entries.map((entry) => entry.countyId));
+
+  if (error || !data) {
+    return [];
+  }
+
+  const versions = new Map(data.map((county) => [county.id, county.data_version]));
+  return entries.filter((entry) => versions.get(entry.countyId) === entry.dataVersion);
+}
+
+/**
+ * Read property details from the sidecars. Returns the details found and the ids that
+ * have to come from the database (no sidecar, stale sidecar, or not in any sidecar).
+ */
+export async function readSidecarDetails(
+  ids: number[]
+): Promise<{ details: Record<number, PropertyDetails>; missing: number[] }> {
+  const details: Record<number, PropertyDetails> = {};
+
+  let entries: ManifestEntry[];
+  try {
+    entries = await loadManifest();
+  } catch {
+    return { details, missing: ids };
+  }
+
+  const candidates = entries.filter((entry) => ids.some((id) => id >= entry.minId && id <= entry.maxId));
+  const usable = await currentEntries(candidates);
+
+  for (const entry of usable) {
+    try {
+      const handle = await open(path.join(SIDECAR_DIR, entry.file), 'r');
+      try {
+        const sidecar = await loadSidecar(entry.file, handle);
+        if (sidecar.header.dataVersion !== entry.dataVersion) {
+          continue;
+        }
+
+        for (const id of ids) {
+          const record = id in details ? null : locateRecord(sidecar, id);
+          if (!record) {
+            continue;
+          }
+
+          const [offset, length] = record;
+          const buffer = Buffer.alloc(length);
+          await handle.read(buffer, 0, length, sidecar.header.recordsOffset + offset);
+          const values: unknown[] = JSON.parse(buffer.toString('utf-8'));
+          const row = Object.fromEntries(sidecar.header.fields.map((field, i) => [field, values[i]]));
+          details[id] = { id, ...row } as PropertyDetails;
+        }
+      } finally {
+        await handle.close();
+      }
+    } catch (error) {
+      console.warn(`Property detail sidecar ${entry.file} unreadable, falling back to the database:`, error);
+    }
+  }
+
+  return { details, missing: ids.filter((id) => !(id in details)) };
+}
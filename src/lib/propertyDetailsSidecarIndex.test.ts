@@ -0,0 +1,54 @@
+import assert from 'node:assert/strict';
+import { readFileSync } from 'node:fs';
+import path from 'node:path';
+import { describe, test } from 'node:test';
+import { locateRecord, type SidecarHeader, type SidecarIndex } from './propertyDetailsSidecarIndex';
+
+// Sidecars written by scripts/detail_sidecar.py; regenerate with python tests/test_detail_sidecar.py
+const FIXTURE_DIR = path.join(__dirname, '..', '..', 'tests', 'fixtures', 'details');
+
+interface ExpectedFixture {
+  records: Record<string, unknown[]>;
+  absent: number[];
+}
+
+const expected: Record<string, ExpectedFixture> = JSON.parse(
+  readFileSync(path.join(FIXTURE_DIR, 'expected.json'), 'utf-8')
+);
+
+function loadFixture(name: string): SidecarIndex & { file: Buffer } {
+  const file = readFileSync(path.join(FIXTURE_DIR, name));
+  assert.equal(file.toString('ascii', 0, 4), 'PDS1');
+
+  const header: SidecarHeader = JSON.parse(file.toString('utf-8', 8, 8 + file.readUInt32LE(4)));
+  return { file, header, index: file.subarray(header.indexOffset, header.recordsOffset) };
+}
+
+for (const [name, indexMode] of [['dense.details', 'dense'], ['sorted.details', 'sorted']] as const) {
+  describe(`locateRecord (${indexMode} index)`, () => {
+    const sidecar = loadFixture(name);
+    const fixture = expected[name];
+
+    test('the header declares the index mode', () => {
+      assert.equal(sidecar.header.indexMode, indexMode);
+      assert.equal(sidecar.header.count, Object.keys(fixture.records).length);
+    });
+
+    test('every stored id resolves to its record', () => {
+      for (const [id, record] of Object.entries(fixture.records)) {
+        const located = locateRecord(sidecar, Number(id));
+        assert.ok(located, `id ${id} not found`);
+
+        const [offset, length] = located;
+        const start = sidecar.header.recordsOffset + offset;
+        assert.deepEqual(JSON.parse(sidecar.file.toString('utf-8', start, start + length)), record);
+      }
+    });
+
+    test('ids the county does not have resolve to null', () => {
+      for (const id of fixture.absent) {
+        assert.equal(locateRecord(sidecar, id), null, `id ${id} should be absent`);
+      }
+    });
+  });
+}
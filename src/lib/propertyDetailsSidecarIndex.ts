@@ -0,0 +1,49 @@
+// Offset index of a property detail sidecar, written by scripts/detail_sidecar.py (see its
+// docstring for the layout). Kept free of I/O and Supabase so it can be tested on its own.
+
+export interface SidecarHeader {
+  countyId: number;
+  dataVersion: number;
+  count: number;
+  minId: number;
+  maxId: number;
+  fields: string[];
+  indexMode: 'dense' | 'sorted';
+  indexOffset: number;
+  recordsOffset: number;
+}
+
+export interface SidecarIndex {
+  header: SidecarHeader;
+  index: Buffer;
+}
+
+// [offset, length] of the id's record, or null if the county does not have it
+export function locateRecord(sidecar: SidecarIndex, id: number): [number, number] | null {
+  const { header, index } = sidecar;
+  if (id < header.minId || id > header.maxId) {
+    return null;
+  }
+
+  if (header.indexMode === 'dense') {
+    const slot = (id - header.minId) * 8;
+    const length = index.readUInt32LE(slot + 4);
+    return length > 0 ? [index.readUInt32LE(slot), length] : null;
+  }
+
+  let low = 0;
+  let high = header.count - 1;
+  while (low <= high) {
+    const mid = (low + high) >> 1;
+    const entryId = index.readDoubleLE(mid * 16);
+    if (entryId === id) {
+      return [index.readUInt32LE(mid * 16 + 8), index.readUInt32LE(mid * 16 + 12)];
+    }
+    if (entryId < id) {
+      low = mid + 1;
+    } else {
+      high = mid - 1;
+    }
+  }
+  return null;
+}
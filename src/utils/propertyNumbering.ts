@@ -1,124 +1,74 @@
 import { supabase } from '@/lib/supabase';
 
-export function getCountyPrefix(countyName: string): string {
-  const name = countyName.toLowerCase().trim();
-  
-  const countyPrefixes: Record<string, string> = {
-    'madison': 'MAD',
-    'burnet': 'BUR', 
-    'burleson': 'BRL',
-  };
-  
-  if (countyPrefixes[name]) {
-    return countyPrefixes[name];
+// Prefixes are defined once, by user_number_prefix() in the allocator migration
+export async function getCountyPrefix(countyName: string): Promise<string> {
+  const { data, error } = await supabase.rpc('user_number_prefix', { p_county_name: countyName });
+
+  if (error) {
+    throw new Error(`Failed to resolve user number prefix: ${error.message}`);
   }
-  
-  return name.substring(0, 3).toUpperCase();
+
+  return data as string;
 }
 
-// Handles gap filling - reuses deleted numbers before assigning new ones
+// Allocated atomically by allocate_user_numbers(): the smallest released numbers are reused
+// before the county's high-water mark is extended, so no saved_properties scan is needed
 export async function getNextUserNumber(countyId: number): Promise<string> {
+  const [userNumber] = await getNextUserNumbers(countyId, 1);
+  return userNumber;
+}
+
+// Bulk allocation for batch saves; numbers come back in ascending order
+export async function getNextUserNumbers(countyId: number, count: number): Promise<string[]> {
   try {
-    const { data: county, error: countyError } = await supabase
-      .from('counties')
-      .select('name')
-      .eq('id', countyId)
-      .single();
-    
-    if (countyError || !county) {
-      throw new Error(`County not found for ID: ${countyId}`);
-    }
-    
-    const prefix = getCountyPrefix(county.name);
-    
-    const { data: existingNumbers, error } = await supabase
-      .from('saved_properties')
-      .select('user_number')
-      .not('user_number', 'is', null)
-      .like('user_number', `${prefix}-%`)
-      .order('user_number', { ascending: true });
-    
+    const { data, error } = await supabase.rpc('allocate_user_numbers', {
+      p_county_id: countyId,
+      p_count: count,
+    });
+
     if (error) {
-      throw new Error(`Failed to fetch existing numbers: ${error.message}`);
-    }
-    
-    const numbers = existingNumbers
-      .map(item => {
-        const match = item.user_number?.match(new RegExp(`^${prefix}-(\\d{6})$`));
-        return match ? parseInt(match[1], 10) : null;
-      })
-      .filter((num): num is number => num !== null)
-      .sort((a, b) => a - b);
-    
-    let nextNumber = 1;
-    for (const num of numbers) {
-      if (num === nextNumber) {
-        nextNumber++;
-      } else if (num > nextNumber) {
-        break;
-      }
+      throw new Error(`Failed to allocate user numbers: ${error.message}`);
     }
-    
-    const formattedNumber = nextNumber.toString().padStart(6, '0');
-    return `${prefix}-${formattedNumber}`;
-    
+
+    return data as string[];
+
   } catch (error) {
     console.error('Error generating next user number:', error);
     throw error;
   }
 }
 
+// Hands numbers back to the allocator when the save they were allocated for fails
+export async function releaseUserNumbers(userNumbers: string[]): Promise<void> {
+  const { error } = await supabase.rpc('release_user_numbers', { p_user_numbers: userNumbers });
+
+  if (error) {
+    console.error('Error releasing user numbers:', error);
+  }
+}
+
 // Considers both saved and currently selected properties for sequential numbering
 export async function generateTempUserNumber(countyId: number, existingTempNumbers: string[] = []): Promise<string> {
   try {
-    const { data: county, error: countyError } = await supabase
-      .from('counties')
-      .select('name')
-      .eq('id', countyId)
-      .single();
-    
-    if (countyError || !county) {
-      throw new Error(`County not found for ID: ${countyId}`);
-    }
-    
-    const prefix = getCountyPrefix(county.name);
-    
-    const { data: existingNumbers, error } = await supabase
-      .from('saved_properties')
-      .select('user_number')
-      .not('user_number', 'is', null)
-      .like('user_number', `${prefix}-%`)
-      .order('user_number', { ascending: true });
-    
+    // Preview the next numbers without allocating them, skipping ones already shown as temp labels
+    const { data, error } = await supabase.rpc('peek_user_numbers', {
+      p_county_id: countyId,
+      p_count: existingTempNumbers.length + 1,
+    });
+
     if (error) {
-      throw new Error(`Failed to fetch existing numbers: ${error.message}`);
+      throw new Error(`Failed to fetch next user numbers: ${error.message}`);
     }
-    
-    const allNumbers = [
-      ...existingNumbers.map(item => item.user_number!),
-      ...existingTempNumbers.filter(num => num.startsWith(`${prefix}-`))
-    ];
-    
-    const numbers = allNumbers
-      .map(userNumber => {
-        const match = userNumber.match(new RegExp(`^${prefix}-(\\d{6})$`));
-        return match ? parseInt(match[1], 10) : null;
-      })
-      .filter((num): num is number => num !== null)
-      .sort((a, b) => a - b);
-    
-    let nextNumber = 1;
-    for (const num of numbers) {
-      if (num === nextNumber) {
-        nextNumber++;
-      } else if (num > nextNumber) {
-        break;
-      }
+
+    const taken = new Set(existingTempNumbers);
+    const tempUserNumber = (data as string[]).find((userNumber) => !taken.has(userNumber));
+
+    if (!tempUserNumber) {
+      throw new Error(`No user number available for county ID: ${countyId}`);
     }
-    
-    const formattedNumber = nextNumber.toString().padStart(6, '0');
-    return `${prefix}-${formattedNumber}`;
-    
+
+    return tempUserNumber;
+
   } catch (error) {
     console.error('Error generating temp user number:', error);
     throw error;
@@ -126,11 +76,11 @@ export async function generateTempUserNumber(countyId: number, existingTempNumbe
 }
 
 export function isValidUserNumber(userNumber: string): boolean {
-  return /^[A-Z]{3}-\d{6}$/.test(userNumber);
+  return /^[A-Z]{3}-\d{6,}$/.test(userNumber);
 }
 
 export function parseUserNumber(userNumber: string): { prefix: string; number: number } | null {
-  const match = userNumber.match(/^([A-Z]{3})-(\d{6})$/);
+  const match = userNumber.match(/^([A-Z]{3})-(\d{6,})$/);
   if (!match) return null;
   
   return {
@@ -0,0 +1,62 @@
+-- Precomputed parcel adjacency graph for land-assemblage queries
+-- One row per pair of parcels sharing a boundary (a_id < b_id), rebuilt per county after each import
+
+create table if not exists public.parcel_adjacency (
+  county text not null,
+  a_id bigint not null,
+  b_id bigint not null,
+  shared_length_m double precision not null,
+  primary key (a_id, b_id),
+  check (a_id < b_id)
+);
+
+-- No FK to properties: imports replace a county's rows wholesale and rebuild its edges right after
+create index if not exists idx_parcel_adjacency_county on public.parcel_adjacency(county);
+create index if not exists idx_parcel_adjacency_b_id on public.parcel_adjacency(b_id);
+
+-- Rebuild the adjacency edges for one county.
+-- Candidate pairs come from a GIST bbox join; each candidate is then tested exactly by measuring
+-- how much of one parcel's boundary lies on the other, so corner-only touches are dropped.
+create or replace function public.build_parcel_adjacency(p_county text, p_min_shared_m double precision default 1.0)
+returns integer
+language plpgsql
+as $$
+declare
+  edge_count integer;
+begin
+  drop table if exists pg_temp._adjacency_parcels;
+
+  create temp table _adjacency_parcels on commit drop as
+  select
+    id,
+    ST_CollectionExtract(ST_MakeValid(ST_SetSRID(ST_GeomFromGeoJSON(geometry), 4326)), 3) as geom
+  from public.properties
+  where county = p_county
+    and geometry is not null;
+
+  create index on _adjacency_parcels using gist (geom);
+  analyze _adjacency_parcels;
+
+  delete from public.parcel_adjacency where county = p_county;
+
+  insert into public.parcel_adjacency (county, a_id, b_id, shared_length_m)
+  select p_county, pairs.a_id, pairs.b_id, pairs.shared_length_m
+  from (
+    select
+      a.id as a_id,
+      b.id as b_id,
+      ST_Length(ST_CollectionExtract(ST_Intersection(ST_Boundary(a.geom), b.geom), 2)::geography) as shared_length_m
+    from _adjacency_parcels a
+    join _adjacency_parcels b
+      on a.id < b.id
+     and a.geom && b.geom
+     and ST_Intersects(a.geom, b.geom)
+  ) pairs
+  where pairs.shared_length_m >= p_min_shared_m;
+
+  get diagnostics edge_count = row_count;
+  return edge_count;
+end;
+$$;
+
+comment on table public.parcel_adjacency is 'Parcel pairs sharing a boundary, built per county by build_parcel_adjacency()';
@@ -0,0 +1,132 @@
+-- Materialized owner-portfolio aggregates
+-- Keyed by normalized owner name; refreshed per county by each import so portfolio
+-- questions ("owners holding 200+ acres in Madison County") become index lookups
+
+-- Must stay in step with normalize_owner_name() in scripts/owner_names.py
+create or replace function public.normalize_owner_name(p_owner_name text)
+returns text
+language sql
+immutable
+parallel safe
+as $$
+  select trim(regexp_replace(regexp_replace(upper(coalesce(p_owner_name, '')), '[^A-Z0-9& ]+', ' ', 'g'), '\s+', ' ', 'g'));
+$$;
+
+-- Per owner, per county totals (the unit an import replaces)
+create table if not exists public.owner_portfolio_counties (
+  owner_key text not null,
+  county text not null,
+  owner_name text not null,
+  parcel_count integer not null,
+  total_gis_area double precision not null default 0,
+  total_land_value double precision not null default 0,
+  total_mkt_value double precision not null default 0,
+  updated_at timestamptz not null default now(),
+  primary key (owner_key, county)
+);
+
+create index if not exists idx_owner_portfolio_counties_county_area
+  on public.owner_portfolio_counties (county, total_gis_area desc);
+
+-- Per owner totals across every county
+create table if not exists public.owner_portfolios (
+  owner_key text primary key,
+  owner_name text not null,
+  parcel_count integer not null,
+  total_gis_area double precision not null default 0,
+  total_land_value double precision not null default 0,
+  total_mkt_value double precision not null default 0,
+  county_count integer not null,
+  counties text[] not null,
+  updated_at timestamptz not null default now()
+);
+
+create index if not exists idx_owner_portfolios_total_gis_area on public.owner_portfolios (total_gis_area desc);
+create index if not exists idx_owner_portfolios_total_mkt_value on public.owner_portfolios (total_mkt_value desc);
+create index if not exists idx_owner_portfolios_parcel_count on public.owner_portfolios (parcel_count desc);
+
+-- Recompute one county's owner totals, diff them against the stored ones and re-roll only
+-- the owners whose totals changed. Returns the number of owner keys touched.
+-- Refreshes of different counties share owner rows in owner_portfolios, so the write phase
+-- is serialized with a transaction-level advisory lock; concurrent imports queue on it.
+create or replace function public.refresh_owner_portfolios(p_county text)
+returns integer
+language plpgsql
+as $$
+declare
+  changed_count integer;
+begin
+  drop table if exists pg_temp._county_owner_totals;
+  drop table if exists pg_temp._changed_owner_keys;
+
+  create temp table _county_owner_totals on commit drop as
+  select
+    public.normalize_owner_name(owner_name) as owner_key,
+    min(owner_name) as owner_name,
+    count(*)::integer as parcel_count,
+    coalesce(sum(gis_area), 0)::double precision as total_gis_area,
+    coalesce(sum(land_value), 0)::double precision as total_land_value,
+    coalesce(sum(mkt_value), 0)::double precision as total_mkt_value
+  from public.properties
+  where county = p_county
+    and public.normalize_owner_name(owner_name) <> ''
+  group by 1;
+
+  perform pg_advisory_xact_lock(hashtext('public.owner_portfolios'));
+
+  create temp table _changed_owner_keys on commit drop as
+  select coalesce(n.owner_key, o.owner_key) as owner_key
+  from _county_owner_totals n
+  full join (
+    select * from public.owner_portfolio_counties where county = p_county
+  ) o on o.owner_key = n.owner_key
+  where n.owner_key is null
+     or o.owner_key is null
+     or (n.parcel_count, n.total_gis_area, n.total_land_value, n.total_mkt_value)
+        is distinct from (o.parcel_count, o.total_gis_area, o.total_land_value, o.total_mkt_value);
+
+  get diagnostics changed_count = row_count;
+
+  if changed_count = 0 then
+    return 0;
+  end if;
+
+  delete from public.owner_portfolio_counties c
+  using _changed_owner_keys k
+  where c.county = p_county
+    and c.owner_key = k.owner_key;
+
+  insert into public.owner_portfolio_counties
+    (owner_key, county, owner_name, parcel_count, total_gis_area, total_land_value, total_mkt_value)
+  select n.owner_key, p_county, n.owner_name, n.parcel_count, n.total_gis_area, n.total_land_value, n.total_mkt_value
+  from _county_owner_totals n
+  join _changed_owner_keys k on k.owner_key = n.owner_key;
+
+  delete from public.owner_portfolios p
+  using _changed_owner_keys k
+  where p.owner_key = k.owner_key;
+
+  insert into public.owner_portfolios
+    (owner_key, owner_name, parcel_count, total_gis_area, total_land_value, total_mkt_value, county_count, counties)
+  select
+    c.owner_key,
+    min(c.owner_name),
+    sum(c.parcel_count)::integer,
+    sum(c.total_gis_area),
+    sum(c.total_land_value),
+    sum(c.total_mkt_value),
+    count(*)::integer,
+    array_agg(c.county order by c.county)
+  from public.owner_portfolio_counties c
+  join _changed_owner_keys k on k.owner_key = c.owner_key
+  group by c.owner_key;
+
+  return changed_count;
+end;
+$$;
+
+-- Initial build for counties already loaded
+select public.refresh_owner_portfolios(county)
+from (select distinct county from public.properties where county is not null) counties;
+
+comment on table public.owner_portfolios is 'Owner portfolio totals across counties, refreshed per county by refresh_owner_portfolios()';
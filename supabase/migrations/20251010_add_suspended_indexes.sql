@@ -0,0 +1,12 @@
+-- Bookkeeping for bulk-load index management (scripts/bulk_load_indexes.py)
+-- Index definitions are saved here before an import drops them, so a crashed
+-- import can still be finished with `bulk_load_indexes.py rebuild`
+
+create table if not exists public.suspended_indexes (
+  index_name text primary key,
+  table_name text not null,
+  index_def text not null,
+  suspended_at timestamptz not null default now()
+);
+
+comment on table public.suspended_indexes is 'Indexes dropped for a bulk load and not yet rebuilt';
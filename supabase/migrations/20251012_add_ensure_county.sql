@@ -0,0 +1,32 @@
+-- Resolve a county slug to counties.id for importers, creating the county on first import.
+-- Once properties is list-partitioned by county_id (sql/partition-properties-by-county.sql)
+-- this also creates the county's partition, so plain INSERTs keep working for new counties.
+
+create or replace function public.ensure_county(p_county text)
+returns bigint
+language plpgsql
+as $$
+declare
+  v_county text := lower(p_county);
+  v_county_id bigint;
+begin
+  insert into public.counties (name, state, slug)
+  values (v_county, 'TX', v_county)
+  on conflict do nothing;
+
+  select id into v_county_id
+  from public.counties
+  where slug = v_county or name = v_county
+  order by (slug = v_county) desc, id
+  limit 1;
+
+  if (select relkind from pg_class where oid = 'public.properties'::regclass) = 'p' then
+    execute format(
+      'create table if not exists public.properties_c%s partition of public.properties for values in (%s)',
+      v_county_id, v_county_id
+    );
+  end if;
+
+  return v_county_id;
+end;
+$$;
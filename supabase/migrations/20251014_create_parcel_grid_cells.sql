@@ -0,0 +1,110 @@
+-- Zoom-level aggregate grid for zoomed-out county views
+-- Parcels are binned into Web Mercator tiles (addressed by z/x/y and quadkey) at several
+-- zoom levels; each cell stores count, total acreage, total market value and a
+-- representative point, so a whole-county view loads a few hundred cells instead of
+-- every parcel polygon
+
+create table if not exists public.parcel_grid_cells (
+  county text not null,
+  zoom smallint not null,
+  tile_x integer not null,
+  tile_y integer not null,
+  quadkey text not null,
+  parcel_count integer not null,
+  total_acres double precision not null default 0,
+  total_mkt_value double precision not null default 0,
+  rep_lon double precision not null,
+  rep_lat double precision not null,
+  primary key (county, zoom, tile_x, tile_y)
+);
+
+create or replace function public.tile_quadkey(p_zoom integer, p_x integer, p_y integer)
+returns text
+language plpgsql
+immutable
+parallel safe
+as $$
+declare
+  quadkey text := '';
+  mask integer;
+  digit integer;
+begin
+  for level in reverse p_zoom..1 loop
+    mask := 1 << (level - 1);
+    digit := 0;
+    if (p_x & mask) <> 0 then
+      digit := digit + 1;
+    end if;
+    if (p_y & mask) <> 0 then
+      digit := digit + 2;
+    end if;
+    quadkey := quadkey || digit::text;
+  end loop;
+  return quadkey;
+end;
+$$;
+
+-- Rebuild one county's grid. Parcels are binned once at p_max_zoom; every coarser zoom is
+-- rolled up from the level below (tile >> 1), so the whole hierarchy costs one parcel scan.
+-- The representative point is the mean of the parcels' points-on-surface in the cell.
+create or replace function public.build_parcel_grid(p_county text, p_min_zoom integer default 8, p_max_zoom integer default 14)
+returns integer
+language plpgsql
+as $$
+declare
+  cell_count integer;
+  z integer;
+begin
+  drop table if exists pg_temp._grid_parcels;
+
+  create temp table _grid_parcels on commit drop as
+  select
+    ST_X(pt) as lon,
+    least(greatest(ST_Y(pt), -85.05112878), 85.05112878) as lat,
+    coalesce(gis_area, 0)::double precision as acres,
+    coalesce(mkt_value, 0)::double precision as mkt_value
+  from (
+    select
+      ST_PointOnSurface(ST_MakeValid(ST_SetSRID(ST_GeomFromGeoJSON(geometry), 4326))) as pt,
+      gis_area,
+      mkt_value
+    from public.properties
+    where county = p_county
+      and geometry is not null
+      and geometry <> '{}'
+  ) parcels
+  where pt is not null;
+
+  delete from public.parcel_grid_cells where county = p_county;
+
+  insert into public.parcel_grid_cells
+    (county, zoom, tile_x, tile_y, quadkey, parcel_count, total_acres, total_mkt_value, rep_lon, rep_lat)
+  select p_county, p_max_zoom, tile_x, tile_y, public.tile_quadkey(p_max_zoom, tile_x, tile_y),
+         count(*), sum(acres), sum(mkt_value), avg(lon), avg(lat)
+  from (
+    select
+      floor((lon + 180.0) / 360.0 * (1 << p_max_zoom))::integer as tile_x,
+      floor((1.0 - ln(tan(radians(lat)) + 1.0 / cos(radians(lat))) / pi()) / 2.0 * (1 << p_max_zoom))::integer as tile_y,
+      lon, lat, acres, mkt_value
+    from _grid_parcels
+  ) binned
+  group by tile_x, tile_y;
+
+  for z in reverse (p_max_zoom - 1)..p_min_zoom loop
+    insert into public.parcel_grid_cells
+      (county, zoom, tile_x, tile_y, quadkey, parcel_count, total_acres, total_mkt_value, rep_lon, rep_lat)
+    select p_county, z, tile_x >> 1, tile_y >> 1, public.tile_quadkey(z, tile_x >> 1, tile_y >> 1),
+           sum(parcel_count), sum(total_acres), sum(total_mkt_value),
+           sum(rep_lon * parcel_count) / sum(parcel_count),
+           sum(rep_lat * parcel_count) / sum(parcel_count)
+    from public.parcel_grid_cells
+    where county = p_county and zoom = z + 1
+    group by tile_x >> 1, tile_y >> 1;
+  end loop;
+
+  select count(*) into cell_count from public.parcel_grid_cells where county = p_county;
+  return cell_count;
+end;
+$$;
+
+comment on table public.parcel_grid_cells is 'Per-county parcel aggregates per map tile, built by build_parcel_grid()';
@@ -0,0 +1,149 @@
+-- Owner and address search index
+-- A compact copy of each parcel's owner name and situs address, normalized and indexed
+-- with pg_trgm, rebuilt per county by the importer. search_properties() answers prefix,
+-- token and fuzzy lookups across every county without touching the properties table.
+
+create extension if not exists pg_trgm;
+
+-- Uppercase, drop punctuation, collapse whitespace and abbreviate common street words,
+-- so "123 Main Street" and "123 MAIN ST." share a key
+create or replace function public.normalize_situs_address(p_address text)
+returns text
+language plpgsql
+immutable
+parallel safe
+as $$
+declare
+  address_key text := trim(regexp_replace(regexp_replace(upper(coalesce(p_address, '')), '[^A-Z0-9 ]+', ' ', 'g'), '\s+', ' ', 'g'));
+  abbreviation text[];
+begin
+  foreach abbreviation slice 1 in array array[
+    ['COUNTY ROAD', 'CR'], ['FARM TO MARKET', 'FM'], ['HIGHWAY', 'HWY'], ['STREET', 'ST'],
+    ['ROAD', 'RD'], ['DRIVE', 'DR'], ['AVENUE', 'AVE'], ['LANE', 'LN'], ['BOULEVARD', 'BLVD'],
+    ['CIRCLE', 'CIR'], ['COURT', 'CT'], ['TRAIL', 'TRL'], ['PARKWAY', 'PKWY']
+  ] loop
+    address_key := regexp_replace(address_key, '\m' || abbreviation[1] || '\M', abbreviation[2], 'g');
+  end loop;
+  return address_key;
+end;
+$$;
+
+create table if not exists public.property_search (
+  property_id bigint primary key,
+  county text not null,
+  prop_id text,
+  owner_name text,
+  situs_addr text,
+  owner_key text not null,
+  address_key text not null
+);
+
+-- No FK to properties: imports replace a county's rows wholesale and rebuild its entries right after
+create index if not exists idx_property_search_county on public.property_search (county);
+-- text_pattern_ops serves anchored prefix lookups, the trigram GIN indexes serve token/fuzzy matches
+create index if not exists idx_property_search_owner_prefix on public.property_search (owner_key text_pattern_ops);
+create index if not exists idx_property_search_address_prefix on public.property_search (address_key text_pattern_ops);
+create index if not exists idx_property_search_owner_trgm on public.property_search using gin (owner_key gin_trgm_ops);
+create index if not exists idx_property_search_address_trgm on public.property_search using gin (address_key gin_trgm_ops);
+
+-- Rebuild one county's search entries; returns the number of entries stored
+create or replace function public.build_property_search(p_county text)
+returns integer
+language plpgsql
+as $$
+declare
+  entry_count integer;
+begin
+  delete from public.property_search where county = p_county;
+
+  insert into public.property_search (property_id, county, prop_id, owner_name, situs_addr, owner_key, address_key)
+  select
+    id,
+    county,
+    prop_id,
+    owner_name,
+    situs_addr,
+    public.normalize_owner_name(owner_name),
+    public.normalize_situs_address(situs_addr)
+  from public.properties
+  where county = p_county;
+
+  get diagnostics entry_count = row_count;
+  return entry_count;
+end;
+$$;
+
+-- Top matches for a free-text query on owner names, situs addresses or both.
+-- Ranking: exact key (1.0), key prefix (0.9), then trigram word similarity, which scores
+-- whole tokens and token prefixes ("SMITH", "SMI") inside the key as well as misspellings.
+create or replace function public.search_properties(
+  p_query text,
+  p_county text default null,
+  p_field text default 'any',
+  p_limit integer default 20,
+  p_min_similarity real default 0.5
+)
+returns table (
+  property_id bigint,
+  county text,
+  prop_id text,
+  owner_name text,
+  situs_addr text,
+  match_field text,
+  score real
+)
+language plpgsql
+as $$
+declare
+  owner_query text := public.normalize_owner_name(p_query);
+  address_query text := public.normalize_situs_address(p_query);
+begin
+  if owner_query = '' and address_query = '' then
+    return;
+  end if;
+
+  perform set_config('pg_trgm.word_similarity_threshold', p_min_similarity::text, true);
+
+  return query
+  select m.property_id, m.county, m.prop_id, m.owner_name, m.situs_addr, m.match_field, m.score
+  from (
+    select distinct on (c.property_id) c.*
+    from (
+      select s.property_id, s.county, s.prop_id, s.owner_name, s.situs_addr, 'owner'::text as match_field,
+             case
+               when s.owner_key = owner_query then 1.0
+               when s.owner_key like owner_query || '%' then 0.9
+               else 0.8 * word_similarity(owner_query, s.owner_key)
+             end::real as score
+      from public.property_search s
+      where p_field in ('any', 'owner')
+        and owner_query <> ''
+        and (p_county is null or s.county = p_county)
+        and (s.owner_key like owner_query || '%' or owner_query <% s.owner_key)
+
+      union all
+
+      select s.property_id, s.county, s.prop_id, s.owner_name, s.situs_addr, 'address'::text,
+             case
+               when s.address_key = address_query then 1.0
+               when s.address_key like address_query || '%' then 0.9
+               else 0.8 * word_similarity(address_query, s.address_key)
+             end::real
+      from public.property_search s
+      where p_field in ('any', 'address')
+        and address_query <> ''
+        and (p_county is null or s.county = p_county)
+        and (s.address_key like address_query || '%' or address_query <% s.address_key)
+    ) c
+    order by c.property_id, c.score desc
+  ) m
+  order by m.score desc, m.owner_name, m.property_id
+  limit p_limit;
+end;
+$$;
+
+-- Initial build for counties already loaded
+select public.build_property_search(county)
+from (select distinct county from public.properties where county is not null) counties;
+
+comment on table public.property_search is 'Normalized owner/address search entries per parcel, rebuilt per county by build_property_search()';
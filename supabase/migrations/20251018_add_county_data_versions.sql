@@ -0,0 +1,131 @@
+-- Per-county data version stamps for cache invalidation
+-- Every import ends by calling stamp_county_data_version(), which hashes the county's parcels
+-- and bumps counties.data_version only when the content or the parcel ids changed. API
+-- responses and downstream tile/bundle caches key on the version (the routes send it as the
+-- ETag), and those payloads carry database ids, so a reload that only renumbers the rows
+-- still needs a new version.
+
+alter table public.counties add column if not exists data_version bigint not null default 0;
+alter table public.counties add column if not exists data_hash text;
+alter table public.counties add column if not exists data_updated_at timestamptz;
+alter table public.counties add column if not exists data_change_summary jsonb;
+
+-- Last stamped content hash per parcel, keyed by prop_id (database ids change on every reload)
+create table if not exists public.county_parcel_hashes (
+  county_id bigint not null references public.counties(id) on delete cascade,
+  prop_id text not null,
+  row_hash text not null,
+  primary key (county_id, prop_id)
+);
+
+-- Stamp one county after an import; returns its (possibly unchanged) data version.
+-- data_change_summary records added/removed/changed prop_id counts (by content) plus up to
+-- p_sample_size example ids of each kind; a reload that only renumbered the rows bumps the
+-- version with all three counts at zero. The county has to exist already (importers create
+-- it through ensure_county()).
+create or replace function public.stamp_county_data_version(p_county text, p_sample_size integer default 100)
+returns bigint
+language plpgsql
+as $$
+declare
+  v_county text := lower(p_county);
+  v_county_id bigint;
+  v_hash text;
+  v_previous_hash text;
+  v_version bigint;
+  v_summary jsonb;
+begin
+  select id into v_county_id
+  from public.counties
+  where slug = v_county or name = v_county
+  order by (slug = v_county) desc, id
+  limit 1;
+
+  if v_county_id is null then
+    raise exception 'County "%" does not exist', p_county
+      using hint = 'Counties are created by the importers (ensure_county); check the county name.';
+  end if;
+
+  drop table if exists pg_temp._county_parcel_hashes;
+
+  create temp table _county_parcel_hashes on commit drop as
+  select
+    coalesce(prop_id, '') as prop_id,
+    md5(string_agg(
+      md5(concat_ws('|', owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, geometry)),
+      '' order by md5(concat_ws('|', owner_name, situs_addr, mail_addr, land_value, mkt_value, gis_area, geometry))
+    )) as row_hash,
+    string_agg(id::text, ',' order by id) as row_ids
+  from public.properties
+  where county = p_county
+  group by 1;
+
+  select md5(coalesce(string_agg(prop_id || ':' || row_hash || ':' || row_ids, ',' order by prop_id), ''))
+  into v_hash
+  from _county_parcel_hashes;
+
+  select data_version, data_hash into v_version, v_previous_hash
+  from public.counties
+  where id = v_county_id
+  for update;
+
+  if v_version > 0 and v_hash = v_previous_hash then
+    return v_version;
+  end if;
+
+  with old as (
+    select prop_id, row_hash from public.county_parcel_hashes where county_id = v_county_id
+  ),
+  diff as (
+    select
+      coalesce(n.prop_id, o.prop_id) as prop_id,
+      case
+        when o.prop_id is null then 'added'
+        when n.prop_id is null then 'removed'
+        else 'changed'
+      end as change
+    from _county_parcel_hashes n
+    full join old o on o.prop_id = n.prop_id
+    where n.prop_id is null
+       or o.prop_id is null
+       or n.row_hash <> o.row_hash
+  ),
+  ranked as (
+    select prop_id, change, row_number() over (partition by change order by prop_id) as n
+    from diff
+  )
+  select jsonb_build_object(
+    'total', (select count(*) from _county_parcel_hashes),
+    'added', count(*) filter (where change = 'added'),
+    'removed', count(*) filter (where change = 'removed'),
+    'changed', count(*) filter (where change = 'changed'),
+    'sample', jsonb_build_object(
+      'added', coalesce(jsonb_agg(prop_id order by prop_id) filter (where change = 'added' and n <= p_sample_size), '[]'::jsonb),
+      'removed', coalesce(jsonb_agg(prop_id order by prop_id) filter (where change = 'removed' and n <= p_sample_size), '[]'::jsonb),
+      'changed', coalesce(jsonb_agg(prop_id order by prop_id) filter (where change = 'changed' and n <= p_sample_size), '[]'::jsonb)
+    )
+  )
+  into v_summary
+  from ranked;
+
+  delete from public.county_parcel_hashes where county_id = v_county_id;
+
+  insert into public.county_parcel_hashes (county_id, prop_id, row_hash)
+  select v_county_id, prop_id, row_hash from _county_parcel_hashes;
+
+  update public.counties
+  set data_version = data_version + 1,
+      data_hash = v_hash,
+      data_updated_at = now(),
+      data_change_summary = v_summary
+  where id = v_county_id
+  returning data_version into v_version;
+
+  return v_version;
+end;
+$$;
+
+-- Initial stamp for counties already loaded
+select public.stamp_county_data_version(p.county)
+from (select distinct county from public.properties where county is not null) p
+where exists (select 1 from public.counties c where c.slug = lower(p.county) or c.name = lower(p.county));
@@ -0,0 +1,5 @@
+-- Index properties.county, the column every importer sets and the post-load stages,
+-- exporter and detail sidecars filter on (county_id is NULL on rows loaded before the
+-- counties table existed)
+
+create index if not exists idx_properties_county on public.properties (county);
@@ -0,0 +1,83 @@
+-- Normalized contact store for skip-trace results
+-- scripts/skip_trace_contacts.py flattens Enformion and BatchData responses into persons,
+-- phones and emails. Phone numbers and email addresses are stored once and linked to every
+-- person (and so every parcel and provider) they were reported for.
+--
+-- Parcels are keyed by (county, prop_id) as well as property_id: property ids change when a
+-- county is reloaded, prop_id does not.
+
+-- One row per parcel and provider that has been traced, matched or not, so a repeat
+-- lookup can be skipped without calling the provider again
+create table if not exists public.skip_trace_lookups (
+  county text not null,
+  prop_id text not null,
+  provider text not null,
+  property_id bigint not null,
+  matched boolean not null,
+  request_id text,
+  traced_at timestamptz not null default now(),
+  primary key (county, prop_id, provider)
+);
+
+create table if not exists public.persons (
+  id bigserial primary key,
+  county text not null,
+  prop_id text not null,
+  provider text not null,
+  person_key text not null,
+  property_id bigint not null,
+  owner_key text not null default '',
+  first_name text,
+  middle_name text,
+  last_name text,
+  full_name text,
+  age integer,
+  identity_score integer,
+  traced_at timestamptz not null default now(),
+  unique (county, prop_id, provider, person_key)
+);
+
+create index if not exists idx_persons_property_id on public.persons (property_id);
+-- "Do we already have contacts for this owner?" is a lookup on the parcel owner's normalized name
+create index if not exists idx_persons_owner_key on public.persons (owner_key);
+
+create table if not exists public.phones (
+  id bigserial primary key,
+  number text not null unique,
+  phone_type text,
+  carrier text,
+  is_connected boolean,
+  dnc boolean,
+  first_reported date,
+  last_reported date,
+  updated_at timestamptz not null default now()
+);
+
+create table if not exists public.emails (
+  id bigserial primary key,
+  email text not null unique,
+  is_validated boolean,
+  is_business boolean,
+  updated_at timestamptz not null default now()
+);
+
+create table if not exists public.person_phones (
+  person_id bigint not null references public.persons(id) on delete cascade,
+  phone_id bigint not null references public.phones(id) on delete cascade,
+  provider text not null,
+  primary key (person_id, phone_id)
+);
+
+create index if not exists idx_person_phones_phone_id on public.person_phones (phone_id);
+
+create table if not exists public.person_emails (
+  person_id bigint not null references public.persons(id) on delete cascade,
+  email_id bigint not null references public.emails(id) on delete cascade,
+  provider text not null,
+  primary key (person_id, email_id)
+);
+
+create index if not exists idx_person_emails_email_id on public.person_emails (email_id);
+
+comment on table public.phones is 'Skip-trace phone numbers, one row per 10-digit number across parcels and providers';
+comment on table public.emails is 'Skip-trace email addresses, one row per lowercased address across parcels and providers';
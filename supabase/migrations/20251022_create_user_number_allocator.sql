@@ -0,0 +1,232 @@
+-- Database-side allocator for saved-property user numbers (MAD-000001, BUR-000002, ...)
+-- Per county prefix, a high-water mark plus a free list of released numbers below it.
+-- Allocation takes the smallest free numbers first, then extends the high-water mark, so
+-- deleted numbers are reused exactly as before, without scanning saved_properties.
+-- The counter row lock serializes concurrent allocations for the same prefix.
+
+-- The one definition of the county prefixes; getCountyPrefix() in src/utils/propertyNumbering.ts
+-- and scripts/user_numbers.py call this rather than keeping their own table
+create or replace function public.user_number_prefix(p_county_name text)
+returns text
+language sql
+immutable
+parallel safe
+as $$
+  select case lower(trim(p_county_name))
+    when 'madison' then 'MAD'
+    when 'burnet' then 'BUR'
+    when 'burleson' then 'BRL'
+    else upper(substring(lower(trim(p_county_name)) from 1 for 3))
+  end;
+$$;
+
+-- Zero-padded to 6 digits; longer numbers are kept whole (lpad would truncate them)
+create or replace function public.format_user_number(p_prefix text, p_number integer)
+returns text
+language sql
+immutable
+parallel safe
+as $$
+  select p_prefix || '-' || case when p_number < 1000000 then lpad(p_number::text, 6, '0') else p_number::text end;
+$$;
+
+create table if not exists public.user_number_counters (
+  prefix text primary key,
+  high_water integer not null default 0
+);
+
+create table if not exists public.user_number_free (
+  prefix text not null,
+  number integer not null,
+  primary key (prefix, number)
+);
+
+-- Allocate p_count numbers for a county in one call (batch saves); returned in ascending order
+create or replace function public.allocate_user_numbers(p_county_id bigint, p_count integer default 1)
+returns setof text
+language plpgsql
+as $$
+declare
+  v_prefix text;
+  v_reused integer[];
+  v_high_water integer;
+  v_extend integer;
+begin
+  select public.user_number_prefix(name) into v_prefix from public.counties where id = p_county_id;
+  if v_prefix is null then
+    raise exception 'County not found for ID: %', p_county_id;
+  end if;
+
+  insert into public.user_number_counters (prefix) values (v_prefix) on conflict do nothing;
+  select high_water into v_high_water from public.user_number_counters where prefix = v_prefix for update;
+
+  with taken as (
+    delete from public.user_number_free f
+    where f.prefix = v_prefix
+      and f.number in (
+        select number from public.user_number_free
+        where prefix = v_prefix
+        order by number
+        limit p_count
+      )
+    returning f.number
+  )
+  select coalesce(array_agg(number order by number), '{}') into v_reused from taken;
+
+  v_extend := p_count - coalesce(array_length(v_reused, 1), 0);
+  if v_extend > 0 then
+    update public.user_number_counters
+    set high_water = high_water + v_extend
+    where prefix = v_prefix;
+  end if;
+
+  return query
+  select public.format_user_number(v_prefix, n)
+  from (
+    select unnest(v_reused) as n
+    union all
+    select generate_series(v_high_water + 1, v_high_water + greatest(v_extend, 0))
+  ) numbers
+  order by n;
+end;
+$$;
+
+create or replace function public.allocate_user_number(p_county_id bigint)
+returns text
+language sql
+as $$
+  select public.allocate_user_numbers(p_county_id, 1) limit 1;
+$$;
+
+-- Next numbers a county would get, without allocating them (temporary labels for selections)
+create or replace function public.peek_user_numbers(p_county_id bigint, p_count integer default 1)
+returns setof text
+language sql
+stable
+as $$
+  with county as (
+    select public.user_number_prefix(name) as prefix from public.counties where id = p_county_id
+  ),
+  reusable as (
+    select f.number from public.user_number_free f, county
+    where f.prefix = county.prefix
+    order by f.number
+    limit p_count
+  ),
+  high_water as (
+    select coalesce((select c.high_water from public.user_number_counters c, county where c.prefix = county.prefix), 0) as n
+  )
+  select public.format_user_number(county.prefix, n)
+  from county, (
+    select number as n from reusable
+    union all
+    select generate_series(high_water.n + 1, high_water.n + p_count) from high_water
+  ) numbers
+  order by n
+  limit p_count;
+$$;
+
+-- Return numbers to the free list (e.g. a save that failed after allocation)
+create or replace function public.release_user_numbers(p_user_numbers text[])
+returns integer
+language plpgsql
+as $$
+declare
+  released integer;
+begin
+  insert into public.user_number_free (prefix, number)
+  select split_part(u, '-', 1), split_part(u, '-', 2)::integer
+  from unnest(p_user_numbers) u
+  where u ~ '^[A-Z]{3}-\d{6,}$'
+    and split_part(u, '-', 2)::integer > 0
+    and not exists (select 1 from public.saved_properties s where s.user_number = u)
+  on conflict do nothing;
+
+  get diagnostics released = row_count;
+  return released;
+end;
+$$;
+
+-- Keep the allocator in step with saved_properties: deleting a saved property (directly or by
+-- cascade from a county reload) frees its number; writing an explicit number claims it
+create or replace function public.sync_user_number_allocator()
+returns trigger
+language plpgsql
+as $$
+declare
+  v_prefix text;
+  v_number integer;
+  v_high_water integer;
+begin
+  if tg_op in ('UPDATE', 'DELETE') and old.user_number ~ '^[A-Z]{3}-\d{6,}$'
+     and (tg_op = 'DELETE' or new.user_number is distinct from old.user_number) then
+    insert into public.user_number_free (prefix, number)
+    values (split_part(old.user_number, '-', 1), split_part(old.user_number, '-', 2)::integer)
+    on conflict do nothing;
+  end if;
+
+  if tg_op in ('INSERT', 'UPDATE') and new.user_number ~ '^[A-Z]{3}-\d{6,}$'
+     and (tg_op = 'INSERT' or new.user_number is distinct from old.user_number) then
+    v_prefix := split_part(new.user_number, '-', 1);
+    v_number := split_part(new.user_number, '-', 2)::integer;
+
+    insert into public.user_number_counters (prefix) values (v_prefix) on conflict do nothing;
+    select high_water into v_high_water from public.user_number_counters where prefix = v_prefix for update;
+
+    delete from public.user_number_free where prefix = v_prefix and number = v_number;
+
+    if v_number > v_high_water then
+      -- Skipped-over numbers become reusable gaps
+      insert into public.user_number_free (prefix, number)
+      select v_prefix, n from generate_series(v_high_water + 1, v_number - 1) n
+      on conflict do nothing;
+      update public.user_number_counters set high_water = v_number where prefix = v_prefix;
+    end if;
+  end if;
+
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_saved_properties_user_number on public.saved_properties;
+create trigger trg_saved_properties_user_number
+  after insert or update of user_number or delete on public.saved_properties
+  for each row execute function public.sync_user_number_allocator();
+
+-- Rebuild counters and free lists from the numbers actually in use (scripts/user_numbers.py repair)
+create or replace function public.rebuild_user_number_allocator()
+returns integer
+language plpgsql
+as $$
+declare
+  prefix_count integer;
+begin
+  lock table public.user_number_counters in exclusive mode;
+
+  drop table if exists pg_temp._used_user_numbers;
+
+  create temp table _used_user_numbers on commit drop as
+  select distinct split_part(user_number, '-', 1) as prefix, split_part(user_number, '-', 2)::integer as number
+  from public.saved_properties
+  where user_number ~ '^[A-Z]{3}-\d{6,}$';
+
+  delete from public.user_number_free;
+  delete from public.user_number_counters;
+
+  insert into public.user_number_counters (prefix, high_water)
+  select prefix, max(number) from _used_user_numbers group by prefix;
+
+  get diagnostics prefix_count = row_count;
+
+  insert into public.user_number_free (prefix, number)
+  select c.prefix, n
+  from public.user_number_counters c
+  cross join lateral generate_series(1, c.high_water) n
+  where not exists (select 1 from _used_user_numbers u where u.prefix = c.prefix and u.number = n);
+
+  return prefix_count;
+end;
+$$;
+
+-- Initial build from the numbers already assigned
+select public.rebuild_user_number_allocator();
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# The scripts import each other as top-level modules (python scripts/<name>.py)
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+@pytest.fixture
+def db_conn():
+    """A connection to $TEST_DATABASE_URL (supabase/migrations applied); everything is rolled back"""
+    database_url = os.getenv('TEST_DATABASE_URL')
+    if not database_url:
+        pytest.skip("Set TEST_DATABASE_URL to a database with supabase/migrations applied")
+    psycopg2 = pytest.importorskip('psycopg2')
+
+    conn = psycopg2.connect(database_url)
+    try:
+        yield conn
+    finally:
+        conn.rollback()
+        conn.close()
@@ -0,0 +1,131 @@
+import json
+import os
+import struct
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(TESTS_DIR, 'fixtures', 'details')
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), 'scripts'))
+
+from detail_sidecar import MAGIC, SIDECAR_FIELDS, write_sidecar
+
+HEADER = {'countyId': 7, 'county': 'fixture', 'dataVersion': 3}
+
+# Shared with src/lib/propertyDetailsSidecarIndex.test.ts, which reads the same files
+FIXTURES = {
+    'dense.details': {'ids': [100, 101, 103, 104, 110], 'absent': [0, 99, 102, 105, 109, 111, 5000]},
+    'sorted.details': {'ids': [5, 4000, 90000, 2 ** 40], 'absent': [0, 4, 6, 3999, 4001, 89999, 2 ** 40 + 1]},
+}
+
+def _record(id_):
+    return [f'P{id_}', f"OWNER {id_} O'NEIL", f'{id_} MAIN ST', None, 1000.5, id_ * 2, 1.25, 'fixture', HEADER['countyId']]
+
+def _write(path, ids):
+    """Lay the records out as build_county_sidecar does and write the sidecar"""
+    offsets, lengths = [], []
+    records_path = f'{path}.records'
+    with open(records_path, 'wb') as records:
+        position = 0
+        for id_ in ids:
+            record = json.dumps(_record(id_), separators=(',', ':')).encode('utf-8')
+            offsets.append(position)
+            lengths.append(len(record))
+            records.write(record)
+            position += len(record)
+    try:
+        return write_sidecar(path, HEADER, ids, offsets, lengths, records_path)
+    finally:
+        os.unlink(records_path)
+
+def _read(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert data[:4] == MAGIC
+    header_length = struct.unpack_from('<I', data, 4)[0]
+    header = json.loads(data[8:8 + header_length])
+    return header, data[header['indexOffset']:header['recordsOffset']], data[header['recordsOffset']:]
+
+def _locate(header, index, id_):
+    """The lookup propertyDetailsSidecarIndex.locateRecord performs"""
+    if id_ < header['minId'] or id_ > header['maxId']:
+        return None
+    if header['indexMode'] == 'dense':
+        offset, length = struct.unpack_from('<II', index, (id_ - header['minId']) * 8)
+        return (offset, length) if length else None
+
+    low, high = 0, header['count'] - 1
+    while low <= high:
+        mid = (low + high) // 2
+        entry_id, offset, length = struct.unpack_from('<dII', index, mid * 16)
+        if entry_id == id_:
+            return offset, length
+        if entry_id < id_:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return None
+
+@pytest.mark.parametrize('name, index_mode', [('dense.details', 'dense'), ('sorted.details', 'sorted')])
+def test_records_read_back_through_the_index(tmp_path, name, index_mode):
+    fixture = FIXTURES[name]
+    path = str(tmp_path / name)
+    written = _write(path, fixture['ids'])
+    header, index, records = _read(path)
+
+    assert header == written
+    assert header['indexMode'] == index_mode
+    assert (header['count'], header['minId'], header['maxId']) == (len(fixture['ids']), fixture['ids'][0], fixture['ids'][-1])
+    assert header['fields'] == [name for name, _ in SIDECAR_FIELDS]
+    assert header['indexOffset'] % 8 == 0
+
+    for id_ in fixture['ids']:
+        offset, length = _locate(header, index, id_)
+        assert json.loads(records[offset:offset + length]) == _record(id_)
+    for id_ in fixture['absent']:
+        assert _locate(header, index, id_) is None
+
+def test_index_sizes(tmp_path):
+    _write(str(tmp_path / 'dense.details'), [100, 101, 110])
+    _write(str(tmp_path / 'sorted.details'), [5, 90000])
+
+    # One 8-byte slot per id in the range, or one 16-byte entry per parcel
+    assert len(_read(str(tmp_path / 'dense.details'))[1]) == 8 * 11
+    assert len(_read(str(tmp_path / 'sorted.details'))[1]) == 16 * 2
+
+def test_empty_county(tmp_path):
+    path = str(tmp_path / 'empty.details')
+    header = _write(path, [])
+
+    assert (header['count'], header['minId'], header['maxId'], header['indexMode']) == (0, 0, -1, 'dense')
+    assert _read(path)[1:] == (b'', b'')
+
+def test_no_temp_file_is_left_behind(tmp_path):
+    _write(str(tmp_path / 'dense.details'), FIXTURES['dense.details']['ids'])
+
+    assert sorted(os.listdir(tmp_path)) == ['dense.details']
+
+@pytest.mark.parametrize('name', sorted(FIXTURES))
+def test_shared_fixtures_are_current(tmp_path, name):
+    path = str(tmp_path / name)
+    _write(path, FIXTURES[name]['ids'])
+
+    with open(path, 'rb') as generated, open(os.path.join(FIXTURE_DIR, name), 'rb') as committed:
+        assert generated.read() == committed.read(), "Run python tests/test_detail_sidecar.py to regenerate the fixtures"
+
+if __name__ == '__main__':
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    expected = {}
+    for name, fixture in FIXTURES.items():
+        _write(os.path.join(FIXTURE_DIR, name), fixture['ids'])
+        expected[name] = {
+            'records': {str(id_): _record(id_) for id_ in fixture['ids']},
+            'absent': fixture['absent'],
+        }
+    with open(os.path.join(FIXTURE_DIR, 'expected.json'), 'w') as f:
+        json.dump(expected, f, indent=2)
+        f.write('\n')
+    print(f"✅ Wrote {len(FIXTURES)} sidecar fixture(s) to {FIXTURE_DIR}")
@@ -0,0 +1,52 @@
+from generate_county_import_sql import detect_property_fields, map_property_row
+from parcel_adjacency import ParcelAdjacencyGraph
+
+# 1 - 2 - 3 - 4 in a row, 5 touching 4, 6 on its own
+EDGES = [(1, 2), (2, 3), (3, 4), (4, 5)]
+
+def _owners_as_imported(owners_by_id):
+    """owner_name exactly as the county importers store it"""
+    sample = {'Prop_ID': 1, 'OWNER_NAME': '', 'SITUS_ADDR': '', 'GIS_AREA': 1.0}
+    mapping = detect_property_fields(sample)
+    return {
+        parcel_id: map_property_row('burnet', dict(sample, Prop_ID=parcel_id, OWNER_NAME=owner), parcel_id, mapping, True)['owner_name']
+        for parcel_id, owner in owners_by_id.items()
+    }
+
+OWNERS = _owners_as_imported({
+    1: 'SMITH JOHN & MARY',
+    2: 'Smith, John & Mary',
+    3: "O'NEIL PATRICK",
+    4: 'SMITH JOHN & MARY',
+    5: 'SMITH JOHN & MARY',
+    6: 'SMITH JOHN & MARY',
+})
+
+def _graph():
+    return ParcelAdjacencyGraph(OWNERS.keys(), EDGES, OWNERS)
+
+def test_neighbors_by_hops():
+    graph = _graph()
+
+    assert graph.neighbors(3) == [2, 4]
+    assert graph.neighbors(3, hops=2) == [1, 2, 4, 5]
+    assert graph.neighbors(6) == []
+    assert graph.edge_count == 4
+
+def test_assemblages_group_contiguous_parcels_of_one_owner():
+    graph = _graph()
+
+    assert graph.assemblage(1) == [1, 2]
+    assert graph.assemblage(5) == [4, 5]
+    assert graph.assemblage(6) == [6]
+    assert graph.same_owner_assemblages() == [
+        {'owner_key': 'SMITH JOHN & MARY', 'property_ids': [1, 2]},
+        {'owner_key': 'SMITH JOHN & MARY', 'property_ids': [4, 5]},
+    ]
+
+def test_parcels_without_an_owner_never_group():
+    owners = {**OWNERS, 1: '', 2: ''}
+    graph = ParcelAdjacencyGraph(owners.keys(), EDGES, owners)
+
+    assert graph.assemblage(1) == [1]
+    assert all(1 not in item['property_ids'] for item in graph.same_owner_assemblages())
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+
+from generate_county_import_sql import detect_property_fields
+from parcel_consolidation import ConsolidationStats, consolidate_features
+
+def _square(x, y, size=1):
+    return [[[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]]
+
+def _feature(prop_id, geometry, owner='', land_value=0, mkt_value=0, gis_area=0):
+    return {
+        'type': 'Feature',
+        'properties': {
+            'PROP_ID': prop_id,
+            'OWNER_NAME': owner,
+            'SITUS_ADDR': '',
+            'LAND_VALUE': land_value,
+            'MKT_VALUE': mkt_value,
+            'GIS_AREA': gis_area,
+        },
+        'geometry': geometry,
+    }
+
+def _polygon(x, y):
+    return {'type': 'Polygon', 'coordinates': _square(x, y)}
+
+def _features():
+    return [
+        _feature('A', _polygon(0, 0), 'SMITH JOHN', 1000, 5000, 1.5),
+        _feature('B', _polygon(10, 0), 'JONES MARY', 200, 900, 2.0),
+        _feature('A', _polygon(2, 0), 'SMITH JOHN', 1000, 5000, 0.5),
+        _feature('', _polygon(20, 0)),
+        _feature('A', _polygon(0, 0), 'SMITH JANE', 0, 5200, 1.5),
+        _feature('C', {'type': 'MultiPolygon', 'coordinates': [_square(30, 0), _square(32, 0)]}, 'LEE', 1, 1, 1.0),
+        _feature('C', {'type': 'LineString', 'coordinates': [[34, 0], [35, 0]]}, 'LEE', 1, 1, 0.0),
+        _feature(None, _polygon(40, 0)),
+    ]
+
+FIELD_MAPPING = detect_property_fields(_features()[0]['properties'])
+
+def _consolidate(features, **kwargs):
+    stats = ConsolidationStats()
+    count, stream = consolidate_features(features, FIELD_MAPPING, stats, **kwargs)
+    return count, list(stream), stats
+
+def _by_prop_id(output):
+    return {feature['properties']['PROP_ID']: feature for feature in output if feature['properties']['PROP_ID']}
+
+def test_one_feature_per_prop_id_in_first_seen_order():
+    count, output, stats = _consolidate(_features())
+
+    assert count == len(output) == 5
+    assert [feature['properties']['PROP_ID'] for feature in output] == ['A', 'B', '', 'C', None]
+    assert (stats.input_features, stats.output_features) == (8, 5)
+    assert (stats.merged_groups, stats.merged_features, stats.duplicate_parts) == (2, 3, 1)
+    assert stats.spilled_features == 0
+
+def test_parts_are_reconciled():
+    _, output, stats = _consolidate(_features())
+    parcel = _by_prop_id(output)['A']
+
+    # The exact duplicate of the first part is dropped from the geometry and the area
+    assert parcel['geometry'] == {'type': 'MultiPolygon', 'coordinates': [_square(0, 0), _square(2, 0)]}
+    assert parcel['properties']['GIS_AREA'] == 2.0
+    assert parcel['properties']['OWNER_NAME'] == 'SMITH JOHN'
+    assert parcel['properties']['LAND_VALUE'] == 1000
+    assert parcel['properties']['MKT_VALUE'] == 5200
+    assert stats.conflicts == {'owner_name': 1, 'mkt_value': 1}
+
+def test_single_parts_and_missing_prop_ids_pass_through():
+    features = _features()
+    _, output, _ = _consolidate(features)
+
+    assert output[1] is features[1]
+    assert [feature['geometry'] for feature in output if not feature['properties']['PROP_ID']] == [
+        _polygon(20, 0), _polygon(40, 0),
+    ]
+
+def test_non_polygon_parts_keep_a_geometry_collection():
+    _, output, _ = _consolidate(_features())
+    geometry = _by_prop_id(output)['C']['geometry']
+
+    assert geometry['type'] == 'GeometryCollection'
+    assert [member['type'] for member in geometry['geometries']] == ['Polygon', 'Polygon', 'LineString']
+
+def test_spilled_stream_matches_the_in_memory_result(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+    _, in_memory, _ = _consolidate(_features())
+    count, spilled, stats = _consolidate(_features(), max_buffered_features=2, partitions=3)
+
+    assert count == len(spilled) == len(in_memory)
+    assert (stats.spilled_features, stats.spill_partitions) == (8, 3)
+    assert (stats.merged_groups, stats.duplicate_parts) == (2, 1)
+
+    def canonical(features):
+        return sorted(json.dumps(feature, sort_keys=True) for feature in features)
+
+    assert canonical(spilled) == canonical(in_memory)
+    # The partition files are removed once the stream has been read
+    assert os.listdir(tmp_path) == []
+
+def test_stats_are_final_before_the_stream_is_read():
+    stats = ConsolidationStats()
+    count, stream = consolidate_features(iter(_features()), FIELD_MAPPING, stats, max_buffered_features=2, partitions=2)
+
+    assert (count, stats.output_features, stats.merged_groups) == (5, 5, 2)
+    assert len(list(stream)) == 5
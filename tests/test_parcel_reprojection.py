@@ -0,0 +1,128 @@
+import copy
+
+import pytest
+
+pyproj = pytest.importorskip('pyproj')
+pytest.importorskip('numpy')
+
+from parcel_reprojection import (
+    ReprojectionStats,
+    build_transformer,
+    detect_source_crs,
+    reproject_chunk,
+    reproject_stream,
+)
+
+# Texas Central State Plane (US feet), around Burnet
+X, Y = 2950000.0, 10300000.0
+
+def _ring(x, y, size=500.0):
+    return [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+
+def _features():
+    return [
+        {'type': 'Feature', 'properties': {}, 'geometry': {'type': 'Polygon', 'coordinates': [_ring(X, Y)]}},
+        {
+            'type': 'Feature',
+            'properties': {},
+            'geometry': {
+                'type': 'MultiPolygon',
+                'coordinates': [[_ring(X + 1000, Y)], [_ring(X + 2000, Y + 2000, 250.0)]],
+                'crs': {'type': 'name', 'properties': {'name': 'EPSG:2277'}},
+            },
+        },
+        {'type': 'Feature', 'properties': {}, 'geometry': {'type': 'Point', 'coordinates': [X, Y, 812.5]}},
+        {
+            'type': 'Feature',
+            'properties': {},
+            'geometry': {
+                'type': 'GeometryCollection',
+                'geometries': [{'type': 'LineString', 'coordinates': [[X, Y], [X + 10, Y + 10]]}],
+            },
+        },
+        {'type': 'Feature', 'properties': {}, 'geometry': None},
+    ]
+
+def _pointwise(features, transformer):
+    """Reference result: every position transformed on its own"""
+    def walk(coords):
+        if coords and not isinstance(coords[0], list):
+            lon, lat = transformer.transform(coords[0], coords[1])
+            return [lon, lat, *coords[2:]]
+        return [walk(child) for child in coords]
+
+    def geometry(g):
+        if not g:
+            return g
+        g = dict(g)
+        g.pop('crs', None)
+        if g['type'] == 'GeometryCollection':
+            g['geometries'] = [geometry(child) for child in g['geometries']]
+        else:
+            g['coordinates'] = walk(g['coordinates'])
+        return g
+
+    return [dict(feature, geometry=geometry(feature['geometry'])) for feature in features]
+
+def _assert_close(actual, expected):
+    if isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            _assert_close(a, e)
+    elif isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            _assert_close(actual[key], expected[key])
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, abs=1e-12)
+    else:
+        assert actual == expected
+
+def test_chunk_matches_pointwise_transform():
+    transformer = build_transformer('EPSG:2277')
+    expected = _pointwise(copy.deepcopy(_features()), transformer)
+
+    actual = reproject_chunk(_features(), transformer)
+
+    _assert_close(actual, expected)
+    lon, lat = actual[0]['geometry']['coordinates'][0][0]
+    assert -99 < lon < -97 and 30 < lat < 31.5
+
+def test_z_values_and_nesting_are_kept():
+    features = reproject_chunk(_features(), build_transformer('EPSG:2277'))
+    multipolygon, point = features[1], features[2]
+
+    assert point['geometry']['coordinates'][2] == 812.5
+    assert len(multipolygon['geometry']['coordinates']) == 2
+    assert len(multipolygon['geometry']['coordinates'][1][0]) == 5
+    assert 'crs' not in multipolygon['geometry']
+
+def test_stats_count_features_vertices_and_chunks():
+    stats = ReprojectionStats()
+    features = list(reproject_stream(_features(), build_transformer('EPSG:2277'), stats, chunk_size=2))
+
+    assert len(features) == 5
+    assert stats.features == 5
+    assert stats.chunks == 3
+    assert stats.vertices == 5 + 10 + 1 + 2
+
+def test_wgs84_sources_are_passed_through():
+    assert build_transformer('EPSG:4326') is None
+    assert build_transformer('urn:ogc:def:crs:OGC:1.3:CRS84') is None
+
+    features = _features()
+    assert reproject_chunk(features, None) is features
+
+def test_detect_source_crs_rules(tmp_path):
+    source = tmp_path / 'parcels.geojson'
+    source.write_text('{"type": "FeatureCollection", "features": []}')
+    projected = {'geometry': {'type': 'Point', 'coordinates': [X, Y]}}
+    lon_lat = {'geometry': {'type': 'Point', 'coordinates': [-98.2, 30.7]}}
+
+    assert detect_source_crs(str(source), projected, 'EPSG:2278') == 'EPSG:2278'
+    assert detect_source_crs(str(source), lon_lat) == 'EPSG:4326'
+    with pytest.raises(ValueError):
+        detect_source_crs(str(source), projected)
+
+    source.write_text('{"type": "FeatureCollection", "crs": {"type": "name", "properties": {"name": "EPSG:2277"}}, "features": []}')
+    assert detect_source_crs(str(source), projected) == 'EPSG:2277'
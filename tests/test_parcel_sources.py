@@ -0,0 +1,65 @@
+import json
+import zipfile
+
+import pytest
+
+from parcel_sources import iter_geojson_features, open_source, read_source_crs
+
+def _features(count):
+    return [
+        {
+            'type': 'Feature',
+            'properties': {'Prop_ID': i, 'OWNER_NAME': 'SMITH ] JOHN, "JR"' if i % 2 else ''},
+            'geometry': {'type': 'Polygon', 'coordinates': [[[i, 0], [i + 1, 0], [i + 1, 1], [i, 0]]]},
+        }
+        for i in range(count)
+    ]
+
+def _write_collection(path, features, indent=None):
+    collection = {'type': 'FeatureCollection', 'name': 'parcels', 'features': features, 'crs': None}
+    path.write_text(json.dumps(collection, indent=indent))
+    return str(path)
+
+@pytest.mark.parametrize('read_size', [5, 64, 1024 * 1024])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_geojson_features_stream_across_block_boundaries(tmp_path, read_size, indent):
+    features = _features(200)
+    source = _write_collection(tmp_path / 'parcels.geojson', features, indent)
+
+    assert list(iter_geojson_features(source, read_size)) == features
+
+def test_open_source_counts_geojson_features(tmp_path):
+    source = _write_collection(tmp_path / 'parcels.geojson', _features(25))
+
+    total, stream = open_source(source)
+
+    assert total == 25
+    assert len(list(stream)) == 25
+
+def test_empty_feature_collection(tmp_path):
+    source = _write_collection(tmp_path / 'parcels.geojson', [])
+
+    assert open_source(source)[0] == 0
+
+def test_truncated_geojson_is_an_error(tmp_path):
+    source = tmp_path / 'parcels.geojson'
+    source.write_text(json.dumps({'type': 'FeatureCollection', 'features': _features(3)})[:-40])
+
+    with pytest.raises(ValueError):
+        list(iter_geojson_features(str(source), 16))
+
+def test_zipped_shapefile_crs_comes_from_the_member_prj(tmp_path):
+    source = tmp_path / 'parcels.zip'
+    with zipfile.ZipFile(source, 'w') as archive:
+        archive.writestr('Parcels/readme.txt', 'not a projection')
+        archive.writestr('Parcels/Parcels.shp', b'')
+        archive.writestr('Parcels/parcels.PRJ', 'PROJCS["NAD83 / Texas Central (ftUS)"]\n')
+
+    assert read_source_crs(str(source)) == 'PROJCS["NAD83 / Texas Central (ftUS)"]'
+
+def test_zipped_shapefile_without_prj_has_no_crs(tmp_path):
+    source = tmp_path / 'parcels.zip'
+    with zipfile.ZipFile(source, 'w') as archive:
+        archive.writestr('parcels.shp', b'')
+
+    assert read_source_crs(str(source)) is None
@@ -0,0 +1,34 @@
+from generate_county_import_sql import detect_property_fields, map_property_row
+
+BURNET_PROPS = {
+    'Prop_ID': 12345,
+    'OWNER_NAME': "O'NEIL PATRICK",
+    'SITUS_ADDR': '101 MAIN ST',
+    'MAIL_ADDR': 'PO BOX 1',
+    'LAND_VALUE': 1000.0,
+    'MKT_VALUE': 2500,
+    'GIS_AREA': 3.25,
+}
+
+def _row(props, index=7):
+    return map_property_row('Burnet', props, index, detect_property_fields(props or BURNET_PROPS), bool(props))
+
+def test_source_owner_name_is_kept():
+    row = _row(BURNET_PROPS)
+
+    assert row['owner_name'] == "O'NEIL PATRICK"
+    assert row['prop_id'] == '12345'
+    assert row['county'] == 'burnet'
+
+def test_missing_owner_stays_blank_when_the_source_has_properties():
+    props = {key: value for key, value in BURNET_PROPS.items() if key != 'OWNER_NAME'}
+    props['OWNER'] = None
+
+    assert _row(props)['owner_name'] == ''
+
+def test_empty_properties_get_synthetic_ids_and_owners():
+    row = _row({}, index=42)
+
+    assert row['owner_name'] == 'Property Owner 42'
+    assert row['prop_id'] == 'BUR-000042'
+    assert (row['land_value'], row['mkt_value'], row['gis_area']) == (0, 0, 0)
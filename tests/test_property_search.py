@@ -0,0 +1,59 @@
+from generate_county_import_sql import detect_property_fields, map_property_row
+
+COUNTY = 'searchtest'
+
+SOURCE_PROPS = [
+    {'PROP_ID': 'S1', 'OWNER_NAME': 'SMITH JOHN & MARY', 'SITUS_ADDR': '123 Main Street'},
+    {'PROP_ID': 'S2', 'OWNER_NAME': 'SMITH FAMILY TRUST', 'SITUS_ADDR': '9 County Road 101'},
+    {'PROP_ID': 'S3', 'OWNER_NAME': 'JONES ROBERT', 'SITUS_ADDR': '45 Oak Lane'},
+]
+
+def _load_county(cur):
+    """Insert the rows the importers would write for SOURCE_PROPS and build their search entries"""
+    cur.execute("select public.ensure_county(%s)", (COUNTY,))
+    county_id = cur.fetchone()[0]
+
+    field_mapping = detect_property_fields(SOURCE_PROPS[0])
+    for index, props in enumerate(SOURCE_PROPS, start=1):
+        row = map_property_row(COUNTY, props, index, field_mapping, True)
+        cur.execute(
+            "insert into public.properties (county, county_id, prop_id, owner_name, situs_addr) values (%s, %s, %s, %s, %s)",
+            (row['county'], county_id, row['prop_id'], row['owner_name'], row['situs_addr']),
+        )
+
+    cur.execute("select public.build_property_search(%s)", (COUNTY,))
+    return cur.fetchone()[0]
+
+def _search(cur, query, field):
+    cur.execute(
+        "select prop_id, match_field, score from public.search_properties(%s, %s, %s)",
+        (query, COUNTY, field),
+    )
+    return cur.fetchall()
+
+def test_owner_search_finds_importer_mapped_owners(db_conn):
+    with db_conn.cursor() as cur:
+        assert _load_county(cur) == len(SOURCE_PROPS)
+
+        cur.execute("select count(*) from public.property_search where county = %s and owner_key = ''", (COUNTY,))
+        assert cur.fetchone()[0] == 0
+
+        matches = _search(cur, 'smith', 'owner')
+
+    assert sorted(prop_id for prop_id, _, _ in matches) == ['S1', 'S2']
+    assert all(field == 'owner' and score == 0.9 for _, field, score in matches)
+
+def test_owner_search_ranks_exact_owner_first(db_conn):
+    with db_conn.cursor() as cur:
+        _load_county(cur)
+        matches = _search(cur, 'Jones, Robert', 'owner')
+
+    assert matches[0][:2] == ('S3', 'owner')
+    assert matches[0][2] == 1.0
+
+def test_address_search_uses_the_normalized_situs(db_conn):
+    with db_conn.cursor() as cur:
+        _load_county(cur)
+        matches = _search(cur, '123 MAIN ST.', 'address')
+
+    assert [(prop_id, field) for prop_id, field, _ in matches] == [('S1', 'address')]
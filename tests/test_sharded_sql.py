@@ -0,0 +1,83 @@
+import contextlib
+import gzip
+import io
+import json
+
+import pytest
+
+from generate_county_import_sql import generate_county_sql
+from import_equivalence import generated_features, parse_insert_rows
+
+def _write_source(path, count):
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': generated_features(count)}))
+    return str(path)
+
+def _generate(tmp_path, monkeypatch, source, **options):
+    monkeypatch.chdir(tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert generate_county_sql('burnet', source, **options)
+
+def _read(path):
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt') as f:
+        return f.read()
+
+def test_parse_insert_rows_handles_quotes_nulls_and_subqueries():
+    text = (
+        "-- header comment\n"
+        "BEGIN;\n"
+        "DELETE FROM properties WHERE county = 'burnet';\n"
+        "INSERT INTO properties (county, county_id, owner_name, land_value) VALUES\n"
+        "('burnet', (SELECT id FROM counties WHERE slug = 'burnet'), 'O''NEIL, PAT (TR)', NULL),\n"
+        "('burnet', (SELECT id FROM counties WHERE slug = 'burnet'), '', 12.5);\n"
+        "COMMIT;\n"
+    )
+
+    assert parse_insert_rows(text) == [
+        {'county': 'burnet', 'county_id': '<subquery>', 'owner_name': "O'NEIL, PAT (TR)", 'land_value': None},
+        {'county': 'burnet', 'county_id': '<subquery>', 'owner_name': '', 'land_value': '12.5'},
+    ]
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_shards_hold_the_same_rows_as_the_single_file(tmp_path, monkeypatch, compress):
+    source = _write_source(tmp_path / 'burnet.geojson', 203)
+
+    _generate(tmp_path, monkeypatch, source)
+    single = parse_insert_rows(_read(tmp_path / 'import_burnet.sql'))
+
+    _generate(tmp_path, monkeypatch, source, shards=4, compress=compress)
+    manifest = json.loads((tmp_path / 'import_burnet.manifest.json').read_text())
+
+    assert manifest['compressed'] == compress
+    assert len(manifest['shards']) == 4
+    assert sum(shard['rows'] for shard in manifest['shards']) == 203
+
+    sharded = []
+    for shard in manifest['shards']:
+        text = _read(tmp_path / shard['file'])
+        # Each shard is its own transaction so a failed one can be replayed alone
+        assert text.count('BEGIN;') == 1 and text.rstrip().endswith('COMMIT;')
+        rows = parse_insert_rows(text)
+        assert len(rows) == shard['rows']
+        sharded.extend(rows)
+
+    assert sharded == single
+
+def test_pre_load_clears_and_resolves_the_county(tmp_path, monkeypatch):
+    source = _write_source(tmp_path / 'burnet.geojson', 10)
+
+    _generate(tmp_path, monkeypatch, source, shards=2)
+    manifest = json.loads((tmp_path / 'import_burnet.manifest.json').read_text())
+    pre = _read(tmp_path / manifest['pre'])
+
+    assert "DELETE FROM properties WHERE county = 'burnet';" in pre
+    assert "public.ensure_county('burnet')" in pre
+    assert 'stamp_county_data_version' in _read(tmp_path / manifest['post'])
+
+def test_shard_count_is_capped_by_the_feature_count(tmp_path, monkeypatch):
+    source = _write_source(tmp_path / 'burnet.geojson', 3)
+
+    _generate(tmp_path, monkeypatch, source, shards=8)
+    manifest = json.loads((tmp_path / 'import_burnet.manifest.json').read_text())
+
+    assert [shard['rows'] for shard in manifest['shards']] == [1, 1, 1]
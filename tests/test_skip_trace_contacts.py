@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from skip_trace_contacts import flatten_results, normalize_phone
+
+REFERENCES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'references')
+
+@pytest.mark.parametrize('number, expected', [
+    ('(512) 756-7747', '5127567747'),
+    ('512.756.7747', '5127567747'),
+    ('+1 512 756 7747', '5127567747'),
+    ('15127567747', '5127567747'),
+    (5127567747, '5127567747'),
+    ('25127567747', None),
+    ('756-7747', None),
+    ('', None),
+    (None, None),
+])
+def test_normalize_phone(number, expected):
+    assert normalize_phone(number) == expected
+
+def _enformion(property_id, first, last, phones=(), emails=(), status='completed'):
+    return {
+        'propertyId': property_id,
+        'status': status,
+        'data': {
+            'requestId': f'req-{property_id}',
+            'identityScore': 90,
+            'person': {
+                'name': {'firstName': first, 'lastName': last},
+                'age': '68',
+                'phones': [{'number': number, 'type': 'wireless', 'isConnected': True, 'lastReportedDate': '8/1/2025'} for number in phones],
+                'emails': [{'email': email, 'isValidated': True} for email in emails],
+            },
+        },
+    }
+
+def _batchdata(property_id, full_name, phones=()):
+    return {
+        'propertyId': property_id,
+        'status': 'completed',
+        'data': {
+            'name': {'full': full_name},
+            'phoneNumbers': [{'number': number, 'type': 'Mobile', 'dnc': False, 'reachable': True} for number in phones],
+            'emails': [],
+        },
+    }
+
+def test_flatten_results_normalizes_and_detects_providers():
+    document = {'results': [
+        _enformion(1, 'Alvicia', 'Longoria', phones=['(512) 756-7747', 'n/a'], emails=[' Alvicia@Example.COM ', 'none']),
+        _batchdata(2, 'SMITH JOHN', phones=['1-830-555-0100']),
+    ]}
+
+    lookups, persons, phones, emails = flatten_results([document])
+
+    assert sorted((row['property_id'], row['provider'], row['matched']) for row in lookups) == [
+        (1, 'enformion', True), (2, 'batchdata', True),
+    ]
+    assert {row['property_id']: row['full_name'] for row in persons} == {1: 'Alvicia Longoria', 2: 'SMITH JOHN'}
+    assert sorted((row['number'], row['phone_type']) for row in phones) == [('5127567747', 'mobile'), ('8305550100', 'mobile')]
+    assert [row['email'] for row in emails] == ['alvicia@example.com']
+    assert next(row for row in phones if row['property_id'] == 1)['last_reported'] == '2025-08-01'
+
+def test_flatten_results_deduplicates_repeated_reports():
+    result = _enformion(1, 'Alvicia', 'Longoria', phones=['(512) 756-7747', '512-756-7747'], emails=['a@example.com', 'A@example.com'])
+
+    lookups, persons, phones, emails = flatten_results([{'results': [result]}, {'results': [result]}])
+
+    assert len(lookups) == 1
+    assert len(persons) == 1
+    assert [row['number'] for row in phones] == ['5127567747']
+    assert [row['email'] for row in emails] == ['a@example.com']
+
+def test_flatten_results_records_unmatched_lookups_without_contacts():
+    empty = {'propertyId': 3, 'status': 'completed', 'data': {'person': {}}}
+
+    lookups, persons, phones, emails = flatten_results([{'results': [empty]}])
+
+    assert lookups == [{'property_id': 3, 'provider': 'enformion', 'matched': False, 'request_id': None}]
+    assert (persons, phones, emails) == ([], [], [])
+
+def test_flatten_results_skips_incomplete_and_unknown_results():
+    results = [
+        _enformion(1, 'Alvicia', 'Longoria', status='failed'),
+        _enformion(None, 'No', 'Parcel'),
+        {'propertyId': 4, 'status': 'completed', 'data': {'unexpected': True}},
+        {'propertyId': 5, 'status': 'completed', 'data': 'not a dict'},
+    ]
+
+    assert flatten_results([{'results': results}]) == ([], [], [], [])
+
+def test_flatten_results_honours_an_explicit_provider():
+    lookups, persons, _, _ = flatten_results([{'results': [_batchdata(2, 'SMITH JOHN')]}], provider='batchdata')
+
+    assert lookups[0]['provider'] == 'batchdata'
+    assert persons[0]['person_key'] == 'SMITH JOHN'
+
+def test_flatten_results_reads_the_enformion_reference_document():
+    with open(os.path.join(REFERENCES_DIR, 'enformion.json'), 'r') as f:
+        document = json.load(f)
+
+    lookups, persons, phones, emails = flatten_results([document])
+
+    assert lookups and all(row['provider'] == 'enformion' for row in lookups)
+    assert all(len(row['number']) == 10 and row['number'].isdigit() for row in phones)
+    assert all(row['email'] == row['email'].lower() for row in emails)
+    assert '5127567747' in {row['number'] for row in phones}
@@ -0,0 +1,122 @@
+import pytest
+
+from user_numbers import _SAVED_WITH_PREFIX_SQL
+
+COUNTY = 'zzqtest'
+PREFIX = 'ZZQ'
+
+@pytest.fixture
+def cur(db_conn):
+    with db_conn.cursor() as cur:
+        yield cur
+
+@pytest.fixture
+def county_id(cur):
+    cur.execute("select public.ensure_county(%s)", (COUNTY,))
+    return cur.fetchone()[0]
+
+def _allocate(cur, county_id, count=1):
+    cur.execute("select public.allocate_user_numbers(%s, %s)", (county_id, count))
+    return [row[0] for row in cur.fetchall()]
+
+def _save(cur, county_id, user_number=None):
+    """Save a fresh parcel of the test county; returns the saved_properties id"""
+    cur.execute(
+        "insert into public.properties (county, county_id, prop_id) values (%s, %s, 'UN-' || nextval('properties_id_seq')) returning id",
+        (COUNTY, county_id),
+    )
+    property_id = cur.fetchone()[0]
+    cur.execute(
+        "insert into public.saved_properties (property_id, user_number) values (%s, %s) returning id",
+        (property_id, user_number),
+    )
+    return cur.fetchone()[0]
+
+def _unsave(cur, user_number):
+    cur.execute("delete from public.saved_properties where user_number = %s", (user_number,))
+
+def _allocator(cur):
+    """(high_water, sorted free numbers) for the test prefix"""
+    cur.execute("select high_water from public.user_number_counters where prefix = %s", (PREFIX,))
+    row = cur.fetchone()
+    cur.execute("select number from public.user_number_free where prefix = %s order by number", (PREFIX,))
+    return (row[0] if row else None), [number for (number,) in cur.fetchall()]
+
+def test_allocation_extends_the_high_water_mark(cur, county_id):
+    assert _allocate(cur, county_id, 3) == ['ZZQ-000001', 'ZZQ-000002', 'ZZQ-000003']
+    assert _allocate(cur, county_id) == ['ZZQ-000004']
+    assert _allocator(cur) == (4, [])
+
+def test_smallest_free_number_is_reused_first(cur, county_id):
+    for user_number in _allocate(cur, county_id, 5):
+        _save(cur, county_id, user_number)
+
+    _unsave(cur, 'ZZQ-000004')
+    _unsave(cur, 'ZZQ-000002')
+    assert _allocator(cur) == (5, [2, 4])
+
+    assert _allocate(cur, county_id) == ['ZZQ-000002']
+    # Whatever the free list cannot cover comes from above the high-water mark
+    assert _allocate(cur, county_id, 2) == ['ZZQ-000004', 'ZZQ-000006']
+    assert _allocator(cur) == (6, [])
+
+def test_explicit_number_claims_it_and_leaves_the_gap_free(cur, county_id):
+    _save(cur, county_id, 'ZZQ-000005')
+    assert _allocator(cur) == (5, [1, 2, 3, 4])
+
+    assert _allocate(cur, county_id, 2) == ['ZZQ-000001', 'ZZQ-000002']
+
+    # A number written into the gap is taken off the free list
+    _save(cur, county_id, 'ZZQ-000003')
+    assert _allocator(cur) == (5, [4])
+    assert _allocate(cur, county_id, 2) == ['ZZQ-000004', 'ZZQ-000006']
+
+def test_numbers_above_999999_keep_every_digit(cur, county_id):
+    cur.execute("insert into public.user_number_counters (prefix, high_water) values (%s, 999998)", (PREFIX,))
+
+    assert _allocate(cur, county_id, 2) == ['ZZQ-999999', 'ZZQ-1000000']
+
+    # Seven-digit numbers are still recognized by the trigger and the free list
+    _save(cur, county_id, 'ZZQ-1000000')
+    _unsave(cur, 'ZZQ-1000000')
+    assert _allocator(cur) == (1000000, [1000000])
+    assert _allocate(cur, county_id) == ['ZZQ-1000000']
+
+def test_released_numbers_are_reused(cur, county_id):
+    allocated = _allocate(cur, county_id, 3)
+    _save(cur, county_id, allocated[0])
+
+    # A failed save hands its numbers back; numbers still held and malformed values are ignored
+    cur.execute("select public.release_user_numbers(%s)", ([allocated[0], allocated[1], 'ZZQ-12', 'not-a-number'],))
+    assert cur.fetchone()[0] == 1
+    assert _allocator(cur) == (3, [2])
+
+    assert _allocate(cur, county_id, 2) == ['ZZQ-000002', 'ZZQ-000004']
+
+def test_rebuild_recomputes_counters_and_gaps(cur, county_id):
+    for user_number in ('ZZQ-000001', 'ZZQ-000003', 'ZZQ-000006', 'ZZQ-7'):
+        _save(cur, county_id, user_number)
+
+    cur.execute("delete from public.user_number_free where prefix = %s", (PREFIX,))
+    cur.execute("update public.user_number_counters set high_water = 0 where prefix = %s", (PREFIX,))
+
+    cur.execute("select public.rebuild_user_number_allocator()")
+    assert cur.fetchone()[0] >= 1
+    assert _allocator(cur) == (6, [2, 4, 5])
+    assert _allocate(cur, county_id, 4) == ['ZZQ-000002', 'ZZQ-000004', 'ZZQ-000005', 'ZZQ-000007']
+
+def test_saved_rows_resolve_their_county_from_the_county_name(cur, county_id):
+    cur.execute("select relkind from pg_class where oid = 'public.properties'::regclass")
+    if cur.fetchone()[0] == 'p':
+        pytest.skip("properties is partitioned, so every row has a county_id")
+
+    # A parcel loaded before properties.county_id existed
+    legacy_id = _save(cur, county_id)
+    cur.execute(
+        "update public.properties set county_id = null where id = (select property_id from public.saved_properties where id = %s)",
+        (legacy_id,),
+    )
+
+    cur.execute(f"select id, county_id, prefix from ({_SAVED_WITH_PREFIX_SQL}) saved where id = %(id)s",
+                {'counties': [COUNTY], 'id': legacy_id})
+    assert cur.fetchall() == [(legacy_id, county_id, PREFIX)]